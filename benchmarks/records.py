@@ -0,0 +1,77 @@
+"""
+Compare the memory used by compact records against instance resources when
+holding many calls at once.
+
+    python benchmarks/records.py [count]
+"""
+import gc
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from twilio.rest.resources import Calls
+
+BASE_URI = "https://api.twilio.com/2010-04-01/Accounts/AC123"
+AUTH = ("AC123", "token")
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "tests",
+                       "resources", "calls_list.json")
+
+
+def rows(count):
+    template = json.load(open(FIXTURE))["calls"][0]
+    for i in xrange(count):
+        row = dict(template)
+        row["sid"] = u"CA%032d" % i
+        yield row
+
+
+def rss():
+    """Return the resident set size of this process in bytes, or None"""
+    try:
+        pages = int(open("/proc/self/statm").read().split()[1])
+    except (IOError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def overhead(obj):
+    """Return the bytes used by obj itself, not counting its field values"""
+    size = sys.getsizeof(obj)
+    for attr in ("__dict__", "extra"):
+        value = getattr(obj, attr, None)
+        if value is not None:
+            size += sys.getsizeof(value)
+    return size
+
+
+def measure(resource, count):
+    gc.collect()
+    before = rss()
+    start = time.time()
+    loaded = [resource.load_instance(row) for row in rows(count)]
+    elapsed = time.time() - start
+    gc.collect()
+    after = rss()
+
+    if before is None:
+        grown = "n/a"
+    else:
+        grown = "%.1f MB" % ((after - before) / 1024.0 / 1024)
+
+    print "  %-9s %8.0f ms   %5d bytes/object   RSS +%s" % (
+        loaded[0].__class__.__name__, elapsed * 1000, overhead(loaded[0]),
+        grown)
+
+
+def main(count=100000):
+    calls = Calls(BASE_URI, AUTH)
+    print "%d calls" % count
+    measure(calls, count)
+    measure(calls.as_records(), count)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
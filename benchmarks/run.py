@@ -0,0 +1,249 @@
+"""
+Measure the client's throughput, latency and memory against a local fake
+Twilio server, and save the results as JSON.
+
+    python benchmarks/run.py [--latency 0.005] [--pages 5] [--requests 200]
+                             [--output results.json] [--compare old.json]
+
+The fake server (benchmarks/server.py) runs in its own process so that it
+does not compete with the client for the interpreter lock.
+"""
+import gc
+import json
+import multiprocessing
+import optparse
+import os
+import platform
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import twilio
+from twilio import twiml
+from twilio.rest import TwilioRestClient
+from twilio.util import RequestValidator
+
+from server import FakeTwilioServer
+
+ACCOUNT_SID = "AC4bf2dafbed59a5733d2c1c1c69a83a28"
+AUTH_TOKEN = "token"
+
+
+def rss():
+    """Return the resident set size of this process in KB, or None"""
+    try:
+        pages = int(open("/proc/self/statm").read().split()[1])
+    except (IOError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def percentile(latencies, p):
+    """Return the pth percentile of a sorted list"""
+    if not latencies:
+        return 0.0
+    return latencies[int(round(p * (len(latencies) - 1)))]
+
+
+def measure(fn, runs):
+    """
+    Call fn runs times and return a dict describing its performance. fn
+    returns the number of requests it made.
+    """
+    # Silence anything the code being measured prints
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+
+    try:
+        fn()  # warm up connections and caches
+        gc.collect()
+        before = rss()
+
+        latencies = []
+        requests = 0
+        start = time.time()
+
+        for i in xrange(runs):
+            began = time.time()
+            requests += fn() or 0
+            latencies.append(time.time() - began)
+
+        elapsed = time.time() - start
+        after = rss()
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    latencies.sort()
+
+    return {
+        "runs": runs,
+        "requests": requests,
+        "seconds": round(elapsed, 4),
+        "runs_per_sec": round(runs / elapsed, 1),
+        "requests_per_sec": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "rss_growth_kb": None if before is None else after - before,
+        }
+
+
+def benchmarks(client, pages):
+    """Return (name, fn, runs factor) for every benchmark"""
+
+    def calls_create():
+        client.calls.create(to="+14155551234", from_="+14155556789",
+                            url="http://example.com/twiml")
+        return 1
+
+    def calls_get_instances():
+        client.calls.list(page_size=50)
+        return 1
+
+    def calls_iter():
+        for call in client.calls.iter():
+            pass
+        return pages
+
+    def sms_iter():
+        for message in client.sms.messages.iter():
+            pass
+        return pages
+
+    def twiml_render():
+        r = twiml.Response()
+        r.say("Hello, this is a benchmark", voice="woman", language="en")
+        with r.gather(action="/menu", numDigits=1) as g:
+            g.say("Press 1 for sales, 2 for support")
+            g.play("http://example.com/hold.mp3", loop=2)
+        d = r.dial(callerId="+14155551234")
+        d.number("+14155556789")
+        r.redirect("/voicemail")
+        str(r)
+
+    validator = RequestValidator(AUTH_TOKEN)
+    url = "https://example.com/twilio/voice?foo=bar"
+    params = {
+        "AccountSid": ACCOUNT_SID,
+        "CallSid": "CA1234567890ABCDE",
+        "Caller": "+14158675309",
+        "Digits": "1234",
+        "From": "+14158675309",
+        "To": "+18005551212",
+        }
+    signature = validator.compute_signature(url, params)
+
+    def validate_signature():
+        validator.validate(url, params, signature)
+
+    return [
+        ("calls_create", calls_create, 1),
+        ("calls_get_instances", calls_get_instances, 1),
+        ("calls_iter", calls_iter, 0.1),
+        ("sms_iter", sms_iter, 0.1),
+        ("twiml_render", twiml_render, 10),
+        ("validate_signature", validate_signature, 100),
+        ]
+
+
+def serve(port, latency, pages):
+    FakeTwilioServer(port, latency, pages).serve_forever()
+
+
+def start_server(latency, pages):
+    """Start the fake server in a child process and return (process, base)"""
+    probe = FakeTwilioServer()
+    port = probe.server_address[1]
+    probe.server_close()
+
+    process = multiprocessing.Process(target=serve,
+                                      args=(port, latency, pages))
+    process.daemon = True
+    process.start()
+    base = "http://127.0.0.1:%d" % port
+
+    # Wait for the server to accept connections
+    client = TwilioRestClient(ACCOUNT_SID, AUTH_TOKEN, base=base)
+    for i in range(100):
+        try:
+            client.calls.get("CA123")
+            break
+        except Exception:
+            time.sleep(0.05)
+
+    return process, base
+
+
+def compare(results, path):
+    """Print how each result changed since the results saved at path"""
+    with open(path) as f:
+        old = json.load(f)["results"]
+
+    print
+    print "Compared with %s" % path
+    for name, result in sorted(results.items()):
+        if name not in old:
+            continue
+        was, now = old[name]["runs_per_sec"], result["runs_per_sec"]
+        change = (now - was) / was * 100 if was else 0
+        print "  %-22s %+7.1f%% runs/sec   p99 %8.3f -> %8.3f ms" % (
+            name, change, old[name]["p99_ms"], result["p99_ms"])
+
+
+def main():
+    parser = optparse.OptionParser(usage="%prog [options]")
+    parser.add_option("--latency", type="float", default=0,
+                      help="seconds the server waits before each response")
+    parser.add_option("--pages", type="int", default=5,
+                      help="number of pages in every list")
+    parser.add_option("--requests", type="int", default=200,
+                      help="runs of each single-request benchmark")
+    parser.add_option("--only", action="append", default=[],
+                      help="only run the named benchmark; may be repeated")
+    parser.add_option("--output", help="save the results to this JSON file")
+    parser.add_option("--compare", help="compare with a saved JSON file")
+    options, args = parser.parse_args()
+
+    process, base = start_server(options.latency, options.pages)
+    client = TwilioRestClient(ACCOUNT_SID, AUTH_TOKEN, base=base)
+    results = {}
+
+    try:
+        for name, fn, factor in benchmarks(client, options.pages):
+            if options.only and name not in options.only:
+                continue
+            runs = max(1, int(options.requests * factor))
+            results[name] = result = measure(fn, runs)
+            print "%-22s %9.1f runs/sec  p50 %8.3f ms  p99 %8.3f ms" % (
+                name, result["runs_per_sec"], result["p50_ms"],
+                result["p99_ms"])
+    finally:
+        client.connection.close()
+        process.terminate()
+
+    report = {
+        "version": twilio.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {
+            "latency": options.latency,
+            "pages": options.pages,
+            "requests": options.requests,
+            },
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "results": results,
+        }
+
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print "Saved results to %s" % options.output
+
+    if options.compare:
+        compare(results, options.compare)
+
+
+if __name__ == "__main__":
+    main()
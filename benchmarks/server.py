@@ -0,0 +1,180 @@
+"""
+A local stand-in for the Twilio REST API that answers from the JSON fixtures
+in tests/resources, for benchmarking the client without the network.
+
+    python benchmarks/server.py [--port 8000] [--latency 0.01] [--pages 5]
+
+GET /2010-04-01/Accounts/AC123/Calls.json is answered with calls_list.json,
+GET .../Calls/CA123.json with calls_instance.json, and so on. POSTs to a
+list return its instance fixture with 201 Created, and DELETEs return 204.
+"""
+import BaseHTTPServer
+import SocketServer
+import json
+import optparse
+import os
+import re
+import socket
+import threading
+import time
+from urlparse import parse_qs
+from urlparse import urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                        "tests", "resources")
+
+ACCOUNT_PATH = re.compile(r"^/2010-04-01/Accounts/AC\w+/?")
+SID = re.compile(r"^[A-Z]{2}[0-9a-f]+$")
+WORD = re.compile(r"([A-Z]+)([A-Z][a-z])|([a-z])([A-Z])")
+
+
+def snake_case(name):
+    """IncomingPhoneNumbers -> incoming_phone_numbers, SMS -> sms"""
+    return WORD.sub(r"\1\3_\2\4", name).lower()
+
+
+def fixture_name(path):
+    """
+    Return the fixture for a request path, and whether it is for an
+    instance rather than a list
+    """
+    path = ACCOUNT_PATH.sub("", path)
+    if path.endswith(".json"):
+        path = path[:-5]
+
+    parts = [p for p in path.split("/") if p]
+    instance = bool(parts) and SID.match(parts[-1]) is not None
+    resource = [snake_case(p) for p in parts if not SID.match(p)]
+
+    if not resource:
+        return "accounts_instance.json", True
+
+    kind = "instance" if instance else "list"
+    return "%s_%s.json" % ("_".join(resource), kind), instance
+
+
+class FakeTwilioHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        name, instance = fixture_name(url.path)
+
+        if instance:
+            self.reply(200, self.server.fixture(name))
+        else:
+            page = int(parse_qs(url.query).get("Page", ["0"])[0])
+            self.reply(200, self.server.page(name, url.path, page))
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        name, instance = fixture_name(urlparse(self.path).path)
+        self.reply(201, self.server.fixture(name.replace("_list",
+                                                         "_instance")))
+
+    def do_DELETE(self):
+        self.reply(204, "")
+
+    def reply(self, status, body):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if body is None:
+            status, body = 404, '{"code": 20404, "message": "Not found"}'
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeTwilioServer(SocketServer.ThreadingMixIn,
+                       BaseHTTPServer.HTTPServer):
+    """
+    :param float latency: Seconds to wait before answering each request
+    :param int pages: The number of pages in every list
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=0, latency=0, pages=1):
+        BaseHTTPServer.HTTPServer.__init__(self, ("127.0.0.1", port),
+                                           FakeTwilioHandler)
+        self.latency = latency
+        self.pages = pages
+        self.bodies = {}
+        self.lock = threading.Lock()
+
+    @property
+    def base(self):
+        return "http://127.0.0.1:%d" % self.server_address[1]
+
+    def load(self, name):
+        path = os.path.join(FIXTURES, name)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def fixture(self, name):
+        return self.cached((name, None), lambda: self.load(name))
+
+    def page(self, name, path, number):
+        """Return page number of a list, linked to the pages around it"""
+        def render():
+            data = self.load(name)
+            if data is None:
+                return None
+
+            size = data.get("page_size", 50)
+            uri = "%s?Page=%%d&PageSize=%d" % (path, size)
+            last = self.pages - 1
+            data.update({
+                "page": number,
+                "num_pages": self.pages,
+                "total": size * self.pages,
+                "first_page_uri": uri % 0,
+                "last_page_uri": uri % last,
+                "previous_page_uri": uri % (number - 1) if number else None,
+                "next_page_uri": uri % (number + 1) if number < last else None,
+                })
+            return data
+
+        return self.cached((name, number), render)
+
+    def cached(self, key, load):
+        """Encode each body once, so the server is not what is measured"""
+        with self.lock:
+            if key not in self.bodies:
+                data = load()
+                self.bodies[key] = data and json.dumps(data)
+            return self.bodies[key]
+
+
+def main():
+    parser = optparse.OptionParser(usage="%prog [options]")
+    parser.add_option("--port", type="int", default=8000)
+    parser.add_option("--latency", type="float", default=0,
+                      help="seconds to wait before each response")
+    parser.add_option("--pages", type="int", default=1,
+                      help="number of pages in every list")
+    options, args = parser.parse_args()
+
+    server = FakeTwilioServer(options.port, options.latency, options.pages)
+    print "Serving fixtures on %s" % server.base
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare loading a large page of instance resources with subresources created
+lazily, on first access, against creating them all up front.
+
+    python benchmarks/subresources.py [page_size]
+"""
+import gc
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from twilio.rest.resources import Accounts
+from twilio.rest.resources import Calls
+
+BASE_URI = "https://api.twilio.com/2010-04-01/Accounts/AC123"
+AUTH = ("AC123", "token")
+
+
+def rows(page_size):
+    return [{
+        "sid": "CA%032d" % i,
+        "status": "completed",
+        "from": "+14155551234",
+        "to": "+14155556789",
+        "duration": "13",
+        "uri": "/2010-04-01/Accounts/AC123/Calls/CA%032d.json" % i,
+        } for i in range(page_size)]
+
+
+def load_lazy(resource, data):
+    return [resource.load_instance(dict(row)) for row in data]
+
+
+def load_eager(resource, data):
+    instances = load_lazy(resource, data)
+    for instance in instances:
+        instance.load_subresources()
+    return instances
+
+
+def allocations(fn, *args):
+    """Return the number of objects still alive after calling fn"""
+    gc.collect()
+    before = len(gc.get_objects())
+    result = fn(*args)
+    gc.collect()
+    count = len(gc.get_objects()) - before
+    del result
+    return count
+
+
+def main(page_size=1000, repeat=5):
+    data = rows(page_size)
+
+    for resource in [Calls(BASE_URI, AUTH), Accounts(BASE_URI, AUTH)]:
+        print "%s (%d per page)" % (resource.name, page_size)
+
+        for name, fn in [("eager", load_eager), ("lazy", load_lazy)]:
+            best = min(timeit.repeat(lambda: fn(resource, data),
+                                     number=1, repeat=repeat))
+            print "  %-6s %8.2f ms %8d objects" % (name, best * 1000,
+                allocations(fn, resource, data))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,139 @@
+"""
+Compare rendering TwiML with the string serializer against building and
+writing an ElementTree, and against rendering a precompiled template, a
+frozen response or a cached one, for typical IVR responses, and time
+parsing them. Then time building and serializing large generated
+documents.
+
+    python benchmarks/twiml.py [count] [verbs]
+"""
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from twilio import twiml
+
+
+def greeting(retry="/ivr/greeting?retry=1&attempt=2"):
+    r = twiml.Response()
+    r.say("Thanks for calling Example Corp.", voice="woman", language="en")
+    with r.gather(action="/ivr/menu", method="POST", numDigits=1,
+                  timeout=5) as g:
+        g.say("For sales, press 1. For support, press 2.", voice="woman")
+        g.say("To hear these options again, press 9.", voice="woman")
+    r.redirect(retry)
+    return r
+
+
+def transfer():
+    r = twiml.Response()
+    r.say("Please hold while we connect you.")
+    r.play("http://example.com/audio/hold-music.mp3", loop=0)
+    d = r.dial(action="/ivr/dial-status", callerId="+14155551234",
+               timeout=20, record=True)
+    for i in range(5):
+        d.number("+1415555%04d" % i, sendDigits="ww%d" % i)
+    r.say("Sorry, nobody is available. Please leave a message.")
+    r.record(action="/ivr/voicemail", maxLength=120, finishOnKey="#")
+    r.hangup()
+    return r
+
+
+def playlist(verbs):
+    r = twiml.Response()
+    for i in xrange(verbs // 2):
+        r.play("http://example.com/audio/%d.mp3" % i)
+        r.say("That was track %d" % i, voice="woman", language="en")
+    return r
+
+
+def dial_list(verbs):
+    r = twiml.Response()
+    d = r.dial(action="/dial-status", timeout=30)
+    for i in xrange(verbs - 2):
+        d.number("+1415%07d" % i, sendDigits="ww1")
+    return r
+
+
+def best(fn, repeat=5):
+    """Return the fastest of repeat calls to fn, in seconds"""
+    times = []
+    for i in range(repeat):
+        start = time.time()
+        fn()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def verb_size(verb):
+    """Return the bytes used by a verb itself, not counting its values"""
+    size = sys.getsizeof(verb)
+    if hasattr(verb, "__dict__"):
+        size += sys.getsizeof(verb.__dict__)
+    return size
+
+
+def etree(r):
+    return ET.tostring(r.xml()).encode("utf-8")
+
+
+def serializer(r):
+    return r.toxml(xml_declaration=False)
+
+
+def measure(name, render, count):
+    start = time.time()
+    for i in xrange(count):
+        render()
+    elapsed = time.time() - start
+    print "  %-11s %8.1f us/response" % (name, elapsed / count * 1e6)
+    return elapsed
+
+
+def main(count=20000, verbs=10000):
+    for build in (greeting, transfer):
+        response = build()
+        print "%s (%d bytes), %d renders" % (build.__name__,
+            len(serializer(response)), count)
+        assert serializer(response) == etree(response)
+        old = measure("etree", lambda: etree(response), count)
+        new = measure("serializer", lambda: serializer(response), count)
+        print "  %.1fx faster" % (old / new)
+        xml = response.toxml()
+        assert twiml.parse(xml).toxml() == xml
+        measure("parse", lambda: twiml.parse(xml), count)
+
+    # Per request, only the redirect URL changes
+    url = "/ivr/greeting?retry=1&attempt=2"
+    template = twiml.Template(greeting(twiml.Placeholder("retry")),
+                              xml_declaration=False)
+    assert template.render(retry=url) == serializer(greeting(url))
+    print "greeting, built and rendered %d times" % count
+    old = measure("build+toxml", lambda: serializer(greeting(url)), count)
+    new = measure("template", lambda: template.render(retry=url), count)
+    print "  %.1fx faster" % (old / new)
+
+    # The same response every time
+    response = transfer()
+    frozen = transfer().freeze()
+    cache = twiml.TwimlCache()
+    print "transfer, rendered %d times" % count
+    old = measure("toxml", lambda: response.toxml(), count)
+    new = measure("frozen", lambda: frozen.toxml(), count)
+    print "  %.1fx faster" % (old / new)
+    old = measure("build+toxml", lambda: transfer().toxml(), count)
+    new = measure("build+cache", lambda: cache.toxml(transfer()), count)
+    print "  %.1fx faster" % (old / new)
+
+    for build in (playlist, dial_list):
+        response = build(verbs)
+        print "%s, %d verbs" % (build.__name__, verbs)
+        print "  build %8.1f ms   toxml %8.1f ms   %d bytes/verb" % (
+            best(lambda: build(verbs)) * 1000,
+            best(response.toxml) * 1000, verb_size(response.verbs[0]))
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
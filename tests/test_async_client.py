@@ -0,0 +1,109 @@
+import sys
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from mock import patch, Mock
+from twilio import TwilioRestException
+from twilio.rest import AsyncTwilioRestClient
+from twilio.rest import RetryPolicy
+from twilio.rest.connection import ThreadSafeConnection
+from twilio.rest.futures import Future
+from twilio.rest.resources import AsyncResource
+from twilio.rest.resources import Call
+from twilio.rest.resources import SmsMessage
+from tools import create_mock_json
+
+BASE_URI = "https://api.twilio.com/2010-04-01/Accounts/AC123"
+AUTH = ("AC123", "token")
+
+
+class AsyncClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = AsyncTwilioRestClient("AC123", "token", max_workers=2)
+
+    def tearDown(self):
+        self.client.shutdown()
+
+    def test_connection(self):
+        self.assertTrue(isinstance(self.client.connection,
+                                   ThreadSafeConnection))
+        self.assertEquals(self.client.connection.maxsize, 2)
+
+    @patch("twilio.rest.resources.make_request")
+    def test_retry(self, mock):
+        unavailable = create_mock_json("tests/resources/calls_instance.json")
+        unavailable.status_code = 503
+        unavailable.ok = False
+        unavailable.headers = {}
+        ok = create_mock_json("tests/resources/calls_instance.json")
+        ok.status_code = 200
+        ok.ok = True
+        mock.side_effect = [unavailable, ok]
+
+        policy = RetryPolicy(jitter=False)
+        policy.sleep = Mock()
+        client = AsyncTwilioRestClient("AC123", "token", retry=policy)
+        try:
+            call = client.calls.get("CA123").result(1)
+        finally:
+            client.shutdown()
+
+        self.assertTrue(client.connection.retry is policy)
+        self.assertTrue(isinstance(call, Call))
+        self.assertEquals(mock.call_count, 2)
+        self.assertEquals(policy.retries, 1)
+
+    @patch("twilio.rest.resources.make_twilio_request")
+    def test_get(self, mock):
+        mock.return_value = create_mock_json(
+            "tests/resources/calls_instance.json")
+
+        future = self.client.calls.get("CA123")
+        self.assertTrue(isinstance(future, Future))
+        self.assertTrue(isinstance(future.result(1), Call))
+
+        mock.assert_called_with("GET", "%s/Calls/CA123" % BASE_URI,
+            auth=AUTH, connection=self.client.connection)
+
+    @patch("twilio.rest.resources.make_twilio_request")
+    def test_nested_create(self, mock):
+        resp = create_mock_json("tests/resources/sms_messages_instance.json")
+        resp.status_code = 201
+        mock.return_value = resp
+
+        future = self.client.sms.messages.create(to="+1415", from_="+1510",
+                                                 body="hey")
+        self.assertTrue(isinstance(future.result(1), SmsMessage))
+
+        mock.assert_called_with("POST", "%s/SMS/Messages" % BASE_URI,
+            data={"To": "+1415", "From": "+1510", "Body": "hey"},
+            auth=AUTH, connection=self.client.connection)
+
+    @patch("twilio.rest.resources.make_twilio_request")
+    def test_error(self, mock):
+        mock.side_effect = TwilioRestException(404, "uri")
+        future = self.client.conferences.get("CF123")
+        self.assertRaises(TwilioRestException, future.result, 1)
+
+    def test_participants(self):
+        participants = self.client.participants("CF123")
+        self.assertTrue(isinstance(participants, AsyncResource))
+        self.assertEquals(participants.uri,
+                          "%s/Conferences/CF123/Participants" % BASE_URI)
+
+
+class AsyncIterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = AsyncTwilioRestClient("AC123", "token")
+        self.resource = Mock()
+        self.calls = AsyncResource(self.resource, self.client.executor)
+
+    def tearDown(self):
+        self.client.shutdown()
+
+    def test_iter(self):
+        self.calls.iter(status="completed")
+        self.resource.iter.assert_called_with(prefetch=1, status="completed")
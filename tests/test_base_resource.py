@@ -7,11 +7,17 @@ if sys.version_info < (2, 7):
 else:
     import unittest
 from mock import Mock
+from mock import patch
 from nose.tools import assert_equals
 from nose.tools import raises
 from twilio.rest.resources import Resource
 from twilio.rest.resources import ListResource
 from twilio.rest.resources import InstanceResource
+from twilio.rest.resources import Subresource
+from twilio.rest.resources import Call
+from twilio.rest.resources import Calls
+from twilio.rest.resources import Recordings
+from tools import create_mock_json
 
 base_uri = "https://api.twilio.com/2010-04-01"
 account_sid = "AC123"
@@ -83,5 +89,95 @@ class testInstanceResourceInit(unittest.TestCase):
         m = Mock()
         self.r.subresources = [m]
         self.r.load_subresources()
-        m.assert_called_with(self.r.uri, self.r.auth)
+        m.assert_called_with(self.r.uri, self.r.auth, self.r.connection)
 
+
+
+class SubresourceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.parent = Calls(base_uri, auth)
+        self.call = self.parent.load_instance({"sid": "CA123"})
+
+    def testNotLoaded(self):
+        self.assertFalse("recordings" in self.call.__dict__)
+
+    def testLoadedOnAccess(self):
+        recordings = self.call.recordings
+        self.assertIsInstance(recordings, Recordings)
+        self.assertEquals(recordings.uri, "%s/Recordings" % self.call.uri)
+        self.assertTrue(recordings.connection is self.parent.connection)
+
+    def testCached(self):
+        self.assertTrue(self.call.recordings is self.call.recordings)
+        self.assertTrue("recordings" in self.call.__dict__)
+
+    def testClassAttribute(self):
+        self.assertIsInstance(Call.recordings, Subresource)
+        self.assertEquals(Call.recordings.key, "recordings")
+
+
+class RecordTest(unittest.TestCase):
+
+    def setUp(self):
+        self.parent = Calls(base_uri, auth).as_records()
+        self.record = self.parent.load_instance({
+            "sid": "CA123",
+            "from": "+14155551234",
+            "status": "completed",
+            "uri": "/Calls/CA123.json",
+            "new_field": "hey",
+            })
+
+    def testCompactCopy(self):
+        self.assertTrue(self.parent.compact)
+        self.assertFalse(Calls(base_uri, auth).compact)
+
+    def testFields(self):
+        self.assertIsInstance(self.record, Call.record)
+        self.assertEquals(self.record.sid, "CA123")
+        self.assertEquals(self.record.from_, "+14155551234")
+        self.assertEquals(self.record.status, "completed")
+        self.assertEquals(self.record.uri, "%s/CA123" % self.parent.uri)
+        self.assertEquals(self.record.auth, auth)
+
+    def testExtraFields(self):
+        self.assertEquals(self.record.new_field, "hey")
+        self.assertEquals(self.record.extra, {"new_field": "hey"})
+
+    def testMissingField(self):
+        self.assertEquals(self.record.duration, None)
+        self.assertRaises(AttributeError, getattr, self.record, "nope")
+
+    def testNoDict(self):
+        self.assertFalse(hasattr(self.record, "__dict__"))
+        self.assertRaises(AttributeError, setattr, self.record, "sid", "CA1")
+
+    def testHashBySid(self):
+        other = self.parent.load_instance({"sid": "CA123"})
+        self.assertEquals(self.record, other)
+        self.assertEquals(len(set([self.record, other])), 1)
+        self.assertNotEqual(self.record,
+                            self.parent.load_instance({"sid": "CA456"}))
+
+    def testToInstance(self):
+        call = self.record.to_instance()
+        self.assertIsInstance(call, Call)
+        self.assertEquals(call.sid, "CA123")
+        self.assertEquals(call.from_, "+14155551234")
+        self.assertEquals(call.new_field, "hey")
+        self.assertEquals(call.uri, self.record.uri)
+
+    @patch("twilio.rest.resources.make_twilio_request")
+    def testConvertedInstanceUpdates(self, request):
+        request.return_value = create_mock_json(
+            "tests/resources/calls_instance.json")
+        call = self.record.to_instance()
+
+        call.hangup()
+        self.assertIsInstance(call, Call)
+        self.assertEquals(call.sid, "CA47e13748ed59a5733d2c1c1c69a83a28")
+        self.assertTrue(self.parent.compact)
+
+        call.update_instance(status="canceled")
+        self.assertEquals(request.call_count, 2)
@@ -0,0 +1,213 @@
+import os
+import shutil
+import sys
+import tempfile
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from mock import patch, Mock
+from twilio import TwilioException
+from twilio.rest import TwilioRestClient
+from twilio.rest.cache import MemoryCache
+from twilio.rest.cache import SQLiteCache
+from twilio.rest.cache import TTLRules
+from twilio.rest.connection import Connection
+from twilio.rest.resources import make_twilio_request
+
+BASE_URI = "https://api.twilio.com/2010-04-01/Accounts/AC123"
+CALL_URI = BASE_URI + "/Calls/CA123.json"
+ENTRY = ({"status": "200"}, '{"sid": "CA123"}')
+
+
+def response(content, status=200):
+    resp = Mock()
+    resp.status_code = status
+    resp.ok = status < 400
+    resp.headers = {"status": str(status)}
+    resp.content = content
+    return resp
+
+
+class TTLRulesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rules = TTLRules()
+
+    def test_completed_call(self):
+        ttl = self.rules.ttl(CALL_URI, '{"status": "completed"}')
+        self.assertTrue(ttl > 0)
+
+    def test_in_progress_call(self):
+        self.assertEquals(self.rules.ttl(CALL_URI, '{"status": "ringing"}'),
+                          0)
+
+    def test_recording(self):
+        uri = BASE_URI + "/Calls/CA123/Recordings/RE123.json"
+        self.assertTrue(self.rules.ttl(uri, "{}") > 0)
+
+    def test_lists_not_cached(self):
+        uri = BASE_URI + "/Calls.json?Status=completed"
+        self.assertEquals(self.rules.ttl(uri, '{"calls": []}'), 0)
+
+    def test_custom_rules(self):
+        rules = TTLRules([(r"/Calls\.json$", 5)], default=1)
+        self.assertEquals(rules.ttl(BASE_URI + "/Calls.json", "{}"), 5)
+        self.assertEquals(rules.ttl(CALL_URI, "{}"), 1)
+
+
+class MemoryCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = MemoryCache(max_entries=2, max_bytes=100)
+
+    def test_get(self):
+        self.cache.set("a", ENTRY, 10)
+        self.assertEquals(self.cache.get("a"), ENTRY)
+        self.assertEquals(self.cache.get("b"), None)
+
+    def test_expired(self):
+        self.cache.set("a", ENTRY, -1)
+        self.assertEquals(self.cache.get("a"), None)
+        self.assertEquals(self.cache.entries, {})
+
+    def test_max_entries(self):
+        self.cache.set("a", ENTRY, 10)
+        self.cache.set("b", ENTRY, 10)
+        self.cache.get("a")
+        self.cache.set("c", ENTRY, 10)
+
+        self.assertEquals(sorted(self.cache.entries.keys()), ["a", "c"])
+
+    def test_max_bytes(self):
+        self.cache.set("a", ({}, "x" * 60), 10)
+        self.cache.set("b", ({}, "x" * 60), 10)
+
+        self.assertEquals(self.cache.entries.keys(), ["b"])
+        self.assertEquals(self.cache.size, 60)
+
+    def test_too_big(self):
+        self.cache.set("a", ({}, "x" * 101), 10)
+        self.assertEquals(self.cache.entries, {})
+
+    def test_replace(self):
+        self.cache.set("a", ({}, "x" * 60), 10)
+        self.cache.set("a", ({}, "x" * 10), 10)
+        self.assertEquals(self.cache.size, 10)
+
+    def test_delete(self):
+        self.cache.set("a", ENTRY, 10)
+        self.cache.delete("a")
+        self.cache.delete("a")
+        self.assertEquals(self.cache.get("a"), None)
+
+    def test_counters(self):
+        self.cache.store("AC123", CALL_URI, {}, '{"status": "completed"}')
+        self.cache.lookup("AC123", CALL_URI)
+        self.cache.lookup("AC456", CALL_URI)
+
+        self.assertEquals(self.cache.hits, 1)
+        self.assertEquals(self.cache.misses, 1)
+
+
+class SQLiteCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "cache.db")
+        self.cache = SQLiteCache(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    @patch("twilio.rest.cache.sqlite3", None)
+    def test_no_sqlite3(self):
+        self.assertRaises(TwilioException, SQLiteCache, self.path)
+
+    def test_get(self):
+        self.cache.set("a", ENTRY, 10)
+        self.assertEquals(self.cache.get("a"), ENTRY)
+        self.assertEquals(self.cache.get("b"), None)
+
+    def test_shared(self):
+        self.cache.set("a", ENTRY, 10)
+        self.assertEquals(SQLiteCache(self.path).get("a"), ENTRY)
+
+    def test_expired(self):
+        self.cache.set("a", ENTRY, -1)
+        self.cache.set("b", ENTRY, -1)
+        self.assertEquals(self.cache.get("a"), None)
+
+        self.cache.purge()
+        count = self.cache.db().execute("SELECT COUNT(*) FROM responses")
+        self.assertEquals(count.fetchone()[0], 0)
+
+    def test_delete(self):
+        self.cache.set("a", ENTRY, 10)
+        self.cache.delete("a")
+        self.assertEquals(self.cache.get("a"), None)
+
+    def test_clear(self):
+        self.cache.set("a", ENTRY, 10)
+        self.cache.clear()
+        self.assertEquals(self.cache.get("a"), None)
+
+
+@patch("twilio.rest.resources.make_request")
+class CachedRequestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = MemoryCache()
+        self.connection = Connection(cache=self.cache)
+
+    def request(self, method="GET", uri=BASE_URI + "/Calls/CA123", **kw):
+        return make_twilio_request(method, uri, auth=("AC123", "token"),
+                                   connection=self.connection, **kw)
+
+    def test_hit(self, mock):
+        mock.return_value = response('{"status": "completed"}')
+        self.request()
+        resp = self.request()
+
+        self.assertEquals(mock.call_count, 1)
+        self.assertTrue(resp.cached)
+        self.assertEquals(resp.status_code, 200)
+        self.assertEquals(resp.content, '{"status": "completed"}')
+        self.assertEquals(self.cache.hits, 1)
+        self.assertEquals(self.cache.misses, 1)
+
+    def test_in_progress_not_cached(self, mock):
+        mock.return_value = response('{"status": "in-progress"}')
+        self.request()
+        self.request()
+        self.assertEquals(mock.call_count, 2)
+
+    def test_params_in_key(self, mock):
+        mock.return_value = response('{"status": "completed"}')
+        self.cache.rules = TTLRules(default=10)
+        self.request(params={"Page": 1})
+        self.request(params={"Page": 2})
+        self.request(params={"Page": 1})
+        self.assertEquals(mock.call_count, 2)
+
+    def test_update_invalidates(self, mock):
+        mock.return_value = response('{"status": "completed"}')
+        self.request()
+        self.request("POST", data={"Status": "completed"})
+        self.request()
+        self.assertEquals(mock.call_count, 3)
+
+    def test_errors_not_cached(self, mock):
+        mock.return_value = response('{"status": "completed"}', 500)
+        self.cache.rules = TTLRules(default=10)
+        self.assertRaises(Exception, self.request)
+        self.assertEquals(self.cache.entries, {})
+
+
+class ClientCacheTest(unittest.TestCase):
+
+    def test_cache(self):
+        cache = MemoryCache()
+        client = TwilioRestClient("AC123", "token", cache=cache)
+        self.assertTrue(client.connection.cache is cache)
+        self.assertTrue(client.connection.for_threads(2).cache is cache)
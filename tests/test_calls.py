@@ -1,7 +1,9 @@
 from datetime import date
 from mock import patch, Mock
 from nose.tools import raises, assert_equals, assert_true
+from twilio.rest.connection import Connection
 from twilio.rest.resources import Calls
+from twilio.rest.resources import split_dates
 from tools import create_mock_json
 
 BASE_URI = "https://api.twilio.com/2010-04-01/Accounts/AC123"
@@ -72,3 +74,175 @@ def test_cancel(mock):
 @raises(AttributeError)
 def test_create():
     list_resource.delete
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_list_paging_info(mock):
+    resp = create_mock_json("tests/resources/calls_list.json")
+    mock.return_value = resp
+
+    page = list_resource.list()
+    assert_equals(page.total, 509)
+    assert_equals(page.next_page_uri, "/2010-04-01/Accounts/"
+        "AC4bf2dafbed59a5733d2c1c1c69a83a28/Calls.json?Page=1&PageSize=50")
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_iter_follows_next_page_uri(mock):
+    first = create_mock_json("tests/resources/calls_list.json")
+    last = Mock()
+    last.content = '{"calls": [{"sid": "CA123"}], "next_page_uri": null}'
+    mock.side_effect = [first, last]
+
+    calls = list(list_resource.iter(page_size=50, status="completed"))
+    assert_equals(len(calls), 51)
+    assert_equals(calls[-1].sid, "CA123")
+
+    uri = "https://api.twilio.com/2010-04-01/Accounts/" \
+        "AC4bf2dafbed59a5733d2c1c1c69a83a28/Calls.json?Page=1&PageSize=50"
+    mock.assert_called_with("GET", uri, auth=AUTH,
+                            headers={"Accept": "application/json"})
+    assert_equals(mock.call_args_list[0][1]["params"],
+                  {"Status": "completed", "PageSize": 50})
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_iter_pages(mock):
+    last = Mock()
+    last.content = '{"calls": [], "next_page_uri": null}'
+    mock.return_value = last
+
+    pages = list(list_resource.iter_pages())
+    assert_equals(len(pages), 1)
+    assert_equals(mock.call_count, 1)
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_iter_prefetch(mock):
+    first = create_mock_json("tests/resources/calls_list.json")
+    last = Mock()
+    last.content = '{"calls": [{"sid": "CA123"}], "next_page_uri": null}'
+    mock.side_effect = [first, last]
+
+    calls = list(list_resource.iter(prefetch=2))
+    assert_equals(len(calls), 51)
+    assert_equals(mock.call_count, 2)
+
+def test_split_dates():
+    ranges = split_dates(date(2012, 1, 1), date(2012, 1, 10), 3)
+    assert_equals(ranges, [
+        (date(2012, 1, 7), date(2012, 1, 10)),
+        (date(2012, 1, 4), date(2012, 1, 6)),
+        (date(2012, 1, 1), date(2012, 1, 3)),
+        ])
+
+def test_split_dates_whole_days():
+    ranges = split_dates(date(2012, 1, 1), date(2012, 1, 2), 10)
+    assert_equals(ranges, [
+        (date(2012, 1, 2), date(2012, 1, 2)),
+        (date(2012, 1, 1), date(2012, 1, 1)),
+        ])
+
+def date_range_response(method, uri, params=None, **kwargs):
+    resp = Mock()
+    if params.get("PageSize") == 1:
+        resp.content = '{"calls": [], "total": 3, "next_page_uri": null}'
+    elif params["StartTime>"] == "2012-01-02":
+        resp.content = ('{"calls": [{"sid": "CA3"}, {"sid": "CA2"}], '
+                        '"next_page_uri": null}')
+    else:
+        resp.content = ('{"calls": [{"sid": "CA2"}, {"sid": "CA1"}], '
+                        '"next_page_uri": null}')
+    return resp
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_iter_date_range(mock):
+    mock.side_effect = date_range_response
+
+    calls = list(list_resource.iter_date_range(date(2012, 1, 1),
+        "2012-01-02", shard_size=2, status="completed"))
+    assert_equals([c.sid for c in calls], ["CA3", "CA2", "CA1"])
+
+    assert_equals(mock.call_args_list[0][1]["params"], {
+        "StartTime>": "2012-01-01", "StartTime<": "2012-01-02",
+        "Status": "completed", "PageSize": 1})
+    assert_equals(mock.call_count, 3)
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_iter_date_range_empty(mock):
+    resp = Mock()
+    resp.content = '{"calls": [], "total": 0, "next_page_uri": null}'
+    mock.return_value = resp
+
+    calls = list(list_resource.iter_date_range(date(2012, 1, 1),
+                                               date(2012, 12, 31)))
+    assert_equals(calls, [])
+    assert_equals(mock.call_count, 1)
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_lazy_page(mock):
+    mock.return_value = create_mock_json("tests/resources/calls_list.json")
+
+    page = list_resource.as_lazy().list()
+    assert_equals(len(page), 50)
+    assert_equals(page.total, 509)
+    assert_equals(page.loaded, [None] * 50)
+
+    call = page[-1]
+    assert_true(page[49] is call)
+    assert_equals(page.entries[49], None)
+    assert_equals(call.from_, "+141586753091")
+    assert_equals(len([c for c in page.loaded if c is not None]), 1)
+    assert_equals(len(page[:3]), 3)
+    assert_equals(len(list(page)), 50)
+
+@raises(IndexError)
+@patch("twilio.rest.resources.make_twilio_request")
+def test_lazy_page_index(mock):
+    mock.return_value = create_mock_json("tests/resources/calls_list.json")
+    list_resource.as_lazy().list()[50]
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_lazy_fields(mock):
+    mock.return_value = create_mock_json("tests/resources/calls_list.json")
+
+    call = list_resource.as_lazy(fields=["status", "from_"]).list()[0]
+    assert_equals(sorted(vars(call).keys()), ["auth", "base_uri",
+        "connection", "from_", "name", "parent", "sid", "status"])
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_lazy_records(mock):
+    mock.return_value = create_mock_json("tests/resources/calls_list.json")
+
+    calls = list_resource.as_records().as_lazy(fields=["duration"])
+    call = calls.list()[0]
+    assert_equals(call.extra, None)
+    assert_equals(call.status, None)
+    assert_true(call.duration is not None)
+
+def get_many_response(method, uri, **kwargs):
+    resp = Mock()
+    resp.status_code = 200
+    resp.content = '{"sid": "%s"}' % uri.split("/")[-1][:-5]
+    if "CA404" in uri:
+        resp.status_code = 404
+        resp.content = '{"code": 20404, "message": "Not found"}'
+    elif "CA500" in uri:
+        resp.status_code = 500
+        resp.content = '{"code": 20500, "message": "Internal error"}'
+    resp.ok = resp.status_code < 400
+    return resp
+
+@patch("twilio.rest.resources.make_request")
+def test_get_many(mock):
+    mock.side_effect = get_many_response
+    limiter = Mock()
+    calls = Calls(BASE_URI, AUTH, Connection(rate_limiter=limiter))
+
+    sids = ["CA1", "CA2", "CA404", "CA500", "CA3"]
+    instances = calls.get_many(iter(sids), concurrency=3)
+
+    assert_equals(sorted(instances.keys()), ["CA1", "CA2", "CA3"])
+    assert_equals(instances["CA2"].sid, "CA2")
+    assert_equals(instances.missing, ["CA404"])
+    assert_equals(instances.failed.keys(), ["CA500"])
+    assert_equals(instances.failed["CA500"].status, 500)
+    assert_equals(mock.call_count, 5)
+    assert_equals(limiter.acquire.call_count, 5)
+    limiter.acquire.assert_called_with(ACCOUNT_SID, None)
@@ -0,0 +1,316 @@
+import os
+import resource
+import socket
+import sys
+import threading
+import time
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+import httplib2
+from mock import patch, Mock
+from twilio import TwilioException
+from twilio.rest import TwilioRestClient
+from twilio.rest.connection import BlockingConnectionPool
+from twilio.rest.connection import Connection
+from twilio.rest.connection import ConnectionPool
+from twilio.rest.connection import ThreadSafeConnection
+from twilio.rest.connection import is_stale
+from twilio.rest.resources import make_request
+from tools import create_http_response
+
+
+def mock_connection():
+    conn = Mock()
+    conn.sock = Mock()
+    return conn
+
+
+class ConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ConnectionPool("https", "api.twilio.com", maxsize=2)
+
+    def test_new_connection(self):
+        conn = self.pool.get()
+        self.assertEquals(conn.host, "api.twilio.com")
+        self.assertTrue(conn.sock is None)
+
+    @patch("twilio.rest.connection.is_stale")
+    def test_reuse(self, stale):
+        stale.return_value = False
+        conn = mock_connection()
+        self.pool.put(conn)
+        self.assertTrue(self.pool.get(timeout=5) is conn)
+        conn.sock.settimeout.assert_called_with(5)
+
+    @patch("twilio.rest.connection.is_stale")
+    def test_maxsize(self, stale):
+        stale.return_value = False
+        conns = [mock_connection() for i in range(3)]
+        for conn in conns:
+            self.pool.put(conn)
+
+        self.assertEquals(len(self.pool.idle), 2)
+        self.assertTrue(conns[2].close.called)
+
+    def test_closed_connection_discarded(self):
+        conn = Mock()
+        conn.sock = None
+        self.pool.put(conn)
+        self.assertEquals(self.pool.idle, [])
+
+    @patch("twilio.rest.connection.is_stale")
+    def test_stale_connection_discarded(self, stale):
+        stale.return_value = True
+        conn = mock_connection()
+        self.pool.put(conn)
+
+        self.assertFalse(self.pool.get() is conn)
+        self.assertTrue(conn.close.called)
+
+    def test_idle_eviction(self):
+        conn = mock_connection()
+        self.pool.idle.append((conn, 0))
+        self.pool.evict()
+
+        self.assertEquals(self.pool.idle, [])
+        self.assertTrue(conn.close.called)
+
+    @patch("twilio.rest.connection.is_stale")
+    def test_shared_by_threads(self, stale):
+        stale.return_value = False
+        errors = []
+
+        def worker():
+            try:
+                for i in range(100):
+                    conn = self.pool.get()
+                    conn.sock = Mock()
+                    self.pool.put(conn)
+            except Exception, e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEquals(errors, [])
+        self.assertTrue(len(self.pool.idle) <= 2)
+
+
+class BlockingConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = BlockingConnectionPool("https", "api.twilio.com",
+                                           maxsize=1, pool_timeout=0.01)
+
+    def test_exhausted(self):
+        self.pool.get()
+        self.assertRaises(TwilioException, self.pool.get)
+
+    def test_closed_connection_frees_slot(self):
+        conn = self.pool.get()
+        self.pool.put(conn)
+        self.assertEquals(self.pool.num_connections, 0)
+        self.pool.get()
+
+    @patch("twilio.rest.connection.is_stale")
+    def test_waits_for_checkin(self, stale):
+        stale.return_value = False
+        self.pool.pool_timeout = None
+        conn = self.pool.get()
+        conn.sock = Mock()
+        result = []
+
+        t = threading.Thread(target=lambda: result.append(self.pool.get()))
+        t.start()
+        self.pool.put(conn)
+        t.join(1)
+
+        self.assertEquals(result, [conn])
+        self.assertEquals(self.pool.num_connections, 1)
+
+
+class IsStaleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server, self.client = socket.socketpair()
+        self.conn = Mock()
+        self.conn.sock = self.client
+
+    def tearDown(self):
+        self.server.close()
+        self.client.close()
+
+    def test_open(self):
+        self.assertFalse(is_stale(self.conn))
+
+    def test_closed_by_peer(self):
+        self.server.close()
+        self.assertTrue(is_stale(self.conn))
+
+    def test_high_descriptor(self):
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard != resource.RLIM_INFINITY and hard < 1200:
+            self.skipTest("Can't open more than 1024 files")
+        resource.setrlimit(resource.RLIMIT_NOFILE, (max(soft, 1200), hard))
+
+        # Fill the descriptors below 1024, which select() can watch
+        held = [os.dup(self.client.fileno()) for i in range(1100)]
+        try:
+            server, client = socket.socketpair()
+            self.assertTrue(client.fileno() >= 1024)
+            self.conn.sock = client
+            self.assertFalse(is_stale(self.conn))
+            server.close()
+            self.assertTrue(is_stale(self.conn))
+            client.close()
+        finally:
+            for fd in held:
+                os.close(fd)
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+class ConnectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = Connection()
+        self.conn = mock_connection()
+        self.conn.getresponse.side_effect = lambda: create_http_response("{}")
+        self.pool = Mock()
+        self.pool.get.return_value = self.conn
+        self.connection.pools[("https", "api.twilio.com")] = self.pool
+
+    def test_request(self):
+        resp, content = self.connection.request(
+            "https://api.twilio.com/2010-04-01/Accounts.json?Page=1",
+            "GET", auth=("AC123", "token"))
+
+        self.conn.request.assert_called_with("GET",
+            "/2010-04-01/Accounts.json?Page=1", None,
+            {"Authorization": "Basic QUMxMjM6dG9rZW4="})
+        self.pool.put.assert_called_with(self.conn)
+        self.assertEquals(resp.status, 200)
+        self.assertEquals(resp["content-length"], "2")
+        self.assertEquals(content, "{}")
+
+    def test_retry_reused_connection(self):
+        self.conn.request.side_effect = [socket.error, None]
+        self.connection.request("https://api.twilio.com/", "GET")
+
+        self.assertEquals(self.conn.request.call_count, 2)
+        self.pool.put.assert_called_with(self.conn)
+
+    def test_fresh_connection_error_raises(self):
+        self.conn.sock = None
+        self.conn.request.side_effect = socket.error
+        self.assertRaises(socket.error, self.connection.request,
+                          "https://api.twilio.com/", "GET")
+        self.assertTrue(self.conn.close.called)
+        self.pool.put.assert_called_with(self.conn)
+
+
+class ConnectionPoolsTest(unittest.TestCase):
+
+    def test_one_pool_per_host(self):
+        connection = Connection()
+        pools = []
+
+        def slow_pool(*args, **kwargs):
+            time.sleep(0.01)
+            return ConnectionPool(*args, **kwargs)
+
+        connection.pool_class = slow_pool
+
+        def worker():
+            pools.append(connection.get_pool("https", "api.twilio.com"))
+
+        threads = [threading.Thread(target=worker) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEquals(len(set(pools)), 1)
+        self.assertEquals(connection.pools.values(), [pools[0]])
+
+
+class ForThreadsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = Connection(retry=Mock())
+
+    def test_shared(self):
+        threaded = self.connection.for_threads(2)
+        self.assertTrue(isinstance(threaded, ThreadSafeConnection))
+        self.assertTrue(threaded.retry is self.connection.retry)
+        self.assertTrue(threaded.in_flight is self.connection.in_flight)
+        self.assertTrue(self.connection.for_threads(2) is threaded)
+        self.assertTrue(threaded.for_threads(4) is threaded)
+
+    def test_grows(self):
+        threaded = self.connection.for_threads(2)
+        pool = threaded.get_pool("https", "api.twilio.com")
+
+        self.assertTrue(self.connection.for_threads(8) is threaded)
+        self.assertEquals(threaded.maxsize, 8)
+        self.assertEquals(pool.maxsize, 8)
+
+        self.connection.for_threads(4)
+        self.assertEquals(threaded.maxsize, 8)
+
+    def test_closed_together(self):
+        pool = Mock()
+        self.connection.for_threads(2).pools[("https", "host")] = pool
+        self.connection.close()
+        self.assertTrue(pool.close.called)
+
+
+class MakeRequestTest(unittest.TestCase):
+
+    @patch("httplib2.Http")
+    def test_uses_connection(self, http):
+        connection = Mock()
+        connection.request.return_value = (httplib2.Response({}), "{}")
+
+        make_request("GET", "https://api.twilio.com/", auth=("AC123", "tk"),
+                     params={"hey": "you"}, connection=connection)
+
+        connection.request.assert_called_with("https://api.twilio.com/?hey=you",
+            "GET", headers=None, body=None, auth=("AC123", "tk"), timeout=None)
+        self.assertFalse(http.called)
+
+
+class ClientConnectionTest(unittest.TestCase):
+
+    def test_shared_connection(self):
+        client = TwilioRestClient("AC123", "token")
+        self.assertTrue(client.calls.connection is client.connection)
+        self.assertTrue(client.sms.messages.connection is client.connection)
+        self.assertTrue(client.participants("CF123").connection
+                        is client.connection)
+
+    def test_custom_connection(self):
+        connection = Connection(maxsize=20)
+        client = TwilioRestClient("AC123", "token", connection=connection)
+        self.assertTrue(client.conferences.connection is connection)
+
+    def test_custom_connection_settings(self):
+        connection = Connection(retry=Mock())
+        client = TwilioRestClient("AC123", "token", connection=connection)
+        self.assertTrue(client.calls.connection.retry is connection.retry)
+
+        self.assertRaises(TwilioException, TwilioRestClient, "AC123",
+                          "token", connection=connection, retry=Mock())
+        self.assertRaises(TwilioException, TwilioRestClient, "AC123",
+                          "token", connection=connection, hooks=Mock())
+
+    def test_instance_shares_connection(self):
+        client = TwilioRestClient("AC123", "token")
+        call = client.calls.load_instance({"sid": "CA123"})
+        self.assertTrue(call.connection is client.connection)
+        self.assertTrue(call.recordings.connection is client.connection)
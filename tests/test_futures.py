@@ -0,0 +1,244 @@
+import sys
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+import threading
+from twilio.rest.futures import Batch
+from twilio.rest.futures import Executor
+from twilio.rest.futures import Future
+from twilio.rest.futures import SingleFlight
+from twilio.rest.futures import as_completed
+from twilio.rest.futures import prefetch
+
+
+class FutureTest(unittest.TestCase):
+
+    def test_result(self):
+        f = Future()
+        f.set_result(3)
+        self.assertTrue(f.done())
+        self.assertEquals(f.result(), 3)
+        self.assertEquals(f.exception(), None)
+
+    def test_exception(self):
+        f = Future()
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            f.set_exception(sys.exc_info())
+
+        self.assertRaises(ValueError, f.result)
+        self.assertTrue(isinstance(f.exception(), ValueError))
+
+    def test_timeout(self):
+        self.assertRaises(RuntimeError, Future().result, 0.01)
+
+    def test_callbacks(self):
+        seen = []
+        f = Future()
+        f.add_done_callback(seen.append)
+        f.set_result(None)
+        f.add_done_callback(seen.append)
+        self.assertEquals(seen, [f, f])
+
+
+class ExecutorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = Executor(max_workers=4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_submit(self):
+        f = self.executor.submit(lambda a, b=0: a + b, 1, b=2)
+        self.assertEquals(f.result(1), 3)
+
+    def test_map(self):
+        self.assertEquals(self.executor.map(abs, [-1, -2, 3]), [1, 2, 3])
+
+    def test_concurrent(self):
+        barrier = threading.Event()
+        blocked = [self.executor.submit(barrier.wait, 1) for i in range(3)]
+        self.executor.submit(barrier.set).result(1)
+        for f in blocked:
+            f.result(1)
+
+    def test_max_workers(self):
+        for i in range(10):
+            self.executor.submit(lambda: None)
+        self.assertEquals(len(self.executor.threads), 4)
+
+    def test_as_completed(self):
+        slow = threading.Event()
+        first = self.executor.submit(slow.wait, 1)
+        second = self.executor.submit(lambda: 2)
+
+        completed = as_completed([first, second])
+        self.assertTrue(completed.next() is second)
+        slow.set()
+        self.assertTrue(completed.next() is first)
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_ordered(self):
+        batch = Batch(lambda x: x * 2, xrange(20), concurrency=3,
+                      ordered=True)
+        self.assertEquals([r for item, r, e in batch],
+                          [x * 2 for x in range(20)])
+        self.assertEquals(batch.succeeded, 20)
+        self.assertTrue(batch.throughput > 0)
+
+    def test_as_completed(self):
+        slow = threading.Event()
+
+        def work(x):
+            if x == 0:
+                slow.wait(1)
+            return x
+
+        results = []
+        for item, result, error in Batch(work, [0, 1, 2], concurrency=3):
+            results.append(result)
+            slow.set()
+
+        self.assertEquals(results[-1], 0)
+        self.assertEquals(sorted(results), [0, 1, 2])
+
+    def test_errors(self):
+        def work(x):
+            if x % 2:
+                raise ValueError(x)
+            return x
+
+        batch = Batch(work, range(6), ordered=True).wait()
+        self.assertEquals(batch.succeeded, 3)
+        self.assertEquals(batch.failed, 3)
+        self.assertEquals([item for item, e in batch.errors], [1, 3, 5])
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def work(x):
+            lock.acquire()
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            lock.release()
+            threading.Event().wait(0.001)
+            lock.acquire()
+            running[0] -= 1
+            lock.release()
+
+        Batch(work, range(50), concurrency=4).wait()
+        self.assertTrue(peak[0] <= 4)
+
+
+class PrefetchTest(unittest.TestCase):
+
+    def test_order(self):
+        self.assertEquals(list(prefetch(xrange(10), 3)), range(10))
+
+    def test_exception(self):
+        def pages():
+            yield 1
+            raise ValueError("bad page")
+
+        results = prefetch(pages())
+        self.assertEquals(results.next(), 1)
+        self.assertRaises(ValueError, results.next)
+
+    def test_runs_ahead_within_depth(self):
+        produced = []
+
+        def pages():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        results = prefetch(pages(), 2)
+        self.assertEquals(results.next(), 0)
+        threading.Event().wait(0.1)
+        # 1 and 2 queued, 3 waiting to be queued
+        self.assertEquals(produced, [0, 1, 2, 3])
+        results.close()
+
+    def test_close_stops_producer(self):
+        stopped = threading.Event()
+
+        def pages():
+            try:
+                while True:
+                    yield 1
+            finally:
+                stopped.set()
+
+        results = prefetch(pages(), 1)
+        results.next()
+        results.close()
+        stopped.wait(1)
+        self.assertTrue(stopped.isSet())
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = []
+
+    def slow(self, value):
+        self.calls.append(value)
+        self.started.set()
+        self.release.wait(1)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def run_together(self, key, value, count=5):
+        results = []
+
+        def call():
+            try:
+                results.append(self.flight.do(key, self.slow, value))
+            except Exception, e:
+                results.append(e)
+
+        threads = [threading.Thread(target=call) for i in range(count)]
+        threads[0].start()
+        self.started.wait(1)
+        for t in threads[1:]:
+            t.start()
+        threading.Event().wait(0.05)
+        self.release.set()
+        for t in threads:
+            t.join(1)
+        return results
+
+    def test_shared_result(self):
+        results = self.run_together("CA123", "call")
+        self.assertEquals(results, ["call"] * 5)
+        self.assertEquals(self.calls, ["call"])
+        self.assertEquals(self.flight.calls, {})
+
+    def test_shared_exception(self):
+        error = ValueError("bad")
+        results = self.run_together("CA123", error)
+        self.assertEquals(results, [error] * 5)
+        self.assertEquals(self.calls, [error])
+
+    def test_sequential_calls_not_shared(self):
+        self.release.set()
+        self.flight.do("CA123", self.slow, 1)
+        self.flight.do("CA123", self.slow, 2)
+        self.assertEquals(self.calls, [1, 2])
+
+    def test_different_keys(self):
+        self.release.set()
+        self.flight.do("CA123", self.slow, 1)
+        self.flight.do("CA456", self.slow, 2)
+        self.assertEquals(self.calls, [1, 2])
@@ -0,0 +1,112 @@
+import sys
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+import httplib2
+from mock import patch
+from twilio import TwilioRestException
+from twilio.rest import TwilioRestClient
+from twilio.rest.connection import Connection
+from twilio.rest.hooks import Hooks
+from twilio.rest.hooks import url_template
+from twilio.rest.resources import Response
+from tools import FixtureServer
+from tools import create_http_response
+
+
+class UrlTemplateTest(unittest.TestCase):
+
+    def test_sids_replaced(self):
+        self.assertEquals(url_template("https://api.twilio.com/2010-04-01"
+                                       "/Accounts/AC123/Calls/CAabc.json"),
+                          "/2010-04-01/Accounts/{sid}/Calls/{sid}.json")
+
+    def test_names_kept(self):
+        self.assertEquals(url_template("/2010-04-01/Accounts/AC123/SMS"
+                                       "/Messages?Page=2"),
+                          "/2010-04-01/Accounts/{sid}/SMS/Messages")
+
+
+class HooksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FixtureServer("tests/resources/calls_list.json")
+        self.server.start()
+        self.events = []
+        self.hooks = Hooks()
+        self.hooks.before_request(lambda e: self.events.append(("before", e)))
+        self.hooks.after_request(lambda e: self.events.append(("after", e)))
+        self.client = TwilioRestClient("AC123", "token",
+                                       base=self.server.base,
+                                       hooks=self.hooks)
+
+    def tearDown(self):
+        self.client.connection.close()
+        self.server.stop()
+
+    def test_hooks_run(self):
+        self.client.calls.list()
+
+        (before, event), (after, same) = self.events
+        self.assertEquals((before, after), ("before", "after"))
+        self.assertTrue(event is same)
+        self.assertEquals(event.method, "GET")
+        self.assertEquals(event.resource, "Calls")
+        self.assertEquals(event.uri_template,
+                          "/2010-04-01/Accounts/{sid}/Calls.json")
+        self.assertEquals(event.status, 200)
+        self.assertEquals(event.bytes_sent, 0)
+        self.assertEquals(event.bytes_received, len(self.server.body))
+        self.assertTrue(event.elapsed > 0)
+
+    def test_timing(self):
+        self.client.calls.list()
+        self.client.calls.list()
+
+        first, second = [e for kind, e in self.events if kind == "after"]
+        self.assertFalse(first.reused)
+        self.assertTrue(first.timing["connect"] >= 0)
+        self.assertTrue(second.reused)
+        self.assertEquals(second.timing["connect"], None)
+
+        for key in ["ttfb", "download", "decode"]:
+            self.assertTrue(second.timing[key] >= 0)
+
+    def test_failing_hook_ignored(self):
+        self.hooks.before_request(lambda e: 1 / 0)
+        self.client.calls.list()
+        self.assertEquals(len(self.events), 2)
+
+    def test_connection_shared_with_threads(self):
+        connection = self.client.connection.for_threads(2)
+        self.assertTrue(connection.hooks is self.hooks)
+
+    @patch("twilio.rest.resources.make_request")
+    def test_error(self, request):
+        request.return_value = Response(httplib2.Response({"status": 404}),
+                                        '{"code": 20404, "message": "No"}',
+                                        "https://api.twilio.com/")
+
+        self.assertRaises(TwilioRestException, self.client.calls.get,
+                          "CA123")
+
+        kind, event = self.events[-1]
+        self.assertEquals(event.status, 404)
+        self.assertTrue(isinstance(event.error, TwilioRestException))
+
+
+class ResponseTimingTest(unittest.TestCase):
+
+    def test_request_timing(self):
+        conn = Connection()
+        resp = create_http_response("{}")
+
+        response = Response(conn.response(resp, "To=1", {"ttfb": 0.1}),
+                            "{}", "https://api.twilio.com/")
+
+        self.assertEquals(response.timing["ttfb"], 0.1)
+        self.assertEquals(response.timing["tls"], None)
+        self.assertTrue(response.reused)
+        self.assertEquals(response.bytes_sent, 4)
+        self.assertEquals(response.bytes_received, 2)
@@ -0,0 +1,151 @@
+import sys
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+import httplib2
+from mock import Mock
+from mock import patch
+from twilio import TwilioRestException
+from twilio.rest import Hooks
+from twilio.rest import Metrics
+from twilio.rest import TwilioRestClient
+from twilio.rest import RetryPolicy
+from twilio.rest.hooks import RequestEvent
+from twilio.rest.resources import Response
+from twilio.rest.metrics import bucket
+from twilio.rest.metrics import endpoint
+from tools import FixtureServer
+
+BASE = "https://api.twilio.com/2010-04-01/Accounts/AC123"
+
+
+def event(method, url, status=200, elapsed=0.01, retries=0,
+          bytes_received=100):
+    event = RequestEvent(method, "Resource", url)
+    event.status = status
+    event.elapsed = elapsed
+    event.retries = retries
+    event.bytes_received = bytes_received
+    return event
+
+
+class EndpointTest(unittest.TestCase):
+
+    def test_endpoints(self):
+        for url, name in [
+                ("/2010-04-01/Accounts/{sid}/Calls.json", "Calls"),
+                ("/2010-04-01/Accounts/{sid}/Calls/{sid}.json", "Calls"),
+                ("/2010-04-01/Accounts/{sid}/SMS/Messages/{sid}.json",
+                 "SMS/Messages"),
+                ("/2010-04-01/Accounts/{sid}/Calls/{sid}/Recordings.json",
+                 "Calls/Recordings"),
+                ("/2010-04-01/Accounts/{sid}.json", "Accounts"),
+                ("/2010-04-01/Accounts.json", "Accounts")]:
+            self.assertEquals(endpoint(url), name)
+
+    def test_buckets(self):
+        self.assertEquals(bucket(0), 0)
+        self.assertEquals(bucket(0.001), 0)
+        self.assertEquals(bucket(0.0015), 1)
+        self.assertEquals(bucket(0.002), 1)
+        self.assertEquals(bucket(0.003), 2)
+        self.assertEquals(bucket(10 ** 6), 18)
+
+
+class MetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = Metrics()
+        self.metrics(event("GET", BASE + "/Calls/CA1.json", elapsed=0.003))
+        self.metrics(event("GET", BASE + "/Calls/CA2.json", status=404,
+                           elapsed=0.5, retries=2))
+        self.metrics(event("POST", BASE + "/SMS/Messages.json", status=201))
+
+    def test_to_dict(self):
+        data = self.metrics.to_dict()
+        calls = data["Calls"]["GET"]
+
+        self.assertEquals(sorted(data.keys()), ["Calls", "SMS/Messages"])
+        self.assertEquals(calls["requests"], {200: 1, 404: 1})
+        self.assertEquals(calls["retries"], 2)
+        self.assertEquals(calls["bytes_received"], 200)
+        self.assertEquals(calls["latency"]["count"], 2)
+        self.assertAlmostEquals(calls["latency"]["sum"], 0.503)
+
+        buckets = dict(calls["latency"]["buckets"])
+        self.assertEquals(buckets[0.002], 0)
+        self.assertEquals(buckets[0.004], 1)
+        self.assertEquals(buckets[0.512], 2)
+        self.assertEquals(buckets[float("inf")], 2)
+
+    def test_errors_and_cache(self):
+        failed = event("GET", BASE + "/Calls.json", status=None)
+        cached = event("GET", BASE + "/Calls.json")
+        cached.cached = True
+        self.metrics(failed)
+        self.metrics(cached)
+
+        requests = self.metrics.to_dict()["Calls"]["GET"]["requests"]
+        self.assertEquals(requests["error"], 1)
+        self.assertEquals(requests["cached"], 1)
+
+    def test_prometheus(self):
+        text = self.metrics.to_prometheus()
+
+        self.assertTrue("# TYPE twilio_requests_total counter\n" in text)
+        self.assertTrue('twilio_requests_total{endpoint="Calls",'
+                        'method="GET",status="404"} 1\n' in text)
+        self.assertTrue('twilio_retries_total{endpoint="Calls",'
+                        'method="GET"} 2\n' in text)
+        self.assertTrue('twilio_request_duration_seconds_bucket{'
+                        'endpoint="Calls",method="GET",le="0.004"} 1\n'
+                        in text)
+        self.assertTrue('twilio_request_duration_seconds_bucket{'
+                        'endpoint="Calls",method="GET",le="+Inf"} 2\n' in text)
+        self.assertTrue('twilio_request_duration_seconds_count{'
+                        'endpoint="SMS/Messages",method="POST"} 1\n' in text)
+
+    def test_reset(self):
+        self.metrics.reset()
+        self.assertEquals(self.metrics.to_dict(), {})
+
+
+class ClientMetricsTest(unittest.TestCase):
+
+    def test_client_requests_recorded(self):
+        server = FixtureServer("tests/resources/calls_list.json")
+        server.start()
+        metrics = Metrics()
+        client = TwilioRestClient("AC123", "token", base=server.base,
+                                  hooks=Hooks(after=[metrics]))
+
+        try:
+            client.calls.list()
+            client.calls.list()
+        finally:
+            client.connection.close()
+            server.stop()
+
+        calls = metrics.to_dict()["Calls"]["GET"]
+        self.assertEquals(calls["requests"], {200: 2})
+        self.assertEquals(calls["bytes_received"], 2 * len(server.body))
+
+    @patch("twilio.rest.resources.make_request")
+    def test_exhausted_retries_recorded(self, request):
+        body = '{"code": 20503, "message": "Unavailable"}'
+        request.return_value = Response(httplib2.Response({"status": 503}),
+                                        body, BASE + "/Calls.json")
+        policy = RetryPolicy(max_attempts=3)
+        policy.sleep = Mock()
+        metrics = Metrics()
+        client = TwilioRestClient("AC123", "token", retry=policy,
+                                  hooks=Hooks(after=[metrics]))
+
+        self.assertRaises(TwilioRestException, client.calls.list)
+
+        calls = metrics.to_dict()["Calls"]["GET"]
+        self.assertEquals(policy.retries, 2)
+        self.assertEquals(calls["retries"], 2)
+        self.assertEquals(calls["requests"], {503: 1})
+        self.assertEquals(calls["bytes_received"], len(body))
@@ -0,0 +1,151 @@
+import sys
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+import threading
+from mock import patch, Mock
+from twilio import TwilioRestException
+from twilio.rest import TwilioRestClient
+from twilio.rest.connection import Connection
+from twilio.rest.ratelimit import RateLimiter
+from twilio.rest.ratelimit import TokenBucket
+from twilio.rest.ratelimit import is_short_code
+from twilio.rest.resources import make_twilio_request
+from twilio.rest.retry import RetryPolicy
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    @patch("time.time")
+    def test_reserve(self, time):
+        time.return_value = 100
+        bucket = TokenBucket(2, capacity=2)
+
+        self.assertEquals(bucket.reserve(), 0)
+        self.assertEquals(bucket.reserve(), 0)
+        self.assertEquals(bucket.reserve(), 0.5)
+        self.assertEquals(bucket.reserve(), 1)
+
+    @patch("time.time")
+    def test_refill(self, time):
+        time.return_value = 100
+        bucket = TokenBucket(1)
+        bucket.reserve()
+        self.assertFalse(bucket.available())
+
+        time.return_value = 101
+        self.assertTrue(bucket.available())
+
+        time.return_value = 200
+        bucket.refill(200)
+        self.assertEquals(bucket.tokens, 1)
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.limiter = RateLimiter(account_rate=10, long_code_rate=1,
+                                   short_code_rate=30)
+        self.limiter.sleep = Mock()
+
+    def test_short_code(self):
+        self.assertTrue(is_short_code("894546"))
+        self.assertFalse(is_short_code("+14158675309"))
+        self.assertFalse(is_short_code(None))
+
+    def test_long_code_blocks(self):
+        self.limiter.acquire("AC123", "+14158675309")
+        self.assertFalse(self.limiter.sleep.called)
+
+        self.limiter.acquire("AC123", "+14158675309")
+        delay = self.limiter.sleep.call_args[0][0]
+        self.assertTrue(0.9 < delay <= 1)
+
+    def test_short_code_burst(self):
+        self.limiter.account_rate = None
+        for i in range(30):
+            self.limiter.acquire("AC123", "894546")
+        self.assertFalse(self.limiter.sleep.called)
+
+    def test_senders_independent(self):
+        self.limiter.acquire("AC123", "+14158675309")
+        self.limiter.acquire("AC123", "+14158675310")
+        self.limiter.acquire("AC456", "+14158675309")
+        self.assertFalse(self.limiter.sleep.called)
+
+    def test_account_limit(self):
+        for i in range(10):
+            self.limiter.acquire("AC123")
+        self.limiter.acquire("AC123")
+        self.assertTrue(self.limiter.sleep.called)
+
+    def test_non_blocking(self):
+        self.assertTrue(self.limiter.acquire("AC123", "+1415", block=False))
+        self.assertFalse(self.limiter.acquire("AC123", "+1415", block=False))
+        # A refused request doesn't use up the account's tokens
+        self.assertEquals(
+            self.limiter.buckets[("account", "AC123")].tokens // 1, 9)
+
+    def test_reserve(self):
+        self.assertEquals(self.limiter.reserve("AC123", "+1415"), 0)
+        self.assertTrue(self.limiter.reserve("AC123", "+1415") > 0.9)
+
+    @patch("time.time")
+    def test_threads(self, time):
+        # No tokens are refilled while the threads run
+        time.return_value = 100
+        limiter = RateLimiter(account_rate=1000, account_burst=50,
+                              long_code_rate=None)
+        limiter.sleep = Mock()
+
+        def worker():
+            for i in range(10):
+                limiter.acquire("AC123")
+
+        threads = [threading.Thread(target=worker) for i in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertFalse(limiter.sleep.called)
+        self.assertEquals(limiter.buckets[("account", "AC123")].tokens, 0)
+
+
+class RateLimitRequestTest(unittest.TestCase):
+
+    @patch("twilio.rest.resources.make_request")
+    def test_make_twilio_request(self, mock):
+        limiter = Mock()
+        mock.return_value.ok = True
+
+        make_twilio_request("POST", "uri", auth=("AC123", "token"),
+                            data={"From": "+1415", "Body": "hey"},
+                            connection=Connection(rate_limiter=limiter))
+
+        limiter.acquire.assert_called_with("AC123", "+1415")
+
+    @patch("twilio.rest.resources.make_request")
+    def test_retries_take_tokens(self, mock):
+        limiter = Mock()
+        policy = RetryPolicy(max_attempts=3, jitter=False)
+        policy.sleep = Mock()
+        mock.return_value.ok = False
+        mock.return_value.status_code = 429
+        mock.return_value.headers = {}
+
+        self.assertRaises(TwilioRestException, make_twilio_request, "POST",
+                          "uri", auth=("AC123", "token"),
+                          data={"From": "+1415", "Body": "hey"},
+                          connection=Connection(retry=policy,
+                                                rate_limiter=limiter))
+
+        self.assertEquals(mock.call_count, 3)
+        self.assertEquals(limiter.acquire.call_count, 3)
+
+    def test_client(self):
+        limiter = RateLimiter()
+        client = TwilioRestClient("AC123", "token", rate_limiter=limiter)
+        self.assertTrue(client.sms.messages.connection.rate_limiter
+                        is limiter)
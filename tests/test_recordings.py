@@ -1,6 +1,7 @@
 from datetime import date
 from mock import patch, Mock
 from nose.tools import raises, assert_equals, assert_true
+from twilio import TwilioRestException
 from twilio.rest.resources import Recordings
 from tools import create_mock_json
 
@@ -55,3 +56,41 @@ def test_create():
 @raises(AttributeError)
 def test_update():
     recordings.update
+
+def delete_many_response(method, uri, **kwargs):
+    resp = Mock()
+    resp.status_code = 204
+    if "RE404" in uri:
+        raise TwilioRestException(404, uri, "Not found")
+    if "RE200" in uri:
+        resp.status_code = 200
+    return resp
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_delete_many(mock):
+    mock.side_effect = delete_many_response
+    consumed = []
+
+    def sids():
+        for sid in ["RE1", "RE404", "RE200", "RE2"]:
+            consumed.append(sid)
+            yield sid
+
+    batch = recordings.delete_many(sids(), concurrency=2)
+    assert_equals(consumed, [])
+
+    batch.wait()
+    assert_equals(batch.succeeded, 2)
+    assert_equals(batch.failed, 2)
+    assert_equals(sorted(sid for sid, error in batch.errors),
+                  ["RE200", "RE404"])
+    mock.assert_any_call("DELETE", "%s/Recordings/RE1" % BASE_URI,
+                         auth=AUTH)
+
+@patch("twilio.rest.resources.make_twilio_request")
+def test_delete_many_instances(mock):
+    mock.side_effect = delete_many_response
+    instances = [recordings.load_instance({"sid": "RE1"})]
+
+    outcomes = list(recordings.delete_many(instances))
+    assert_equals(outcomes, [("RE1", True, None)])
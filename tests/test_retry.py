@@ -0,0 +1,119 @@
+import socket
+import sys
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from mock import patch, Mock
+from twilio import TwilioRestException
+from twilio.rest import TwilioRestClient
+from twilio.rest.connection import Connection
+from twilio.rest.resources import make_twilio_request
+from twilio.rest.retry import RetryPolicy
+
+
+def response(status, headers=None):
+    resp = Mock()
+    resp.status_code = status
+    resp.ok = status < 400
+    resp.headers = headers or {}
+    resp.content = '{"code": 20429, "message": "Too Many Requests"}'
+    return resp
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, base_delay=1, jitter=False)
+        self.policy.sleep = Mock()
+        self.send = Mock()
+
+    def test_success(self):
+        self.send.return_value = response(200)
+        resp = self.policy.request(self.send, "GET", "uri", auth=None)
+
+        self.assertEquals(resp.status_code, 200)
+        self.send.assert_called_with("GET", "uri", auth=None)
+        self.assertEquals(self.policy.attempts, 1)
+        self.assertEquals(self.policy.retries, 0)
+
+    def test_backoff(self):
+        self.send.side_effect = [response(503), response(500), response(200)]
+        resp = self.policy.request(self.send, "GET", "uri")
+
+        self.assertEquals(resp.status_code, 200)
+        self.assertEquals(self.policy.sleep.call_args_list,
+                          [((1,), {}), ((2,), {})])
+        self.assertEquals(self.policy.attempts, 3)
+        self.assertEquals(self.policy.retries, 2)
+        self.assertEquals(self.policy.backoff_time, 3)
+
+    def test_gives_up(self):
+        self.send.return_value = response(503)
+        resp = self.policy.request(self.send, "GET", "uri")
+
+        self.assertEquals(resp.status_code, 503)
+        self.assertEquals(self.send.call_count, 3)
+
+    def test_max_delay(self):
+        self.policy.max_delay = 1.5
+        self.assertEquals(self.policy.backoff(3), 1.5)
+
+    def test_jitter(self):
+        self.policy.jitter = True
+        for i in range(20):
+            self.assertTrue(0 <= self.policy.backoff(2) <= 2)
+
+    def test_retry_after(self):
+        self.send.side_effect = [response(429, {"retry-after": "7"}),
+                                 response(200)]
+        self.policy.request(self.send, "GET", "uri")
+        self.policy.sleep.assert_called_with(7)
+
+    def test_retry_after_date(self):
+        resp = response(429, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.assertEquals(self.policy.retry_after(resp), 0)
+
+    def test_ignore_retry_after(self):
+        self.policy.respect_retry_after = False
+        resp = response(429, {"retry-after": "7"})
+        self.assertEquals(self.policy.retry_after(resp), None)
+
+    def test_post_not_retried_on_5xx(self):
+        self.send.return_value = response(500)
+        self.policy.request(self.send, "POST", "uri")
+        self.assertEquals(self.send.call_count, 1)
+
+    def test_post_retried_on_429(self):
+        self.send.side_effect = [response(429), response(201)]
+        resp = self.policy.request(self.send, "POST", "uri")
+        self.assertEquals(resp.status_code, 201)
+
+    def test_connection_error(self):
+        self.send.side_effect = [socket.error, response(200)]
+        resp = self.policy.request(self.send, "GET", "uri")
+        self.assertEquals(resp.status_code, 200)
+
+    def test_connection_error_post(self):
+        self.send.side_effect = socket.error
+        self.assertRaises(socket.error, self.policy.request, self.send,
+                          "POST", "uri")
+        self.assertEquals(self.send.call_count, 1)
+
+
+class RetryRequestTest(unittest.TestCase):
+
+    @patch("twilio.rest.resources.make_request")
+    def test_make_twilio_request(self, mock):
+        mock.side_effect = [response(503), response(404)]
+        policy = RetryPolicy(jitter=False)
+        policy.sleep = Mock()
+
+        self.assertRaises(TwilioRestException, make_twilio_request, "GET",
+                          "uri", connection=Connection(retry=policy))
+        self.assertEquals(mock.call_count, 2)
+
+    def test_client(self):
+        policy = RetryPolicy()
+        client = TwilioRestClient("AC123", "token", retry=policy)
+        self.assertTrue(client.calls.connection.retry is policy)
@@ -5,6 +5,9 @@ else:
     import unittest
 from datetime import date
 from mock import patch, Mock
+from twilio import TwilioRestException
+from twilio.rest.connection import Connection
+from twilio.rest.connection import ThreadSafeConnection
 from twilio.rest.resources import SmsMessages
 
 
@@ -31,5 +34,31 @@ class SmsTest(unittest.TestCase):
         self.resource.get_instances.assert_called_with(params={
             "DateSent<": "2011-01-01"})
 
+    def test_create_many(self):
+        def create(to=None, body=None):
+            if to == "+2":
+                raise TwilioRestException(400, "uri", "Invalid To")
+            return to
 
+        self.resource.create = Mock(side_effect=create)
+        messages = [{"to": "+%d" % i, "body": "hi"} for i in range(4)]
+        batch = self.resource.create_many(iter(messages), concurrency=2,
+                                          ordered=True)
 
+        results = [(params["to"], msg) for params, msg, error in batch]
+        self.assertEquals(results,
+                          [("+0", "+0"), ("+1", "+1"), ("+2", None), ("+3", "+3")])
+        self.assertEquals(batch.succeeded, 3)
+        self.assertEquals(batch.errors[0][0], messages[2])
+
+    def test_for_threads(self):
+        self.assertTrue(self.resource.for_threads(5) is self.resource)
+
+        self.resource.connection = Connection()
+        threaded = self.resource.for_threads(5)
+        self.assertTrue(isinstance(threaded.connection, ThreadSafeConnection))
+        self.assertEquals(threaded.connection.maxsize, 5)
+        self.assertEquals(threaded.uri, self.resource.uri)
+
+        self.resource.connection = ThreadSafeConnection()
+        self.assertTrue(self.resource.for_threads(5) is self.resource)
@@ -0,0 +1,136 @@
+from __future__ import with_statement
+try:
+    import json
+except ImportError:
+    import simplejson as json
+import sys
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+from twilio import TwilioException
+from twilio.rest import TwilioRestClient
+from twilio.rest.connection import Connection
+from twilio.rest.streaming import PageParser
+from tools import FixtureServer
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class KeywordDecoder(object):
+    """A decoder with the raw_decode(s, **kw) signature of Python 2.6"""
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+
+    def raw_decode(self, s, **kw):
+        return self.decoder.raw_decode(s, kw.get("idx", 0))
+
+
+class PageParserTest(unittest.TestCase):
+
+    def setUp(self):
+        with open("tests/resources/calls_list.json") as f:
+            self.body = f.read()
+        self.page = json.loads(self.body)
+
+    def parse(self, body, size, key="calls"):
+        parser = PageParser(chunked(body, size), key)
+        return list(parser), parser.paging
+
+    def test_matches_json(self):
+        calls = self.page.pop("calls")
+        for size in [1, 7, 100, 8192, len(self.body)]:
+            entries, paging = self.parse(self.body, size)
+            self.assertEquals(entries, calls)
+            self.assertEquals(paging, self.page)
+
+    def test_yields_before_body_ends(self):
+        chunks = iter(chunked(self.body, 512))
+        parser = iter(PageParser(chunks, "calls"))
+        first = parser.next()
+
+        self.assertEquals(first["sid"], self.page["calls"][0]["sid"])
+        self.assertTrue(len(list(chunks)) > 0)
+
+    def test_split_number(self):
+        body = '{"calls": [1, 23, 456], "total": 509}'
+        for size in range(1, len(body)):
+            entries, paging = self.parse(body, size)
+            self.assertEquals(entries, [1, 23, 456])
+            self.assertEquals(paging, {"total": 509})
+
+    def test_split_unicode(self):
+        body = json.dumps({"calls": [{"body": u"caf\xe9 \u2603"}]},
+                          ensure_ascii=False).encode("utf-8")
+        for size in range(1, len(body)):
+            entries, paging = self.parse(body, size)
+            self.assertEquals(entries, [{"body": u"caf\xe9 \u2603"}])
+
+    def test_keyword_only_decoder(self):
+        body = '{"page": 0, "calls": [1, {"sid": "CA1"}, "two"]}'
+        for size in range(1, len(body)):
+            parser = PageParser(chunked(body, size), "calls")
+            parser.decoder = KeywordDecoder()
+            self.assertEquals(list(parser), [1, {"sid": "CA1"}, "two"])
+            self.assertEquals(parser.paging, {"page": 0})
+
+    def test_empty(self):
+        entries, paging = self.parse(' { "calls" : [ ] , "page": 0 } ', 3)
+        self.assertEquals(entries, [])
+        self.assertEquals(paging, {"page": 0})
+
+    def test_missing_key(self):
+        self.assertRaises(TwilioException, self.parse, '{"page": 0}', 3)
+
+    def test_truncated(self):
+        self.assertRaises(ValueError, self.parse, self.body[:-10], 100)
+
+    def test_malformed(self):
+        self.assertRaises(ValueError, self.parse, '{"calls": [1 2]}', 100)
+
+
+class StreamingPageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FixtureServer("tests/resources/calls_list.json")
+        self.server.start()
+        self.connection = Connection()
+        self.client = TwilioRestClient("AC123", "token",
+                                       base=self.server.base,
+                                       connection=self.connection)
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.stop()
+
+    def test_list(self):
+        page = self.client.calls.as_streaming().list()
+        self.assertEquals(page.total, 509)
+
+        calls = list(page)
+        self.assertEquals(len(calls), 50)
+        self.assertEquals(calls[0].sid, "CA24388be8ed59a5733d2c1c1c69a83a28")
+        self.assertEquals(page.next_page_uri, "/2010-04-01/Accounts/"
+            "AC4bf2dafbed59a5733d2c1c1c69a83a28/Calls.json?Page=1&PageSize=50")
+
+    def test_connection_reused(self):
+        for i in range(3):
+            list(self.client.calls.as_streaming().list())
+
+        self.assertEquals(self.server.requests, 3)
+        self.assertEquals(len(self.server.clients), 1)
+
+    def test_abandoned_page_closes_connection(self):
+        page = iter(self.client.calls.as_streaming().list())
+        page.next()
+        del page
+
+        pool = self.connection.pools.values()[0]
+        self.assertEquals(pool.idle, [])
+
+    def test_no_prefetch(self):
+        calls = self.client.calls.as_streaming()
+        self.assertRaises(TwilioException, list, calls.iter(prefetch=1))
@@ -0,0 +1,94 @@
+"""
+Hammer a single client from many threads against a local server
+"""
+import sys
+if sys.version_info < (2, 7):
+    import unittest2 as unittest
+else:
+    import unittest
+import threading
+from mock import patch
+from twilio.rest import TwilioRestClient
+from twilio.rest.connection import ThreadSafeConnection
+from tools import FixtureServer
+from tools import create_mock_json
+
+THREADS = 20
+REQUESTS = 25
+MAXSIZE = 5
+
+
+class ThreadSafeConnectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FixtureServer("tests/resources/calls_list.json")
+        self.server.start()
+        self.connection = ThreadSafeConnection(maxsize=MAXSIZE)
+        self.client = TwilioRestClient("AC123", "token",
+                                       base=self.server.base,
+                                       connection=self.connection)
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.stop()
+
+    def test_get_instances_from_many_threads(self):
+        results = []
+        errors = []
+
+        def worker():
+            for i in range(REQUESTS):
+                try:
+                    results.append(len(self.client.calls.get_instances()))
+                except Exception, e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=worker) for i in range(THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEquals(errors, [])
+        self.assertEquals(results, [50] * THREADS * REQUESTS)
+        self.assertEquals(self.server.requests, THREADS * REQUESTS)
+        self.assertTrue(len(self.server.clients) <= MAXSIZE)
+
+        pool = self.connection.pools.values()[0]
+        self.assertEquals(pool.num_connections, len(pool.idle))
+
+
+class CoalescedGetTest(unittest.TestCase):
+
+    @patch("twilio.rest.resources.make_twilio_request")
+    def test_concurrent_get(self, mock):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow(*args, **kwargs):
+            started.set()
+            release.wait(1)
+            return create_mock_json("tests/resources/calls_instance.json")
+
+        mock.side_effect = slow
+        client = TwilioRestClient("AC123", "token",
+                                  connection=ThreadSafeConnection())
+        calls = []
+
+        def get():
+            calls.append(client.calls.get("CA123"))
+
+        threads = [threading.Thread(target=get) for i in range(THREADS)]
+        threads[0].start()
+        started.wait(1)
+        for t in threads[1:]:
+            t.start()
+        threading.Event().wait(0.05)
+        release.set()
+        for t in threads:
+            t.join(1)
+
+        self.assertEquals(mock.call_count, 1)
+        self.assertEquals(len(calls), THREADS)
+        self.assertEquals(len(set([id(c) for c in calls])), THREADS)
+        self.assertEquals(calls[0].from_, calls[-1].from_)
@@ -467,3 +467,313 @@ class TestGather(TwilioTest):
         self.assertRaises(TwimlException, verb.append, twiml.Dial())
         self.assertRaises(TwimlException, verb.append, twiml.Conference(""))
         self.assertRaises(TwimlException, verb.append, twiml.Sms(""))
+
+
+class TestSerialize(TwilioTest):
+
+    def etree_xml(self, verb):
+        return ET.tostring(verb.xml()).encode("utf-8")
+
+    def assertSameXml(self, verb):
+        self.assertEquals(verb.toxml(xml_declaration=False),
+                          self.etree_xml(verb))
+
+    def test_ivr(self):
+        r = Response()
+        r.say("Thanks for calling", voice=twiml.Say.WOMAN, language="en-gb")
+        with r.gather(action="/menu?step=1&lang=en", numDigits=1,
+                      timeout=5) as g:
+            g.say("Press 1 for <sales>, 2 for \"support\"", loop=2)
+            g.play("http://example.com/hold.mp3")
+            g.pause(length=1)
+        d = r.dial(callerId="+14155551234", record=True, hangupOnStar=False)
+        d.number("+14155556789", sendDigits="ww1234")
+        d.conference("Room & Board", beep=False)
+        r.record(maxLength=30, action="/done")
+        r.sms("Line one\nLine two", to="+14155556789", sender="+1415555")
+        r.redirect()
+        r.hangup()
+        self.assertSameXml(r)
+
+    def test_escaped_attributes(self):
+        self.assertSameXml(twiml.Redirect("/next", foo='a "b" & <c>\nd'))
+
+    def test_unicode(self):
+        r = Response()
+        r.say(u"Caf\xe9 ☃ & more")
+        r.play(u"http://example.com/é.mp3")
+        self.assertSameXml(r)
+        self.assertEquals(r.toxml(xml_declaration=False),
+            "<Response><Say>Caf&#233; &#9731; &amp; more</Say>"
+            "<Play>http://example.com/&#233;.mp3</Play></Response>")
+
+    def test_non_string_text(self):
+        self.assertRaises(TypeError, twiml.Say(5).toxml)
+        self.assertRaises(TypeError, ET.tostring, twiml.Say(5).xml())
+
+    def test_declaration(self):
+        r = Response()
+        r.say("Hello")
+        self.assertEquals(r.toxml(), u'<?xml version="1.0" encoding="UTF-8"?>'
+                          + self.etree_xml(r))
+
+
+class TestTemplate(TwilioTest):
+
+    def build(self, greeting, action, digits, number):
+        r = Response()
+        r.say(greeting, voice="woman")
+        with r.gather(action=action, numDigits=digits) as g:
+            g.say("Press 1 to continue")
+        r.dial(number)
+        r.redirect("/start")
+        return r
+
+    def test_render_matches_toxml(self):
+        template = twiml.Template(self.build(
+            twiml.Placeholder("greeting"), twiml.Placeholder("action"),
+            twiml.Placeholder("digits"), twiml.Placeholder("number")))
+
+        values = {
+            "greeting": u"Caf\xe9 <open> & \"ready\"",
+            "action": "/menu?id=42&step=\"2\"\n",
+            "digits": 4,
+            "number": "+14155551234",
+            }
+
+        self.assertEquals(template.names,
+                          ["greeting", "action", "digits", "number"])
+        self.assertEquals(template.render(**values),
+                          self.build(**values).toxml())
+
+    def test_without_declaration(self):
+        r = twiml.Redirect(twiml.Placeholder("url"), method="POST")
+        template = twiml.Template(r, xml_declaration=False)
+        self.assertEquals(template.render(url="/next"),
+                          '<Redirect method="POST">/next</Redirect>')
+
+    def test_boolean_attribute(self):
+        template = twiml.Template(twiml.Dial("+14155551234",
+                                            record=twiml.Placeholder("rec")))
+        self.assertEquals(template.render(rec=True),
+                          twiml.Dial("+14155551234", record=True).toxml())
+
+    def test_missing_value(self):
+        template = twiml.Template(twiml.Say(twiml.Placeholder("text")))
+        self.assertRaises(TwimlException, template.render)
+
+    def test_invalid_name(self):
+        self.assertRaises(TwimlException, twiml.Placeholder, "not valid")
+
+
+class TestFreeze(TwilioTest):
+
+    def hold(self):
+        r = Response()
+        r.say("Please wait", voice="woman")
+        r.play("http://example.com/hold.mp3", loop=0)
+        return r
+
+    def test_same_xml(self):
+        r = self.hold().freeze()
+        self.assertTrue(r.frozen)
+        self.assertEquals(r.toxml(), self.hold().toxml())
+        self.assertEquals(r.toxml(xml_declaration=False),
+                          self.hold().toxml(xml_declaration=False))
+        self.assertTrue(r.toxml() is r.toxml())
+
+    def test_immutable(self):
+        r = self.hold().freeze()
+        self.assertTrue(r.verbs[0].frozen)
+        self.assertRaises(TwimlException, r.say, "More")
+        self.assertRaises(TwimlException, r.verbs[0].attrs.__setitem__,
+                          "voice", "man")
+        self.assertRaises(TwimlException, r.verbs[1].attrs.update, loop=1)
+
+    def test_body_immutable(self):
+        r = self.hold().freeze()
+        say = r.verbs[0]
+        self.assertRaises(TwimlException, setattr, say, "body", "Changed")
+        self.assertRaises(TwimlException, setattr, say, "attrs", {})
+        self.assertRaises(TwimlException, delattr, say, "body")
+        self.assertEquals(say.body, "Please wait")
+        self.assertEquals(r.toxml(), self.hold().toxml())
+
+    def test_frozen_class(self):
+        say = twiml.Say("Please wait").freeze()
+        self.assertTrue(isinstance(say, twiml.Say))
+        self.assertEquals(say.name, "Say")
+
+        thawed = twiml.Say("Please wait")
+        thawed.body = "Changed"
+        self.assertEquals(thawed.toxml(xml_declaration=False),
+                          "<Say>Changed</Say>")
+
+    def test_pickled_frozen_immutable(self):
+        import pickle
+        r = pickle.loads(pickle.dumps(self.hold().freeze(),
+                                      pickle.HIGHEST_PROTOCOL))
+        self.assertRaises(TwimlException, setattr, r.verbs[0], "body", "")
+        self.assertRaises(TwimlException, r.say, "More")
+
+    def test_frozen_child(self):
+        please_wait = twiml.Say("Please wait").freeze()
+        r = Response()
+        r.append(please_wait)
+        r.hangup()
+        self.assertEquals(r.toxml(), '<?xml version="1.0" encoding="UTF-8"?>'
+                          '<Response><Say>Please wait</Say><Hangup />'
+                          '</Response>')
+
+
+class TestTwimlCache(TwilioTest):
+
+    def setUp(self):
+        self.cache = twiml.TwimlCache(max_entries=2)
+
+    def test_hit(self):
+        r = Response()
+        r.say("Hello")
+        xml = self.cache.toxml(r)
+        again = Response()
+        again.say("Hello")
+
+        self.assertEquals(self.cache.toxml(again), xml)
+        self.assertEquals(xml, r.toxml())
+        self.assertEquals((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_changed_verb_missed(self):
+        r = Response()
+        r.say("Hello")
+        self.cache.toxml(r)
+        r.hangup()
+        self.assertEquals(self.cache.toxml(r), r.toxml())
+        self.assertEquals(self.cache.misses, 2)
+
+    def test_types_distinguished(self):
+        self.assertEquals(self.cache.toxml(twiml.Play("a", loop=1)),
+                          twiml.Play("a", loop=1).toxml())
+        self.assertEquals(self.cache.toxml(twiml.Play("a", loop=True)),
+                          twiml.Play("a", loop=True).toxml())
+
+    def test_bounded(self):
+        for text in ["a", "b", "c"]:
+            self.cache.toxml(twiml.Say(text))
+        self.assertEquals(len(self.cache.entries), 2)
+        self.cache.toxml(twiml.Say("a"))
+        self.assertEquals(self.cache.hits, 0)
+
+    def test_unhashable(self):
+        r = twiml.Say("a", foo=["b"])
+        self.assertEquals(self.cache.toxml(r), r.toxml())
+        self.assertEquals(len(self.cache.entries), 0)
+
+
+class TestCompactVerbs(TwilioTest):
+
+    def test_no_instance_dict(self):
+        for verb in [Response(), twiml.Say("Hi"), twiml.Dial("+1415"),
+                     twiml.Gather(), twiml.Record()]:
+            self.assertFalse(hasattr(verb, "__dict__"))
+
+    def test_nestables_are_sets(self):
+        self.assertEquals(twiml.Dial.nestables,
+                          frozenset(["Number", "Conference", "Client"]))
+        self.assertEquals(twiml.Say.nestables, frozenset())
+        self.assertEquals(twiml.Say("Hi").name, "Say")
+
+    def test_invalid_method(self):
+        try:
+            twiml.Redirect("/next", method="PUT")
+        except TwimlException, e:
+            self.assertEquals(str(e), "Invalid method parameter, must be "
+                              "'GET' or 'POST'")
+        else:
+            self.fail("method not checked")
+
+        self.assertRaises(TwimlException, twiml.Conference, "Room",
+                          waitMethod="PUT")
+
+    def test_pickle(self):
+        import pickle
+        r = Response()
+        r.say("Hello", voice="woman")
+        r.dial().number("+14155551234")
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(r, protocol))
+            self.assertEquals(copy.toxml(), r.toxml())
+
+        r.freeze()
+        copy = pickle.loads(pickle.dumps(r, pickle.HIGHEST_PROTOCOL))
+        self.assertTrue(copy.frozen)
+        self.assertEquals(copy.toxml(), r.toxml())
+
+
+class TestParse(TwilioTest):
+
+    def ivr(self):
+        r = Response()
+        r.say(u"Caf\xe9 & <more>", voice="woman", loop=2)
+        with r.gather(action="/menu?a=1&b=2", method="POST", numDigits=1) as g:
+            g.say("Press 1")
+            g.play("http://example.com/hold.mp3")
+            g.pause(length=2)
+        d = r.dial(callerId="+14155551234", record=True)
+        d.number("+14155556789", sendDigits="ww1")
+        d.client("alice")
+        d.conference("Room", beep=False, waitMethod="GET")
+        r.record(maxLength=30)
+        r.sms("Hi\nthere", to="+14155556789", sender="+14155551234")
+        r.redirect()
+        r.hangup()
+        r.reject(reason="busy")
+        return r
+
+    def test_round_trip(self):
+        xml = self.ivr().toxml()
+        r = twiml.parse(xml)
+        self.assertTrue(isinstance(r, Response))
+        self.assertTrue(isinstance(r.verbs[1], twiml.Gather))
+        self.assertTrue(isinstance(r.verbs[2].verbs[0], twiml.Number))
+        self.assertEquals(r.toxml(), xml)
+
+    def test_round_trip_each_test_document(self):
+        for xml in ['<Response />', '<Say />', '<Dial>+1415</Dial>',
+                    '<Response><Dial>+1415<Number>+1</Number></Dial>'
+                    '</Response>']:
+            self.assertEquals(twiml.parse(xml).toxml(False), xml)
+
+    def test_whitespace_between_verbs(self):
+        r = twiml.parse('<?xml version="1.0" encoding="UTF-8"?>\n'
+                        '<Response>\n  <Say> Hello </Say>\n'
+                        '  <Gather numDigits="1">\n    <Pause />\n'
+                        '  </Gather>\n</Response>\n')
+        self.assertEquals(r.toxml(xml_declaration=False),
+                          '<Response><Say> Hello </Say><Gather numDigits="1">'
+                          '<Pause /></Gather></Response>')
+
+    def test_stream(self):
+        from StringIO import StringIO
+        r = twiml.parse(StringIO('<Response><Hangup /></Response>'))
+        self.assertTrue(isinstance(r.verbs[0], twiml.Hangup))
+
+    def test_unicode_string(self):
+        r = twiml.parse(u'<Response><Say>Caf\xe9</Say></Response>')
+        self.assertEquals(r.verbs[0].body, u"Caf\xe9")
+
+    def test_rewrite(self):
+        r = twiml.parse('<Response><Say>Leave a message</Say></Response>')
+        r.record(action="/recorded")
+        self.assertEquals(r.toxml(xml_declaration=False),
+                          '<Response><Say>Leave a message</Say>'
+                          '<Record action="/recorded" /></Response>')
+
+    def test_invalid(self):
+        for xml in ['<Response><Say>Hi</Say>',
+                    '<Response><Dance /></Response>',
+                    '<Response><Number>+1415</Number></Response>',
+                    '<Gather><Dial /></Gather>',
+                    '<Redirect method="PUT">/next</Redirect>',
+                    '<Response><Say>Hi</Say>text</Response>']:
+            self.assertRaises(TwimlException, twiml.parse, xml)
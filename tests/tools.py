@@ -1,4 +1,10 @@
 from __future__ import with_statement
+import BaseHTTPServer
+import SocketServer
+import httplib
+import socket
+import threading
+from StringIO import StringIO
 from mock import Mock
 
 def create_mock_json(path):
@@ -6,3 +12,86 @@ def create_mock_json(path):
         resp = Mock()
         resp.content = f.read()
         return resp
+
+
+class FakeSocket(object):
+
+    def __init__(self, data):
+        self.data = data
+
+    def makefile(self, *args, **kwargs):
+        return StringIO(self.data)
+
+
+def create_http_response(content="", status=200, headers=None):
+    """Return an :class:`httplib.HTTPResponse` read from a canned reply"""
+    headers = dict(headers or {})
+    headers["Content-Length"] = len(content)
+    lines = ["HTTP/1.1 %d Reason" % status]
+    lines.extend(["%s: %s" % item for item in headers.items()])
+    resp = httplib.HTTPResponse(FakeSocket("\r\n".join(lines) +
+                                           "\r\n\r\n" + content))
+    resp.begin()
+    return resp
+
+
+class FixtureHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Answer every GET with the server's fixture, over keep-alive"""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        self.server.record(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    A local stand-in for api.twilio.com that serves a JSON fixture and keeps
+    track of the client sockets it has seen
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path):
+        BaseHTTPServer.HTTPServer.__init__(self, ("127.0.0.1", 0),
+                                           FixtureHandler)
+        with open(path) as f:
+            self.body = f.read()
+        self.clients = set()
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base(self):
+        return "http://127.0.0.1:%d" % self.server_address[1]
+
+    def record(self, client_address):
+        with self.lock:
+            self.clients.add(client_address)
+            self.requests += 1
+
+    def handle_error(self, request, client_address):
+        # Clients closing connections early is expected
+        pass
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.setDaemon(True)
+        thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -1,6 +1,17 @@
 import logging
 import os
 from twilio import TwilioException
+from twilio.rest.cache import MemoryCache
+from twilio.rest.cache import SQLiteCache
+from twilio.rest.cache import TTLRules
+from twilio.rest.connection import Connection
+from twilio.rest.connection import ThreadSafeConnection
+from twilio.rest.futures import Executor
+from twilio.rest.hooks import Hooks
+from twilio.rest.metrics import Metrics
+from twilio.rest.ratelimit import RateLimiter
+from twilio.rest.resources import AsyncResource
+from twilio.rest.retry import RetryPolicy
 from twilio.rest.resources import make_request
 from twilio.rest.resources import Accounts
 from twilio.rest.resources import Applications
@@ -84,9 +95,32 @@ class TwilioRestClient(object):
         return resp.content
 
     def __init__(self, account=None, token=None, base="https://api.twilio.com",
-                 version="2010-04-01", client=None):
+                 version="2010-04-01", client=None, connection=None,
+                 retry=None, rate_limiter=None, cache=None, hooks=None):
         """
         Create a Twilio REST API client.
+
+        :param connection: The :class:`Connection` used for every request made
+                           by this client and its resources. Pass your own to
+                           tune the number of keep-alive connections kept per
+                           host, or to share them between clients. Defaults
+                           to a new :class:`Connection`. A connection you
+                           pass carries its own retry, rate_limiter, cache
+                           and hooks; passing any of those to the client as
+                           well raises a :class:`TwilioException`.
+        :param retry: A :class:`RetryPolicy` for retrying rate limited (429)
+                      and failed (5xx) requests. By default nothing is retried.
+        :param rate_limiter: A :class:`RateLimiter` that delays requests
+                             which would exceed your account or sending
+                             number's throughput. Share one limiter between
+                             clients to limit a whole process.
+        :param cache: A :class:`MemoryCache` or :class:`SQLiteCache` for the
+                      responses to GET requests. By default only resources
+                      that can no longer change, such as completed calls and
+                      recordings, are cached; pass the cache a
+                      :class:`TTLRules` to change this.
+        :param hooks: :class:`Hooks` called before and after every request,
+                      with its method, resource, status, sizes and timings.
         """
 
         # Get account credentials
@@ -113,23 +147,34 @@ values from your Twilio Account at https://www.twilio.com/user/account.
         auth = (account, token)
         version_uri = "%s/%s" % (base, version)
         account_uri = "%s/%s/Accounts/%s" % (base, version, account)
-
-        self.accounts = Accounts(version_uri, auth)
-        self.applications = Applications(account_uri, auth)
-        self.authorized_connect_apps = AuthorizedConnectApps(account_uri, auth)
-        self.calls = Calls(account_uri, auth)
-        self.caller_ids = CallerIds(account_uri, auth)
-        self.connect_apps = ConnectApps(account_uri, auth)
-        self.notifications = Notifications(account_uri, auth)
-        self.recordings = Recordings(account_uri, auth)
-        self.transcriptions = Transcriptions(account_uri, auth)
-        self.sms = Sms(account_uri, auth)
-        self.phone_numbers = PhoneNumbers(account_uri, auth)
-        self.conferences = Conferences(account_uri, auth)
-        self.sandboxes = Sandboxes(account_uri, auth)
+        conn = connection
+        if conn is None:
+            conn = Connection(retry=retry, rate_limiter=rate_limiter,
+                              cache=cache, hooks=hooks)
+        elif (retry is not None or rate_limiter is not None
+              or cache is not None or hooks is not None):
+            # Setting them here would change every client sharing conn
+            raise TwilioException("Pass retry, rate_limiter, cache and hooks "
+                                  "to the Connection, not the client")
+
+        self.accounts = Accounts(version_uri, auth, conn)
+        self.applications = Applications(account_uri, auth, conn)
+        self.authorized_connect_apps = AuthorizedConnectApps(account_uri, auth,
+                                                             conn)
+        self.calls = Calls(account_uri, auth, conn)
+        self.caller_ids = CallerIds(account_uri, auth, conn)
+        self.connect_apps = ConnectApps(account_uri, auth, conn)
+        self.notifications = Notifications(account_uri, auth, conn)
+        self.recordings = Recordings(account_uri, auth, conn)
+        self.transcriptions = Transcriptions(account_uri, auth, conn)
+        self.sms = Sms(account_uri, auth, conn)
+        self.phone_numbers = PhoneNumbers(account_uri, auth, conn)
+        self.conferences = Conferences(account_uri, auth, conn)
+        self.sandboxes = Sandboxes(account_uri, auth, conn)
 
         self.auth = auth
         self.account_uri = account_uri
+        self.connection = conn
 
     def participants(self, conference_sid):
         """
@@ -137,5 +182,72 @@ values from your Twilio Account at https://www.twilio.com/user/account.
         with the given conference_sid
         """
         base_uri = "%s/Conferences/%s" % (self.account_uri, conference_sid)
-        return Participants(base_uri, self.auth)
+        return Participants(base_uri, self.auth, self.connection)
+
+
+
+class AsyncTwilioRestClient(TwilioRestClient):
+    """
+    A client for accessing the Twilio REST API without blocking.
+
+    Every resource method returns a :class:`twilio.rest.futures.Future`, and
+    up to max_workers requests run at once over a shared
+    :class:`ThreadSafeConnection`::
+
+        futures = [client.sms.messages.create(to=n, from_=sender, body=msg)
+                   for n in numbers]
+        messages = [f.result() for f in futures]
+
+    Parameters are mapped exactly as they are by :class:`TwilioRestClient`.
 
+    :param int max_workers: The number of requests that may be in flight
+    """
+
+    async_resources = [
+        "accounts",
+        "applications",
+        "authorized_connect_apps",
+        "calls",
+        "caller_ids",
+        "connect_apps",
+        "notifications",
+        "recordings",
+        "transcriptions",
+        "sms",
+        "phone_numbers",
+        "conferences",
+        "sandboxes",
+        ]
+
+    def __init__(self, *args, **kwargs):
+        max_workers = kwargs.pop("max_workers", 10)
+        if kwargs.get("connection") is None:
+            settings = {}
+            for name in ["retry", "rate_limiter", "cache", "hooks"]:
+                settings[name] = kwargs.pop(name, None)
+            kwargs["connection"] = ThreadSafeConnection(maxsize=max_workers,
+                                                        **settings)
+        super(AsyncTwilioRestClient, self).__init__(*args, **kwargs)
+
+        self.executor = Executor(max_workers)
+
+        for name in self.async_resources:
+            resource = AsyncResource(getattr(self, name), self.executor)
+            setattr(self, name, resource)
+
+    def participants(self, conference_sid):
+        """
+        Return an asynchronous :class:`Participants` instance for the
+        :class:`Conference` with the given conference_sid
+        """
+        resource = super(AsyncTwilioRestClient, self).participants(
+            conference_sid)
+        return AsyncResource(resource, self.executor)
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker threads once in-flight requests finish, and close
+        idle connections
+        """
+        self.executor.shutdown(wait)
+        self.connection.close()
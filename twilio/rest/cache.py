@@ -0,0 +1,306 @@
+"""
+Cache responses from Twilio, so that resources which can no longer change,
+such as completed calls and recordings, are only requested once
+"""
+import re
+import threading
+import time
+from twilio import TwilioException
+from urlparse import urlparse
+
+# Only SQLiteCache needs sqlite3, which some Python builds leave out
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+# import json
+try:
+    import json
+except ImportError:
+    try:
+        import simplejson as json
+    except ImportError:
+        from django.utils import simplejson as json
+
+DAY = 24 * 60 * 60
+
+
+def if_status(statuses, ttl):
+    """
+    Return a TTL rule that caches a resource for ttl seconds once its status
+    is one of statuses, and never before
+    """
+    statuses = frozenset(statuses)
+
+    def rule(data):
+        if data.get("status") in statuses:
+            return ttl
+        return 0
+    return rule
+
+
+class TTLRules(object):
+    """
+    Decide how long a response may be cached from the resource it is for.
+
+    Each rule is a ``(pattern, ttl)`` tuple. pattern is a regular expression
+    searched for in the path of the request. ttl is a number of seconds, or
+    a function that is passed the decoded response and returns one. The
+    first matching rule is used. A ttl of 0 means never cache.
+
+    The default rules only cache resources that can no longer change:
+    recordings, and calls, messages and transcriptions that have finished.
+
+    :param rules: A list of ``(pattern, ttl)`` tuples
+    :param int default: The ttl for responses no rule matches
+    """
+
+    default_rules = [
+        (r"/Recordings/RE\w+\.json$", DAY),
+        (r"/Transcriptions/TR\w+\.json$",
+         if_status(["completed", "failed"], DAY)),
+        (r"/Calls/CA\w+\.json$",
+         if_status(["completed", "busy", "failed", "no-answer", "canceled"],
+                   DAY)),
+        (r"/SMS/Messages/SM\w+\.json$",
+         if_status(["sent", "failed", "received"], DAY)),
+        ]
+
+    def __init__(self, rules=None, default=0):
+        if rules is None:
+            rules = self.default_rules
+        self.rules = [(re.compile(pattern), ttl) for pattern, ttl in rules]
+        self.default = default
+
+    def ttl(self, url, content):
+        """Return the seconds the response content for url may be cached"""
+        path = urlparse(url).path
+
+        for pattern, ttl in self.rules:
+            if not pattern.search(path):
+                continue
+
+            if callable(ttl):
+                try:
+                    return ttl(json.loads(content))
+                except (ValueError, AttributeError):
+                    return 0
+            return ttl
+
+        return self.default
+
+
+class Cache(object):
+    """
+    The base class for response caches. Subclasses store entries by
+    implementing get, set, delete and clear.
+
+    ``hits`` and ``misses`` count lookups across all threads.
+
+    :param rules: A :class:`TTLRules` deciding what is cached, and for how
+                  long
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules or TTLRules()
+        self.hits = 0
+        self.misses = 0
+        self.stats_lock = threading.Lock()
+
+    def key(self, account_sid, url):
+        return "%s %s" % (account_sid, url)
+
+    def lookup(self, account_sid, url):
+        """
+        Return the cached ``(headers, content)`` for a GET of url, or None
+        """
+        entry = self.get(self.key(account_sid, url))
+
+        self.stats_lock.acquire()
+        try:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        finally:
+            self.stats_lock.release()
+
+        return entry
+
+    def store(self, account_sid, url, headers, content):
+        """Cache the response to a GET of url, if the rules allow it"""
+        ttl = self.rules.ttl(url, content)
+        if ttl > 0:
+            self.set(self.key(account_sid, url), (headers, content), ttl)
+
+    def invalidate(self, account_sid, url):
+        """Forget the response for url, after it has been changed"""
+        self.delete(self.key(account_sid, url))
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, entry, ttl):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(Cache):
+    """
+    A least recently used cache held in this process's memory, and shared by
+    all of its threads.
+
+    :param int max_entries: The most responses to keep
+    :param int max_bytes: The most response content, in bytes, to keep
+    """
+
+    # The fields of each entry in the recently used list
+    PREV, NEXT, KEY, VALUE, EXPIRES, SIZE = range(6)
+
+    def __init__(self, max_entries=1000, max_bytes=10 * 1024 * 1024,
+                 rules=None):
+        super(MemoryCache, self).__init__(rules)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.clear()
+
+    def get(self, key):
+        self.lock.acquire()
+        try:
+            link = self.entries.get(key)
+            if link is None:
+                return None
+
+            if link[self.EXPIRES] < time.time():
+                self.unlink(link)
+                return None
+
+            # Move the entry to the most recently used end
+            self.unlink(link)
+            self.append(link)
+            return link[self.VALUE]
+        finally:
+            self.lock.release()
+
+    def set(self, key, entry, ttl):
+        headers, content = entry
+        size = len(content)
+        if size > self.max_bytes:
+            return
+
+        self.lock.acquire()
+        try:
+            if key in self.entries:
+                self.unlink(self.entries[key])
+
+            self.append([None, None, key, entry, time.time() + ttl, size])
+
+            while self.entries and (len(self.entries) > self.max_entries
+                                    or self.size > self.max_bytes):
+                self.unlink(self.root[self.NEXT])
+        finally:
+            self.lock.release()
+
+    def delete(self, key):
+        self.lock.acquire()
+        try:
+            if key in self.entries:
+                self.unlink(self.entries[key])
+        finally:
+            self.lock.release()
+
+    def clear(self):
+        self.lock.acquire()
+        try:
+            self.entries = {}
+            self.size = 0
+            # The recently used list is circular, with root at both ends
+            self.root = [None, None, None, None, None, 0]
+            self.root[self.PREV] = self.root[self.NEXT] = self.root
+        finally:
+            self.lock.release()
+
+    def append(self, link):
+        last = self.root[self.PREV]
+        link[self.PREV] = last
+        link[self.NEXT] = self.root
+        last[self.NEXT] = self.root[self.PREV] = link
+        self.entries[link[self.KEY]] = link
+        self.size += link[self.SIZE]
+
+    def unlink(self, link):
+        link[self.PREV][self.NEXT] = link[self.NEXT]
+        link[self.NEXT][self.PREV] = link[self.PREV]
+        del self.entries[link[self.KEY]]
+        self.size -= link[self.SIZE]
+
+
+class SQLiteCache(Cache):
+    """
+    A cache stored in a SQLite database, which can be shared by any number of
+    processes on one machine. Expired entries are removed when they are next
+    looked up, or by :meth:`purge`.
+
+    :param string path: The database file, created if it does not exist
+    :param float timeout: Seconds to wait for another process to unlock the
+                          database
+    """
+
+    def __init__(self, path, timeout=5, rules=None):
+        if sqlite3 is None:
+            raise TwilioException("SQLiteCache requires the sqlite3 module, "
+                                  "which this Python was built without")
+        super(SQLiteCache, self).__init__(rules)
+        self.path = path
+        self.timeout = timeout
+        self.local = threading.local()
+        self.db().execute("CREATE TABLE IF NOT EXISTS responses ("
+                          "key TEXT PRIMARY KEY, headers TEXT, "
+                          "content BLOB, expires REAL)")
+
+    def db(self):
+        """Return this thread's connection to the database"""
+        db = getattr(self.local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=self.timeout,
+                                 isolation_level=None)
+            self.local.db = db
+        return db
+
+    def get(self, key):
+        row = self.db().execute("SELECT headers, content, expires "
+                                "FROM responses WHERE key = ?",
+                                (key,)).fetchone()
+        if row is None:
+            return None
+
+        headers, content, expires = row
+        if expires < time.time():
+            self.delete(key)
+            return None
+
+        return json.loads(headers), str(content)
+
+    def set(self, key, entry, ttl):
+        headers, content = entry
+        self.db().execute("INSERT OR REPLACE INTO responses "
+                          "VALUES (?, ?, ?, ?)", (key, json.dumps(headers),
+                          sqlite3.Binary(content), time.time() + ttl))
+
+    def delete(self, key):
+        self.db().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        self.db().execute("DELETE FROM responses")
+
+    def purge(self):
+        """Remove every expired entry"""
+        self.db().execute("DELETE FROM responses WHERE expires < ?",
+                          (time.time(),))
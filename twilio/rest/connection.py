@@ -0,0 +1,532 @@
+"""
+Persistent HTTP connections shared by a :class:`TwilioRestClient` and every
+resource it creates.
+"""
+import base64
+import httplib
+import select
+import socket
+import threading
+import time
+from twilio import TwilioException
+from twilio.rest.futures import SingleFlight
+from urlparse import urlparse
+
+# import httplib2
+try:
+    import httplib2
+except ImportError:
+    from twilio.contrib import httplib2
+
+
+def is_stale(conn):
+    """
+    Return True if an idle connection can no longer be used.
+
+    An idle keep-alive socket should never be readable. If it is, the server
+    has either closed its end or sent something we never asked for.
+    """
+    if conn.sock is None:
+        return False
+
+    try:
+        fd = conn.sock.fileno()
+    except socket.error:
+        return True
+
+    # select() can't watch descriptors of FD_SETSIZE (usually 1024) or more,
+    # which busy processes easily reach, so prefer poll() where it exists.
+    # If the check itself fails, assume the connection is still good.
+    try:
+        if hasattr(select, "poll"):
+            poller = select.poll()
+            poller.register(fd, select.POLLIN)
+            return bool(poller.poll(0))
+
+        readable, _, _ = select.select([fd], [], [], 0)
+        return bool(readable)
+    except (select.error, ValueError):
+        return False
+
+
+class ConnectionPool(object):
+    """
+    A pool of keep-alive connections to a single host. Threads may share a
+    pool, but it does not limit how many connections they open at once.
+
+    :param string scheme: Either "http" or "https"
+    :param string host: The host (and optional port) to connect to
+    :param int maxsize: The most idle connections to keep open to this host
+    :param int idle_timeout: Close connections that have been idle for longer
+                             than this many seconds
+    """
+
+    connection_types = {
+        "http": httplib2.HTTPConnectionWithTimeout,
+        "https": httplib2.HTTPSConnectionWithTimeout,
+        }
+
+    def __init__(self, scheme, host, maxsize=10, idle_timeout=60):
+        self.scheme = scheme
+        self.host = host
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.idle = []
+        self.lock = threading.Lock()
+
+    def new_connection(self, timeout=None):
+        """Return a new, unconnected connection to this pool's host"""
+        return self.connection_types[self.scheme](self.host, timeout=timeout)
+
+    def get(self, timeout=None):
+        """
+        Check out a connection, reusing a warm idle one when possible.
+        Expired and stale idle connections are closed along the way.
+        """
+        now = time.time()
+
+        self.lock.acquire()
+        try:
+            while self.idle:
+                conn, last_used = self.idle.pop()
+
+                if now - last_used > self.idle_timeout or is_stale(conn):
+                    self.discard(conn)
+                    continue
+
+                conn.timeout = timeout
+                conn.sock.settimeout(timeout)
+                return conn
+
+            return self.new_connection(timeout=timeout)
+        finally:
+            self.lock.release()
+
+    def put(self, conn):
+        """
+        Return a connection to the pool. Connections that were closed by the
+        server, or that would grow the pool past maxsize, are discarded.
+        """
+        self.lock.acquire()
+        try:
+            if conn.sock is None or len(self.idle) >= self.maxsize:
+                self.discard(conn)
+            else:
+                self.idle.append((conn, time.time()))
+        finally:
+            self.lock.release()
+
+    def discard(self, conn):
+        """Close a connection that will not be reused"""
+        conn.close()
+
+    def evict(self):
+        """Close every idle connection that has outlived idle_timeout"""
+        now = time.time()
+        fresh = []
+
+        self.lock.acquire()
+        try:
+            for conn, last_used in self.idle:
+                if now - last_used > self.idle_timeout:
+                    self.discard(conn)
+                else:
+                    fresh.append((conn, last_used))
+
+            self.idle = fresh
+        finally:
+            self.lock.release()
+
+    def close(self):
+        """Close all idle connections"""
+        self.lock.acquire()
+        try:
+            for conn, last_used in self.idle:
+                self.discard(conn)
+            self.idle = []
+        finally:
+            self.lock.release()
+
+
+class BlockingConnectionPool(ConnectionPool):
+    """
+    A thread-safe pool that never has more than maxsize connections open to
+    its host. Threads that find every connection checked out wait for one to
+    be returned.
+
+    :param pool_timeout: Seconds to wait for a free connection before raising
+                         a :class:`TwilioException`. None waits forever.
+    """
+
+    def __init__(self, scheme, host, maxsize=10, idle_timeout=60,
+                 pool_timeout=None):
+        super(BlockingConnectionPool, self).__init__(scheme, host,
+            maxsize=maxsize, idle_timeout=idle_timeout)
+        self.pool_timeout = pool_timeout
+        self.num_connections = 0
+        # Reentrant, as the ConnectionPool methods called with it held take
+        # it again
+        self.lock = threading.Condition()
+
+    def get(self, timeout=None):
+        self.lock.acquire()
+        try:
+            if self.pool_timeout is not None:
+                deadline = time.time() + self.pool_timeout
+
+            while not self.idle and self.num_connections >= self.maxsize:
+                if self.pool_timeout is None:
+                    self.lock.wait()
+                    continue
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TwilioException("No free connection to %s after "
+                        "%s seconds" % (self.host, self.pool_timeout))
+                self.lock.wait(remaining)
+
+            return super(BlockingConnectionPool, self).get(timeout=timeout)
+        finally:
+            self.lock.release()
+
+    def new_connection(self, timeout=None):
+        self.num_connections += 1
+        return super(BlockingConnectionPool, self).new_connection(timeout)
+
+    def put(self, conn):
+        self.lock.acquire()
+        try:
+            # Every connection counts against maxsize, so none are dropped
+            # for lack of room
+            if conn.sock is None:
+                self.discard(conn)
+            else:
+                self.idle.append((conn, time.time()))
+            self.lock.notify()
+        finally:
+            self.lock.release()
+
+    def discard(self, conn):
+        conn.close()
+        self.num_connections -= 1
+
+    def resize(self, maxsize):
+        """Change the most connections open at once, waking any waiters"""
+        self.lock.acquire()
+        try:
+            self.maxsize = maxsize
+            self.lock.notifyAll()
+        finally:
+            self.lock.release()
+
+    def evict(self):
+        self.lock.acquire()
+        try:
+            super(BlockingConnectionPool, self).evict()
+            self.lock.notifyAll()
+        finally:
+            self.lock.release()
+
+    def close(self):
+        self.lock.acquire()
+        try:
+            super(BlockingConnectionPool, self).close()
+            self.lock.notifyAll()
+        finally:
+            self.lock.release()
+
+
+class StreamingBody(object):
+    """
+    The body of a response from :meth:`Connection.stream`, read from the
+    socket chunk_size bytes at a time as it is iterated over.
+
+    Once the whole body has been read the connection is returned to its pool.
+    A body that is closed, or dropped, before then closes its connection.
+    """
+
+    def __init__(self, pool, conn, resp, chunk_size=8192):
+        self.pool = pool
+        self.conn = conn
+        self.resp = resp
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        while self.conn is not None:
+            try:
+                chunk = self.resp.read(self.chunk_size)
+            except:
+                self.close()
+                raise
+
+            if not chunk:
+                self.pool.put(self.conn)
+                self.conn = None
+                return
+
+            yield chunk
+
+    def close(self):
+        """Stop reading the body and close its connection"""
+        if self.conn is not None:
+            self.conn.close()
+            self.pool.put(self.conn)
+            self.conn = None
+
+    def __del__(self):
+        self.close()
+
+
+class Connection(object):
+    """
+    An HTTP transport that keeps connections to each host alive between
+    requests, so steady-state traffic skips the TCP and TLS handshakes.
+
+    One :class:`Connection` is owned by each :class:`TwilioRestClient` and
+    shared by all of its list and instance resources, and by any threads
+    using the client. Use a :class:`ThreadSafeConnection` to also limit the
+    connections those threads open to each host. Because credentials are
+    sent with every request, reused connections also avoid httplib2's extra
+    round trip to discover that the API wants Basic authentication.
+
+    Redirects are never followed.
+
+    :param int maxsize: Maximum number of idle connections kept per host
+    :param int idle_timeout: Seconds after which idle connections are closed
+    :param retry: A :class:`twilio.rest.retry.RetryPolicy` applied to every
+                  Twilio request made over this connection
+    :param rate_limiter: A :class:`twilio.rest.ratelimit.RateLimiter` that
+                         every Twilio request made over this connection must
+                         pass through
+    :param cache: A :class:`twilio.rest.cache.Cache` for the responses to
+                  Twilio GET requests made over this connection
+    :param hooks: :class:`twilio.rest.hooks.Hooks` run before and after
+                  every Twilio request made over this connection
+    """
+
+    pool_class = ConnectionPool
+    thread_safe = False
+
+    def __init__(self, maxsize=10, idle_timeout=60, retry=None,
+                 rate_limiter=None, cache=None, hooks=None):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.hooks = hooks
+        self.pools = {}
+        self.lock = threading.Lock()
+        # Identical GET requests in progress, shared by every thread
+        self.in_flight = SingleFlight()
+        # The ThreadSafeConnection returned by for_threads
+        self.threaded = None
+
+    def get_pool(self, scheme, host):
+        key = (scheme, host)
+
+        self.lock.acquire()
+        try:
+            if key not in self.pools:
+                self.pools[key] = self.new_pool(scheme, host)
+            return self.pools[key]
+        finally:
+            self.lock.release()
+
+    def new_pool(self, scheme, host):
+        """Return a new pool of connections to host"""
+        return self.pool_class(scheme, host, maxsize=self.maxsize,
+                               idle_timeout=self.idle_timeout)
+
+    def request(self, uri, method="GET", body=None, headers=None, auth=None,
+                timeout=None):
+        """
+        Send an HTTP request over a pooled connection
+
+        :returns: a tuple of (:class:`httplib2.Response`, content)
+        """
+        pool, conn, path, headers = self.checkout(uri, headers, auth, timeout)
+        timing = {}
+
+        try:
+            resp = self.open(conn, method, path, body, headers, timing)
+            start = time.time()
+            content = resp.read()
+            timing["download"] = time.time() - start
+        except:
+            conn.close()
+            pool.put(conn)
+            raise
+
+        pool.put(conn)
+        return self.response(resp, body, timing), content
+
+    def stream(self, uri, method="GET", body=None, headers=None, auth=None,
+               timeout=None, chunk_size=8192):
+        """
+        Send an HTTP request over a pooled connection, without waiting for
+        the response body
+
+        :returns: a tuple of (:class:`httplib2.Response`,
+                  :class:`StreamingBody`)
+        """
+        pool, conn, path, headers = self.checkout(uri, headers, auth, timeout)
+        timing = {}
+
+        try:
+            resp = self.open(conn, method, path, body, headers, timing)
+        except:
+            conn.close()
+            pool.put(conn)
+            raise
+
+        return (self.response(resp, body, timing),
+                StreamingBody(pool, conn, resp, chunk_size))
+
+    def checkout(self, uri, headers, auth, timeout):
+        """
+        Get a connection to uri's host from its pool
+
+        :returns: a tuple of (pool, connection, path, headers)
+        """
+        parts = urlparse(uri)
+        path = parts.path or "/"
+        if parts.query:
+            path = "%s?%s" % (path, parts.query)
+
+        headers = dict(headers or {})
+        if auth is not None:
+            credentials = base64.b64encode("%s:%s" % auth)
+            headers["Authorization"] = "Basic %s" % credentials
+
+        pool = self.get_pool(parts.scheme, parts.netloc)
+        return pool, pool.get(timeout=timeout), path, headers
+
+    def open(self, conn, method, path, body, headers, timing=None):
+        """
+        Send a request and read the response status and headers. The seconds
+        spent connecting, if the connection was not already open, and waiting
+        for the first byte of the response are stored in timing.
+
+        :returns: the :class:`httplib.HTTPResponse`, with its body unread
+        """
+        if timing is None:
+            timing = {}
+        reused = conn.sock is not None
+
+        try:
+            return self.send(conn, method, path, body, headers, timing)
+        except (socket.error, httplib.HTTPException):
+            # The server may have closed a reused connection just as we
+            # picked it up. Retry exactly once on a fresh socket.
+            conn.close()
+            if not reused:
+                raise
+            return self.send(conn, method, path, body, headers, timing)
+
+    def send(self, conn, method, path, body, headers, timing):
+        if conn.sock is None:
+            # httplib would connect in request(); do it here to time it. For
+            # HTTPS this includes the TLS handshake, which httplib2 performs
+            # inside connect().
+            start = time.time()
+            conn.connect()
+            timing["connect"] = time.time() - start
+
+        start = time.time()
+        conn.request(method, path, body, headers)
+        resp = conn.getresponse()
+        timing["ttfb"] = time.time() - start
+        return resp
+
+    def response(self, resp, body, timing):
+        """
+        Wrap an httplib response, adding how it was received: ``timing``,
+        ``reused`` and ``bytes_sent``
+        """
+        response = httplib2.Response(resp)
+        response.timing = timing
+        response.reused = "connect" not in timing
+        response.bytes_sent = len(body or "")
+        return response
+
+    def for_threads(self, maxsize):
+        """
+        Return a :class:`ThreadSafeConnection` with the same settings that
+        maxsize threads can share. The same connection is returned each
+        time, so its sockets stay warm from one batch of threads to the
+        next; it grows to the largest maxsize asked for, and is closed along
+        with this one. Thread-safe connections return themselves.
+        """
+        self.lock.acquire()
+        try:
+            if self.threaded is None:
+                self.threaded = ThreadSafeConnection(maxsize=maxsize,
+                    idle_timeout=self.idle_timeout)
+                self.threaded.in_flight = self.in_flight
+            elif self.threaded.maxsize < maxsize:
+                self.threaded.grow(maxsize)
+
+            connection = self.threaded
+            connection.retry = self.retry
+            connection.rate_limiter = self.rate_limiter
+            connection.cache = self.cache
+            connection.hooks = self.hooks
+            return connection
+        finally:
+            self.lock.release()
+
+    def evict(self):
+        """Close idle connections that have outlived idle_timeout"""
+        for pool in self.pools.values():
+            pool.evict()
+        if self.threaded is not None:
+            self.threaded.evict()
+
+    def close(self):
+        """Close all idle connections"""
+        for pool in self.pools.values():
+            pool.close()
+        if self.threaded is not None:
+            self.threaded.close()
+
+
+class ThreadSafeConnection(Connection):
+    """
+    A :class:`Connection` that can be shared by many threads at once.
+
+    Each host gets a :class:`BlockingConnectionPool`, so requests from
+    different threads never share a socket and at most maxsize connections
+    are open to a host at any time.
+
+    :param pool_timeout: Seconds a thread waits for a free connection before
+                         giving up. None waits forever.
+    """
+
+    pool_class = BlockingConnectionPool
+    thread_safe = True
+
+    def __init__(self, maxsize=10, idle_timeout=60, retry=None,
+                 rate_limiter=None, cache=None, hooks=None, pool_timeout=None):
+        super(ThreadSafeConnection, self).__init__(maxsize=maxsize,
+            idle_timeout=idle_timeout, retry=retry, rate_limiter=rate_limiter,
+            cache=cache, hooks=hooks)
+        self.pool_timeout = pool_timeout
+
+    def for_threads(self, maxsize):
+        return self
+
+    def grow(self, maxsize):
+        """Allow up to maxsize connections to each host"""
+        self.lock.acquire()
+        try:
+            self.maxsize = maxsize
+            for pool in self.pools.values():
+                pool.resize(maxsize)
+        finally:
+            self.lock.release()
+
+    def new_pool(self, scheme, host):
+        return self.pool_class(scheme, host, maxsize=self.maxsize,
+                               idle_timeout=self.idle_timeout,
+                               pool_timeout=self.pool_timeout)
@@ -0,0 +1,346 @@
+"""
+A minimal thread pool and Future, modelled on :mod:`concurrent.futures`, for
+issuing many Twilio requests at once.
+"""
+import Queue
+import sys
+import threading
+import time
+from collections import deque
+
+
+class Future(object):
+    """The pending result of a call running on an :class:`Executor`"""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._exc_info = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def done(self):
+        return self._done.isSet()
+
+    def result(self, timeout=None):
+        """
+        Wait for the call to finish and return its result, re-raising any
+        exception the call raised.
+        """
+        self._wait(timeout)
+        if self._exc_info is not None:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+        return self._result
+
+    def exception(self, timeout=None):
+        """Wait for the call to finish and return its exception, if any"""
+        self._wait(timeout)
+        if self._exc_info is not None:
+            return self._exc_info[1]
+        return None
+
+    def add_done_callback(self, fn):
+        """
+        Call fn(future) once this future is done. If it is already done, fn
+        is called immediately.
+        """
+        self._lock.acquire()
+        try:
+            if not self.done():
+                self._callbacks.append(fn)
+                return
+        finally:
+            self._lock.release()
+        fn(self)
+
+    def set_result(self, result):
+        self._result = result
+        self._finish()
+
+    def set_exception(self, exc_info):
+        self._exc_info = exc_info
+        self._finish()
+
+    def _wait(self, timeout):
+        self._done.wait(timeout)
+        if not self.done():
+            raise RuntimeError("Timed out waiting for result")
+
+    def _finish(self):
+        self._lock.acquire()
+        try:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        finally:
+            self._lock.release()
+
+        for fn in callbacks:
+            fn(self)
+
+
+class Executor(object):
+    """
+    Run callables on a fixed number of worker threads
+
+    :param int max_workers: The number of worker threads
+    """
+
+    def __init__(self, max_workers=10):
+        self.max_workers = max_workers
+        self.work = Queue.Queue()
+        self.threads = []
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedule fn(*args, **kwargs) to run on a worker thread
+
+        :returns: a :class:`Future` for the call's result
+        """
+        future = Future()
+        self.work.put((future, fn, args, kwargs))
+        self._start_workers()
+        return future
+
+    def map(self, fn, *iterables):
+        """
+        Like :func:`map`, but the calls run concurrently. Results are returned
+        in input order.
+        """
+        futures = [self.submit(fn, *args) for args in zip(*iterables)]
+        return [f.result() for f in futures]
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads once the queued work is finished"""
+        self.lock.acquire()
+        try:
+            for t in self.threads:
+                self.work.put(None)
+            threads, self.threads = self.threads, []
+        finally:
+            self.lock.release()
+
+        if wait:
+            for t in threads:
+                t.join()
+
+    def _start_workers(self):
+        self.lock.acquire()
+        try:
+            if len(self.threads) >= self.max_workers:
+                return
+            t = threading.Thread(target=self._worker)
+            t.setDaemon(True)
+            t.start()
+            self.threads.append(t)
+        finally:
+            self.lock.release()
+
+    def _worker(self):
+        while True:
+            item = self.work.get()
+            if item is None:
+                return
+
+            future, fn, args, kwargs = item
+            try:
+                result = fn(*args, **kwargs)
+            except:
+                future.set_exception(sys.exc_info())
+            else:
+                future.set_result(result)
+
+
+def as_completed(futures):
+    """Yield each future in futures as soon as it is done"""
+    futures = list(futures)
+    finished = Queue.Queue()
+
+    for future in futures:
+        future.add_done_callback(finished.put)
+
+    for i in range(len(futures)):
+        yield finished.get()
+
+
+class SingleFlight(object):
+    """
+    Share one call between threads asking for the same thing at once. While
+    a call for a key is running, further calls with that key wait for it and
+    receive its result, or exception, instead of running again.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        """Return fn(*args, **kwargs), or the result of the call for key
+        already in flight"""
+        self.lock.acquire()
+        try:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+        finally:
+            self.lock.release()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except:
+            exc_info = sys.exc_info()
+            self.forget(key)
+            future.set_exception(exc_info)
+            raise exc_info[0], exc_info[1], exc_info[2]
+
+        self.forget(key)
+        future.set_result(result)
+        return result
+
+    def forget(self, key):
+        self.lock.acquire()
+        try:
+            del self.calls[key]
+        finally:
+            self.lock.release()
+
+
+def prefetch(iterable, depth=1):
+    """
+    Iterate over iterable on a background thread that runs up to depth items
+    ahead of the consumer, so producing the next item overlaps with
+    consuming the current one. Exceptions raised by iterable are re-raised
+    to the consumer.
+    """
+    ready = Queue.Queue(depth)
+    stop = threading.Event()
+    finished = object()
+
+    def offer(item):
+        while not stop.isSet():
+            try:
+                ready.put(item, True, 0.1)
+                return True
+            except Queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not offer((item, None)):
+                    return
+        except:
+            offer((finished, sys.exc_info()))
+        else:
+            offer((finished, None))
+
+    producer = threading.Thread(target=produce)
+    producer.setDaemon(True)
+    producer.start()
+
+    try:
+        while True:
+            item, exc_info = ready.get()
+            if item is finished:
+                if exc_info is not None:
+                    raise exc_info[0], exc_info[1], exc_info[2]
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+class Batch(object):
+    """
+    Call fn once for each item in items, with up to concurrency calls running
+    at a time. Items are read lazily, so items may be a generator of any
+    length.
+
+    Iterating over a batch runs it and yields an ``(item, result, exception)``
+    tuple per item, as soon as each call finishes or, if ordered is True, in
+    the order of items. An exception raised by one call is reported in its
+    tuple and added to ``errors``; the rest of the batch carries on.
+
+    While and after running, ``succeeded``, ``failed``, ``elapsed`` and
+    ``throughput`` (calls completed per second) describe the batch's progress.
+    """
+
+    def __init__(self, fn, items, concurrency=10, ordered=False):
+        self.fn = fn
+        self.items = items
+        self.concurrency = concurrency
+        self.ordered = ordered
+        self.errors = []
+        self.succeeded = 0
+        self.failed = 0
+        self.started = None
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def throughput(self):
+        elapsed = self.elapsed
+        if not elapsed:
+            return 0.0
+        return (self.succeeded + self.failed) / elapsed
+
+    def wait(self):
+        """Run the whole batch, discarding results, and return it"""
+        for outcome in self:
+            pass
+        return self
+
+    def __iter__(self):
+        executor = Executor(self.concurrency)
+        items = iter(self.items)
+        in_flight = deque()
+        finished = Queue.Queue()
+        self.started = time.time()
+
+        def submit():
+            for item in items:
+                future = executor.submit(self.fn, item)
+                future.item = item
+                if not self.ordered:
+                    future.add_done_callback(finished.put)
+                in_flight.append(future)
+                return True
+            return False
+
+        try:
+            while len(in_flight) < self.concurrency and submit():
+                pass
+
+            while in_flight:
+                if self.ordered:
+                    future = in_flight.popleft()
+                    future.exception()
+                else:
+                    future = finished.get()
+                    in_flight.remove(future)
+
+                submit()
+                yield self.record(future)
+        finally:
+            self.finished = time.time()
+            executor.shutdown(wait=False)
+
+    def record(self, future):
+        error = future.exception()
+        if error is None:
+            self.succeeded += 1
+            return future.item, future.result(), None
+
+        self.failed += 1
+        self.errors.append((future.item, error))
+        return future.item, None, error
@@ -0,0 +1,140 @@
+"""
+Callbacks run before and after every request a client makes to Twilio, for
+feeding logs and metrics without wrapping each call site
+"""
+import logging
+import re
+from urlparse import urlparse
+
+SID = re.compile(r"^[A-Z]{2}[0-9a-fA-F]+$")
+
+# The parts of every Response.timing, in seconds. A part that did not happen,
+# such as connecting on a reused connection, is None.
+TIMING_KEYS = ("connect", "tls", "ttfb", "download", "decode")
+
+
+def url_template(uri):
+    """
+    Return the path of uri with every SID replaced by ``{sid}``, so requests
+    for different instances of a resource can be grouped together::
+
+        /2010-04-01/Accounts/{sid}/Calls/{sid}.json
+    """
+    parts = urlparse(uri).path.split("/")
+    for i, part in enumerate(parts):
+        name, dot, ext = part.partition(".")
+        if SID.match(name):
+            parts[i] = "{sid}" + dot + ext
+    return "/".join(parts)
+
+
+class RequestEvent(object):
+    """
+    A request to Twilio, as seen by :class:`Hooks`. Hooks run before the
+    request see only method, resource, url and uri_template; the rest is
+    filled in once it has finished.
+
+    :ivar string method: The HTTP method
+    :ivar string resource: The name of the resource requested, such as
+                           "Calls" or "Messages"
+    :ivar string url: The URL requested, without its query string
+    :ivar string uri_template: url's path with each SID replaced by ``{sid}``
+    :ivar int status: The HTTP status of the response, or None if no
+                      response arrived
+    :ivar int bytes_sent: The size of the request body
+    :ivar int bytes_received: The size of the response body
+    :ivar bool reused: True if the request was sent over a warm keep-alive
+                       connection
+    :ivar bool cached: True if the response came from the client's cache
+    :ivar int retries: The times the request was resent by a retry policy
+    :ivar dict timing: Seconds spent in each part of the request; see
+                       :attr:`twilio.rest.resources.Response.timing`
+    :ivar float elapsed: Seconds from the start of the request until the
+                         response was decoded
+    :ivar error: The exception raised by the request, if any
+    """
+
+    def __init__(self, method, resource, url):
+        self.method = method
+        self.resource = resource
+        self.url = url
+        self.uri_template = url_template(url)
+        self.status = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.reused = False
+        self.cached = False
+        self.retries = 0
+        self.timing = dict.fromkeys(TIMING_KEYS)
+        self.elapsed = None
+        self.error = None
+
+    def update(self, resp):
+        """Fill in the details of resp, a Response"""
+        self.status = resp.status_code
+        self.url = resp.url.split("?", 1)[0]
+        self.uri_template = url_template(self.url)
+        self.bytes_sent = resp.bytes_sent
+        self.bytes_received = resp.bytes_received
+        self.reused = resp.reused
+        self.cached = resp.cached
+        self.retries = resp.retries
+        self.timing = resp.timing
+
+    def __repr__(self):
+        return "<RequestEvent %s %s %s>" % (self.method, self.uri_template,
+                                            self.status)
+
+
+class Hooks(object):
+    """
+    Functions called with a :class:`RequestEvent` before and after every
+    request made over a :class:`twilio.rest.connection.Connection`::
+
+        hooks = Hooks()
+
+        @hooks.after_request
+        def record(event):
+            statsd.timing("twilio.%s" % event.resource, event.elapsed)
+
+        client = TwilioRestClient(account, token, hooks=hooks)
+
+    After-request hooks also run for requests that fail, with the
+    exception in ``event.error``. Exceptions raised by hooks are logged and
+    never interrupt the request.
+
+    :param before: A list of functions to call before each request
+    :param after: A list of functions to call after each request
+    """
+
+    def __init__(self, before=None, after=None):
+        self.before = list(before or [])
+        self.after = list(after or [])
+
+    def __nonzero__(self):
+        return bool(self.before or self.after)
+
+    def before_request(self, fn):
+        """Add a function to call before each request; usable as a
+        decorator"""
+        self.before.append(fn)
+        return fn
+
+    def after_request(self, fn):
+        """Add a function to call after each request; usable as a
+        decorator"""
+        self.after.append(fn)
+        return fn
+
+    def run_before(self, event):
+        self.run(self.before, event)
+
+    def run_after(self, event):
+        self.run(self.after, event)
+
+    def run(self, fns, event):
+        for fn in fns:
+            try:
+                fn(event)
+            except Exception:
+                logging.exception("Request hook %r failed", fn)
@@ -0,0 +1,235 @@
+"""
+Count and time the requests a client makes to each Twilio endpoint, in
+process, for export to Prometheus or any other metrics system
+"""
+import math
+import threading
+
+# The upper bound of the first latency bucket, in seconds. Each bucket after
+# it is twice as wide as the one before, up to 2 ** (BUCKETS - 1) times this.
+BASE = 0.001
+BUCKETS = 18
+
+BOUNDS = [BASE * 2 ** i for i in range(BUCKETS)]
+
+
+def endpoint(uri_template):
+    """
+    Return the endpoint a request was made to, from its URL template::
+
+        /2010-04-01/Accounts/{sid}/SMS/Messages/{sid}.json -> SMS/Messages
+        /2010-04-01/Accounts/{sid}/Calls/{sid}/Recordings.json
+            -> Calls/Recordings
+    """
+    path = uri_template.split("?", 1)[0]
+    if path.endswith(".json"):
+        path = path[:-5]
+
+    parts = [p for p in path.split("/") if p and p != "{sid}"]
+
+    # Drop the API version and, below it, the account
+    parts = parts[1:]
+    if len(parts) > 1 and parts[0] == "Accounts":
+        parts = parts[1:]
+
+    return "/".join(parts)
+
+
+def bucket(seconds):
+    """Return the index of the smallest bucket bound seconds fits under"""
+    if seconds <= BASE:
+        return 0
+
+    mantissa, exponent = math.frexp(seconds / BASE)
+    if mantissa == 0.5:
+        exponent -= 1
+    return min(exponent, BUCKETS)
+
+
+class EndpointStats(object):
+    """The totals for requests using one method on one endpoint"""
+
+    def __init__(self):
+        self.statuses = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        # One more count than bounds, for requests slower than all of them
+        self.buckets = [0] * (BUCKETS + 1)
+        self.seconds = 0.0
+        self.count = 0
+
+    def add(self, status, bytes_sent, bytes_received, retries, seconds):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+        self.retries += retries
+
+        if seconds is not None:
+            self.buckets[bucket(seconds)] += 1
+            self.seconds += seconds
+            self.count += 1
+
+    def cumulative(self):
+        """Return the count of requests under each bound, and in total"""
+        counts = []
+        total = 0
+        for count in self.buckets:
+            total += count
+            counts.append(total)
+        return counts
+
+    def to_dict(self):
+        return {
+            "requests": dict(self.statuses),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "retries": self.retries,
+            "latency": {
+                "buckets": zip(BOUNDS + [float("inf")], self.cumulative()),
+                "sum": self.seconds,
+                "count": self.count,
+                },
+            }
+
+
+class Metrics(object):
+    """
+    Request counts, sizes, retries and latency histograms for each Twilio
+    endpoint, such as ``Calls`` or ``SMS/Messages``, by HTTP method and
+    response status.
+
+    A :class:`Metrics` registry is an after-request hook; install it with
+    :class:`twilio.rest.hooks.Hooks`::
+
+        metrics = Metrics()
+        client = TwilioRestClient(account, token,
+                                  hooks=Hooks(after=[metrics]))
+
+        print metrics.to_prometheus()
+
+    Latencies fall into buckets whose bounds double from 1 millisecond to
+    about two minutes. Requests that failed before a response arrived are
+    counted with the status "error", and requests answered from the
+    client's cache with the status "cached".
+
+    :param string prefix: The prefix of every Prometheus metric name
+    """
+
+    def __init__(self, prefix="twilio"):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def __call__(self, event):
+        self.record(event)
+
+    def record(self, event):
+        """Add a finished :class:`twilio.rest.hooks.RequestEvent`"""
+        if event.cached:
+            status = "cached"
+        elif event.status is None:
+            status = "error"
+        else:
+            status = event.status
+
+        key = (endpoint(event.uri_template), event.method)
+
+        self.lock.acquire()
+        try:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = EndpointStats()
+            stats.add(status, event.bytes_sent, event.bytes_received,
+                      event.retries, event.elapsed)
+        finally:
+            self.lock.release()
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        self.lock.acquire()
+        try:
+            self.endpoints = {}
+        finally:
+            self.lock.release()
+
+    def snapshot(self):
+        """Return a sorted list of (endpoint, method, EndpointStats dict)"""
+        self.lock.acquire()
+        try:
+            return [(name, method, stats.to_dict()) for (name, method), stats
+                    in sorted(self.endpoints.items())]
+        finally:
+            self.lock.release()
+
+    def to_dict(self):
+        """
+        Return the metrics as plain data, keyed by endpoint and then method::
+
+            {"Calls": {"GET": {"requests": {200: 3}, "bytes_sent": 0,
+                               "bytes_received": 4096, "retries": 0,
+                               "latency": {"buckets": [(0.001, 0), ...],
+                                           "sum": 0.12, "count": 3}}}}
+
+        Latency buckets are cumulative, as in Prometheus: each is the count
+        of requests that took at most its bound in seconds.
+        """
+        data = {}
+        for name, method, stats in self.snapshot():
+            data.setdefault(name, {})[method] = stats
+        return data
+
+    def to_prometheus(self):
+        """Return the metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        prefix = self.prefix
+        lines = []
+
+        def family(name, kind, help):
+            lines.append("# HELP %s_%s %s" % (prefix, name, help))
+            lines.append("# TYPE %s_%s %s" % (prefix, name, kind))
+
+        def sample(name, labels, value):
+            lines.append("%s_%s{%s} %s" % (prefix, name, ",".join(
+                '%s="%s"' % (k, escape(v)) for k, v in labels), value))
+
+        family("requests_total", "counter",
+               "Requests made to the Twilio API")
+        for name, method, stats in snapshot:
+            for status, count in sorted(stats["requests"].items()):
+                sample("requests_total", [("endpoint", name),
+                       ("method", method), ("status", status)], count)
+
+        for metric, key, help in [
+                ("request_bytes_total", "bytes_sent",
+                 "Bytes of request bodies sent to the Twilio API"),
+                ("response_bytes_total", "bytes_received",
+                 "Bytes of response bodies received from the Twilio API"),
+                ("retries_total", "retries",
+                 "Times requests to the Twilio API were retried")]:
+            family(metric, "counter", help)
+            for name, method, stats in snapshot:
+                sample(metric, [("endpoint", name), ("method", method)],
+                       stats[key])
+
+        family("request_duration_seconds", "histogram",
+               "Seconds taken by requests to the Twilio API")
+        for name, method, stats in snapshot:
+            labels = [("endpoint", name), ("method", method)]
+            latency = stats["latency"]
+            for bound, count in latency["buckets"]:
+                le = "+Inf" if bound > BOUNDS[-1] else repr(bound)
+                sample("request_duration_seconds_bucket",
+                       labels + [("le", le)], count)
+            sample("request_duration_seconds_sum", labels,
+                   repr(latency["sum"]))
+            sample("request_duration_seconds_count", labels,
+                   latency["count"])
+
+        return "\n".join(lines) + "\n"
+
+
+def escape(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"') \
+        .replace("\n", "\\n")
@@ -0,0 +1,146 @@
+"""
+Client-side rate limiting, so bursts are smoothed out before they reach Twilio
+instead of being queued or rejected by it
+"""
+import re
+import threading
+import time
+
+SHORT_CODE = re.compile(r"^\d{3,6}$")
+
+
+def is_short_code(number):
+    """Return True if number looks like a short code rather than a long code"""
+    return bool(SHORT_CODE.match(number or ""))
+
+
+class TokenBucket(object):
+    """
+    A bucket that fills with rate tokens per second, up to capacity.
+
+    A :class:`TokenBucket` is not thread-safe on its own;
+    :class:`RateLimiter` serializes access to its buckets.
+
+    :param float rate: Tokens added per second
+    :param int capacity: The largest burst allowed. Defaults to one second's
+                         worth of tokens
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = capacity or max(1, rate)
+        self.tokens = float(self.capacity)
+        self.updated = time.time()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, tokens=1):
+        """Return True if tokens can be taken right now"""
+        self.refill(time.time())
+        return self.tokens >= tokens
+
+    def reserve(self, tokens=1):
+        """
+        Take tokens, going into debt if the bucket is short, and return the
+        seconds to wait before they would have been available
+        """
+        self.refill(time.time())
+        self.tokens -= tokens
+
+        if self.tokens >= 0:
+            return 0
+        return -self.tokens / self.rate
+
+
+class RateLimiter(object):
+    """
+    Token buckets keyed by account SID and, optionally, by sending number.
+
+    Every request made with an account takes a token from that account's
+    bucket. Requests that send from a number (such as creating an SMS message
+    or call) also take a token from that number's bucket, which fills at
+    short_code_rate for short codes and long_code_rate for everything else.
+
+    One :class:`RateLimiter` can be shared by any number of clients and
+    threads; a thread that would exceed a limit sleeps until it is allowed
+    through.
+
+    :param float account_rate: Requests per second per account. None for no
+                               limit.
+    :param int account_burst: Largest burst of requests per account
+    :param float long_code_rate: Messages per second per long code. None for
+                                 no per-number limits.
+    :param float short_code_rate: Messages per second per short code
+    """
+
+    def __init__(self, account_rate=None, account_burst=None,
+                 long_code_rate=1, short_code_rate=30):
+        self.account_rate = account_rate
+        self.account_burst = account_burst
+        self.long_code_rate = long_code_rate
+        self.short_code_rate = short_code_rate
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.sleep = time.sleep
+
+    def bucket(self, key, rate, capacity=None):
+        if key not in self.buckets:
+            self.buckets[key] = TokenBucket(rate, capacity)
+        return self.buckets[key]
+
+    def buckets_for(self, account_sid, sender=None):
+        buckets = []
+
+        if self.account_rate is not None:
+            buckets.append(self.bucket(("account", account_sid),
+                                       self.account_rate, self.account_burst))
+
+        if sender and self.long_code_rate is not None:
+            if is_short_code(sender):
+                rate = self.short_code_rate
+            else:
+                rate = self.long_code_rate
+            buckets.append(self.bucket(("sender", account_sid, sender), rate))
+
+        return buckets
+
+    def reserve(self, account_sid, sender=None):
+        """
+        Claim a slot for one request and return the seconds the caller should
+        wait before sending it. Use this to defer work instead of blocking.
+        """
+        self.lock.acquire()
+        try:
+            delays = [b.reserve() for b in self.buckets_for(account_sid,
+                                                            sender)]
+            return max(delays or [0])
+        finally:
+            self.lock.release()
+
+    def acquire(self, account_sid, sender=None, block=True):
+        """
+        Wait until one request is allowed for this account and sender.
+
+        :param bool block: If False, return False straight away rather than
+                           waiting, without using up any tokens.
+        :returns: True once the request may be sent
+        """
+        if block:
+            delay = self.reserve(account_sid, sender)
+            if delay > 0:
+                self.sleep(delay)
+            return True
+
+        self.lock.acquire()
+        try:
+            buckets = self.buckets_for(account_sid, sender)
+            if not all([b.available() for b in buckets]):
+                return False
+            for b in buckets:
+                b.reserve()
+            return True
+        finally:
+            self.lock.release()
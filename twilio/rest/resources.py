@@ -1,10 +1,21 @@
 import re
+import copy
 import datetime
 import logging
+import math
+import sys
+import time
 import twilio
 from twilio import TwilioException
 from twilio import TwilioRestException
+from twilio.rest.futures import Batch
+from twilio.rest.futures import prefetch as prefetched
+from twilio.rest.hooks import RequestEvent
+from twilio.rest.hooks import TIMING_KEYS
+from twilio.rest.streaming import PageParser
+from operator import itemgetter
 from urllib import urlencode
+from urlparse import urljoin
 from urlparse import urlparse
 
 # import json
@@ -45,6 +56,37 @@ def parse_date(d):
         return d
 
 
+def to_date(d):
+    """
+    Return d as a :class:`datetime.date`. d may be a date, a datetime or a
+    YYYY-MM-DD string.
+    """
+    if isinstance(d, datetime.datetime):
+        return d.date()
+    elif isinstance(d, datetime.date):
+        return d
+    return datetime.datetime.strptime(d, "%Y-%m-%d").date()
+
+
+def split_dates(start, end, shards):
+    """
+    Split the days from start to end, inclusive, into at most shards
+    consecutive, non-overlapping (first, last) ranges of whole days. The
+    most recent range comes first, matching the order Twilio lists resources.
+    """
+    days = (end - start).days + 1
+    shards = max(1, min(shards, days))
+    ranges = []
+
+    for i in range(shards):
+        first = start + datetime.timedelta(days=days * i // shards)
+        last = start + datetime.timedelta(days=days * (i + 1) // shards - 1)
+        ranges.append((first, last))
+
+    ranges.reverse()
+    return ranges
+
+
 def convert_boolean(bool):
     if bool == True:
         return "true"
@@ -101,30 +143,93 @@ def normalize_dates(myfunc):
 class Response(object):
     """
     Take a httplib2 response and turn it into a requests response
+
+    Only requests sent over a :class:`twilio.rest.connection.Connection` are
+    timed. Parts of a request that did not happen, or were not measured, are
+    None in ``timing``.
+
+    :ivar dict timing: Seconds spent on each part of the request: connect,
+                       tls, ttfb (until the response headers arrived),
+                       download and decode (of the JSON body, only measured
+                       when the connection has hooks). httplib2 performs the
+                       TLS handshake inside connect, so tls is always None.
+    :ivar bool reused: True if the request went over a warm connection
+    :ivar int bytes_sent: The size of the request body
+    :ivar int bytes_received: The size of the response body
+    :ivar int retries: The times a :class:`twilio.rest.retry.RetryPolicy`
+                       resent the request
     """
     def __init__(self, httplib_resp, content, url):
         self.content = content
-        self.cached = False
+        self.cached = getattr(httplib_resp, "fromcache", False)
         self.status_code = int(httplib_resp.status)
+        self.headers = dict(httplib_resp)
         self.ok = self.status_code < 400
         self.url = url
+        self.timing = dict.fromkeys(TIMING_KEYS)
+        self.timing.update(getattr(httplib_resp, "timing", None) or {})
+        self.reused = getattr(httplib_resp, "reused", False)
+        self.bytes_sent = getattr(httplib_resp, "bytes_sent", 0)
+        self.bytes_received = len(content or "")
+        self.retries = 0
+
+    def iter_content(self):
+        """Return the body as an iterator of strings"""
+        return iter([self.content])
+
+
+class StreamingResponse(Response):
+    """
+    A :class:`Response` whose body has not been read yet. iter_content reads
+    the body as it arrives; using content reads all of it. Neither the
+    download nor bytes_received is measured.
+    """
+    def __init__(self, httplib_resp, body, url):
+        super(StreamingResponse, self).__init__(httplib_resp, None, url)
+        self.body = body
+
+    def _get_content(self):
+        if self._content is None:
+            self._content = "".join(self.body)
+        return self._content
+
+    def _set_content(self, value):
+        self._content = value
+
+    content = property(_get_content, _set_content)
+
+    def iter_content(self):
+        if self._content is not None:
+            return iter([self._content])
+        return iter(self.body)
+
+
+def encode_url(url, params):
+    """Return url with params added to its query string"""
+    enc_params = urlencode(params, doseq=True)
+    if urlparse(url).query:
+        return '%s&%s' % (url, enc_params)
+    else:
+        return '%s?%s' % (url, enc_params)
 
 
 def make_request(method, url,
     params=None, data=None, headers=None, cookies=None, files=None,
-    auth=None, timeout=None, allow_redirects=False, proxies=None):
+    auth=None, timeout=None, allow_redirects=False, proxies=None,
+    connection=None, stream=False):
     """Sends an HTTP request Returns :class:`Response <models.Response>`
 
     See the requests documentation for explanation of all these parameters
 
     Currently proxies, files, and cookies are all ignored
-    """
-    http = httplib2.Http(timeout=timeout)
-    http.follow_redirects = allow_redirects
-
-    if auth is not None:
-        http.add_credentials(auth[0], auth[1])
 
+    :param connection: A :class:`twilio.rest.connection.Connection` to send
+                       the request over. If None, a new :class:`httplib2.Http`
+                       is created for this request alone.
+    :param bool stream: Return as soon as the response headers arrive, and
+                        read the body from the response's iter_content.
+                        Only requests sent over a connection are streamed.
+    """
     if data is not None:
         udata = {}
         for k, v in data.iteritems():
@@ -135,13 +240,25 @@ def make_request(method, url,
         data = urlencode(udata)
 
     if params is not None:
-        enc_params = urlencode(params, doseq=True)
-        if urlparse(url).query:
-            url = '%s&%s' % (url, enc_params)
-        else:
-            url = '%s?%s' % (url, enc_params)
+        url = encode_url(url, params)
+
+    if connection is not None and not allow_redirects and stream:
+        resp, body = connection.stream(url, method, headers=headers,
+                                       body=data, auth=auth, timeout=timeout)
+        return StreamingResponse(resp, body, url)
+    elif connection is not None and not allow_redirects:
+        resp, content = connection.request(url, method, headers=headers,
+                                           body=data, auth=auth,
+                                           timeout=timeout)
+    else:
+        http = httplib2.Http(timeout=timeout)
+        http.follow_redirects = allow_redirects
 
-    resp, content = http.request(url, method, headers=headers, body=data)
+        if auth is not None:
+            http.add_credentials(auth[0], auth[1])
+
+        resp, content = http.request(url, method, headers=headers, body=data)
+        resp.bytes_sent = len(data or "")
 
     # Format httplib2 reqeusts as reqeusts objects
     return Response(resp, content, url)
@@ -163,7 +280,43 @@ def make_twilio_request(method, uri, **kwargs):
         headers["Accept"] = "application/json"
         uri = uri + ".json"
 
-    resp = make_request(method, uri, **kwargs)
+    connection = kwargs.get("connection")
+    account_sid = (kwargs.get("auth") or (None,))[0]
+    cache = None
+
+    if connection is not None and not kwargs.get("stream"):
+        cache = connection.cache
+
+    if cache is not None:
+        params = kwargs.get("params")
+        cache_url = uri
+        if params:
+            cache_url = encode_url(uri, sorted(params.items()))
+
+        if method == "GET":
+            entry = cache.lookup(account_sid, cache_url)
+            if entry is not None:
+                headers, content = entry
+                resp = httplib2.Response(headers)
+                resp.fromcache = True
+                return Response(resp, content, cache_url)
+        else:
+            cache.invalidate(account_sid, cache_url)
+
+    send = make_request
+    if connection is not None and connection.rate_limiter is not None:
+        limiter = connection.rate_limiter
+        sender = (kwargs.get("data") or {}).get("From")
+
+        def send(method, uri, **kwargs):
+            # Every attempt takes a token, so retries can't stampede
+            limiter.acquire(account_sid, sender)
+            return make_request(method, uri, **kwargs)
+
+    if connection is not None and connection.retry is not None:
+        resp = connection.retry.request(send, method, uri, **kwargs)
+    else:
+        resp = send(method, uri, **kwargs)
 
     if not resp.ok:
         try:
@@ -172,7 +325,11 @@ def make_twilio_request(method, uri, **kwargs):
         except:
             message = resp.content
 
-        raise TwilioRestException(resp.status_code, resp.url, message)
+        raise TwilioRestException(resp.status_code, resp.url, message,
+                                  response=resp)
+
+    if cache is not None and method == "GET":
+        cache.store(account_sid, cache_url, resp.headers, resp.content)
 
     return resp
 
@@ -182,9 +339,10 @@ class Resource(object):
 
     name = "Resource"
 
-    def __init__(self, base_uri, auth):
+    def __init__(self, base_uri, auth, connection=None):
         self.base_uri = base_uri
         self.auth = auth
+        self.connection = connection
 
     def __eq__(self, other):
         return (isinstance(other, self.__class__)
@@ -198,15 +356,59 @@ class Resource(object):
         Send an HTTP request to the resource.
 
         Raise a TwilioRestException
+
+        The body of a streamed response (stream=True) is left unread, and
+        returned as None.
         """
-        resp = make_twilio_request(method, uri, auth=self.auth, **kwargs)
+        hooks = None
+        if self.connection is not None:
+            kwargs["connection"] = self.connection
+            hooks = self.connection.hooks
 
-        logging.debug(resp.content)
+        event = None
+        if hooks:
+            event = RequestEvent(method, self.name, uri)
+            hooks.run_before(event)
 
-        if method == "DELETE":
-            return resp, {}
-        else:
-            return resp, json.loads(resp.content)
+        start = time.time()
+
+        try:
+            resp = make_twilio_request(method, uri, auth=self.auth, **kwargs)
+
+            if kwargs.get("stream"):
+                content = None
+            elif method == "DELETE":
+                logging.debug(resp.content)
+                content = {}
+            elif event is None:
+                logging.debug(resp.content)
+                content = json.loads(resp.content)
+            else:
+                logging.debug(resp.content)
+                decode_start = time.time()
+                content = json.loads(resp.content)
+                resp.timing["decode"] = time.time() - decode_start
+        except Exception:
+            if event is not None:
+                exc_info = sys.exc_info()
+                event.error = exc_info[1]
+                # An error response carries its retries, sizes and timing
+                error_resp = getattr(exc_info[1], "response", None)
+                if error_resp is not None:
+                    event.update(error_resp)
+                else:
+                    event.status = getattr(exc_info[1], "status", None)
+                event.elapsed = time.time() - start
+                hooks.run_after(event)
+                raise exc_info[0], exc_info[1], exc_info[2]
+            raise
+
+        if event is not None:
+            event.update(resp)
+            event.elapsed = time.time() - start
+            hooks.run_after(event)
+
+        return resp, content
 
     @property
     def uri(self):
@@ -214,16 +416,158 @@ class Resource(object):
         return "%s/%s" % format
 
 
+class Subresource(object):
+    """
+    A list resource belonging to an instance resource, such as a call's
+    recordings. The list resource is only created the first time it is
+    accessed, then cached on the instance.
+    """
+
+    def __init__(self, resource):
+        self.resource = resource
+        self.key = getattr(resource, "key", None) or resource.name.lower()
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        list_resource = self.resource(instance.uri, instance.parent.auth,
+                                      instance.parent.connection)
+        instance.__dict__[self.key] = list_resource
+        return list_resource
+
+
+class Record(tuple):
+    """
+    A compact, read-only copy of an instance resource's fields, for holding
+    large numbers of resources in memory.
+
+    Each instance resource class has a record class, stored as its
+    ``record`` attribute, with a slot for each of its known ``fields``.
+    Known fields Twilio did not return are None. Unknown fields are kept in
+    ``extra``. Records keep a reference to the list resource that loaded
+    them rather than their own copies of its URI and credentials.
+
+    Two records of the same type are equal, and hash the same, if they have
+    the same sid.
+    """
+
+    __slots__ = ()
+
+    id_key = "sid"
+
+    # The JSON keys for each field, and every key that is not extra
+    keys = ()
+    known_keys = frozenset(["uri"])
+
+    parent = property(itemgetter(0))
+    extra = property(itemgetter(1))
+
+    def __new__(cls, parent, entries):
+        values = map(entries.get, cls.keys)
+
+        extra = None
+        if not cls.known_keys.issuperset(entries):
+            extra = dict((key, value) for key, value in entries.iteritems()
+                         if key not in cls.known_keys)
+
+        return tuple.__new__(cls, [parent, extra] + values)
+
+    def __getattr__(self, name):
+        extra = self.extra
+        if extra and name in extra:
+            return extra[name]
+        raise AttributeError(name)
+
+    @property
+    def name(self):
+        return getattr(self, self.id_key)
+
+    @property
+    def auth(self):
+        return self.parent.auth
+
+    @property
+    def uri(self):
+        return "%s/%s" % (self.parent.uri, self.name)
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __eq__(self, other):
+        return (isinstance(other, self.__class__)
+                and self.name == other.name)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self.name)
+
+    def to_instance(self):
+        """Return a full instance resource with this record's fields"""
+        entries = dict(self.extra or {})
+        entries.update(zip(self.keys, self[2:]))
+
+        # The instance updates itself through its parent, which must load
+        # instances rather than records
+        parent = self.parent
+        if parent.compact:
+            parent = copy.copy(parent)
+            parent.compact = False
+
+        instance = parent.instance(parent, self.name)
+        instance.load(entries)
+        return instance
+
+
+def record_type(name, fields, id_key):
+    """Return a :class:`Record` subclass with the given fields"""
+    keys = tuple(["from" if f == "from_" else f for f in fields])
+    attrs = {
+        "__slots__": (),
+        "id_key": id_key,
+        "keys": keys,
+        "known_keys": Record.known_keys | frozenset(keys),
+        }
+
+    for i, field in enumerate(fields):
+        attrs[field] = property(itemgetter(i + 2))
+
+    return type(name, (Record,), attrs)
+
+
+class InstanceResourceType(type):
+    """
+    Add a :class:`Subresource` for each entry in ``subresources`` and build
+    the class's :class:`Record` type from its ``fields``
+    """
+
+    def __init__(cls, name, bases, attrs):
+        super(InstanceResourceType, cls).__init__(name, bases, attrs)
+
+        for resource in attrs.get("subresources", []):
+            subresource = Subresource(resource)
+            setattr(cls, subresource.key, subresource)
+
+        cls.record = record_type("%sRecord" % name, cls.fields, cls.id_key)
+
+
 class InstanceResource(Resource):
 
+    __metaclass__ = InstanceResourceType
+
     subresources = []
     id_key = "sid"
 
+    # The fields Twilio returns for this resource, given slots in its record
+    fields = ()
+
     def __init__(self, parent, sid):
         self.parent = parent
         self.name = sid
         super(InstanceResource, self).__init__(parent.uri,
-            parent.auth)
+            parent.auth, parent.connection)
 
     def load(self, entries):
         if "from" in entries.keys():
@@ -237,10 +581,11 @@ class InstanceResource(Resource):
 
     def load_subresources(self):
         """
-        Load all subresources
+        Load all subresources now, rather than on first access
         """
         for resource in self.subresources:
-            list_resource = resource(self.uri, self.parent.auth)
+            list_resource = resource(self.uri, self.parent.auth,
+                                     self.parent.connection)
             self.__dict__[list_resource.key] = list_resource
 
     def update_instance(self, **kwargs):
@@ -251,11 +596,153 @@ class InstanceResource(Resource):
         return self.parent.delete(self.name)
 
 
+class Page(list):
+    """
+    A page of instance resources, along with the paging information Twilio
+    returned with it, such as ``total`` and ``next_page_uri``
+    """
+
+    paging_keys = [
+        "page",
+        "num_pages",
+        "page_size",
+        "total",
+        "start",
+        "end",
+        "uri",
+        "first_page_uri",
+        "previous_page_uri",
+        "next_page_uri",
+        "last_page_uri",
+        ]
+
+    def __init__(self, instances, paging):
+        super(Page, self).__init__(instances)
+        for key in self.paging_keys:
+            setattr(self, key, paging.get(key))
+
+
+class InstanceDict(dict):
+    """
+    Instance resources keyed by sid, as returned by
+    :meth:`ListResource.get_many`. SIDs that do not exist are listed in
+    ``missing``. SIDs that could not be fetched for any other reason are keys
+    of ``failed``, mapped to the exception raised.
+    """
+
+    def __init__(self):
+        super(InstanceDict, self).__init__()
+        self.missing = []
+        self.failed = {}
+
+
+class LazyPage(object):
+    """
+    A page of instance resources, each of which is only loaded from the
+    decoded response the first time it is accessed. Otherwise behaves like a
+    read-only :class:`Page`.
+
+    :param load: The function that turns one response entry into an
+                 instance resource
+    :param list entries: The decoded entries in the page
+    :param dict paging: The decoded page, for its paging information
+    """
+
+    paging_keys = Page.paging_keys
+
+    def __init__(self, load, entries, paging):
+        self.load = load
+        self.entries = list(entries)
+        self.loaded = [None] * len(self.entries)
+        for key in self.paging_keys:
+            setattr(self, key, paging.get(key))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in xrange(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+
+        instance = self.loaded[index]
+        if instance is None:
+            instance = self.loaded[index] = self.load(self.entries[index])
+            # The entry is no longer needed once it has been loaded
+            self.entries[index] = None
+        return instance
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return "<LazyPage of %d>" % len(self)
+
+
+class StreamingPage(object):
+    """
+    A page of instance resources that are loaded while the response is still
+    arriving. A streaming page can only be iterated over once.
+
+    Paging information is available as soon as it has been received; Twilio
+    sends it before the page's resources. Reading a paging attribute that
+    comes after them reads, and skips, the rest of the page.
+
+    :param load: The function that turns one response entry into an
+                 instance resource
+    :param parser: A :class:`twilio.rest.streaming.PageParser` for the
+                   response
+    """
+
+    paging_keys = Page.paging_keys
+
+    def __init__(self, load, parser):
+        self.load = load
+        self.parser = parser
+
+    def __iter__(self):
+        for entry in self.parser:
+            yield self.load(entry)
+
+    def __getattr__(self, name):
+        if name not in self.paging_keys:
+            raise AttributeError(name)
+
+        if name not in self.parser.paging:
+            self.parser.header()
+
+        if name not in self.parser.paging and not self.parser.finished:
+            for entry in self.parser:
+                pass
+
+        return self.parser.paging.get(name)
+
+
 class ListResource(Resource):
 
     name = "Resources"
     instance = InstanceResource
 
+    # The list() arguments that bound a date range, for iter_date_range
+    date_range_keys = None
+
+    # Load compact records instead of instance resources
+    compact = False
+
+    # Load each page's instance resources only when they are accessed
+    lazy = False
+
+    # The response keys loaded into instance resources, or None for all
+    projection = None
+
+    # Load instance resources while each page's response is arriving
+    streaming = False
+
     def __init__(self, *args, **kwargs):
         super(ListResource, self).__init__(*args, **kwargs)
 
@@ -269,10 +756,22 @@ class ListResource(Resource):
         return self.get_instance(sid)
 
     def get_instance(self, sid):
-        """Request the specified instance resource"""
+        """
+        Request the specified instance resource. Threads that ask for the
+        same resource while a request for it is in progress share that
+        request's response.
+        """
         uri = "%s/%s" % (self.uri, sid)
-        resp, item = self.request("GET", uri)
-        return self.load_instance(item)
+
+        if self.connection is None:
+            resp, item = self.request("GET", uri)
+        else:
+            key = (self.auth[0], uri)
+            resp, item = self.connection.in_flight.do(key, self.request,
+                                                      "GET", uri)
+
+        # Each caller gets its own instance, as loading changes the entries
+        return self.load_instance(dict(item))
 
     def get_instances(self, params=None, page=None, page_size=None):
         """
@@ -285,7 +784,7 @@ class ListResource(Resource):
         :param int page: The page of results to retrieve (most recent at 0)
         :param int page_size: The number of results to be returned.
 
-        :returns: -- the list of resources
+        :returns: -- the list of resources, as a :class:`Page`
         """
         params = params or {}
 
@@ -295,12 +794,40 @@ class ListResource(Resource):
         if page_size is not None:
             params["PageSize"] = page_size
 
-        resp, page = self.request("GET", self.uri, params=params)
+        return self.request_page(self.uri, params=params)
 
+    def get_next_page(self, page):
+        """
+        Request the page after the given :class:`Page` by following its
+        ``next_page_uri``. Returns None if page is the last page.
+        """
+        if not page.next_page_uri:
+            return None
+
+        # next_page_uri already carries the .json extension and the query
+        uri = urljoin(self.base_uri, page.next_page_uri)
+        headers = {"Accept": "application/json"}
+        return self.request_page(uri, headers=headers)
+
+    def request_page(self, uri, **kwargs):
+        """Request a page of instance resources"""
+        if not self.streaming:
+            resp, page = self.request("GET", uri, **kwargs)
+            return self.load_page(page)
+
+        resp, page = self.request("GET", uri, stream=True, **kwargs)
+        parser = PageParser(resp.iter_content(), self.key)
+        return StreamingPage(self.load_instance, parser)
+
+    def load_page(self, page):
         if self.key not in page:
             raise TwilioException("Key %s not present in response" % self.key)
 
-        return [self.load_instance(ir) for ir in page[self.key]]
+        if self.lazy:
+            return LazyPage(self.load_instance, page[self.key], page)
+
+        instances = [self.load_instance(ir) for ir in page[self.key]]
+        return Page(instances, page)
 
     def create_instance(self, body):
         """
@@ -344,28 +871,244 @@ class ListResource(Resource):
         resp, page = self.request("GET", self.uri)
         return page["total"]
 
-    def iter(self, **kwargs):
+    def iter(self, prefetch=0, **kwargs):
         """
         Return all instance resources using an iterator
         Can only be called on classes which implement list()
 
-        TODO Make this use the next_url instead
+        Takes the same arguments as list(). Pass a larger page_size to make
+        fewer requests.
+
+        :param int prefetch: Request up to this many pages ahead on a
+                             background thread while the current page is
+                             consumed. 0 requests each page when it is needed.
         """
-        p = 0
-        try:
-            while True:
-                for r in self.list(page=p, **kwargs):
-                    yield r
-                p += 1
-        except TwilioRestException:
-            pass
+        for page in self.iter_pages(prefetch=prefetch, **kwargs):
+            for r in page:
+                yield r
+
+    def iter_pages(self, prefetch=0, **kwargs):
+        """
+        Return every page of instance resources, as :class:`Page` objects,
+        using an iterator. Can only be called on classes which implement
+        list()
+
+        The first page is requested with list(**kwargs). Each following page
+        is requested from the ``next_page_uri`` of the one before it, and
+        iteration stops when there is none.
+
+        :param int prefetch: Request up to this many pages ahead on a
+                             background thread. At most prefetch + 1 pages
+                             beyond the current one are held in memory.
+        """
+        if prefetch and self.streaming:
+            raise TwilioException("Streaming pages can not be prefetched")
+
+        if prefetch:
+            resource = self.for_threads(2)
+            for page in prefetched(resource.iter_pages(**kwargs), prefetch):
+                yield page
+            return
+
+        page = self.list(**kwargs)
+
+        while page is not None:
+            yield page
+            page = self.get_next_page(page)
+
+    def iter_date_range(self, after, before, concurrency=4, shard_size=5000,
+                        page_size=1000, **kwargs):
+        """
+        Return all instance resources between two dates using an iterator,
+        fetching parts of the range in parallel. Can only be called on
+        classes which set date_range_keys.
+
+        A single-result request first finds how many resources are in the
+        range. The range is then split into roughly total / shard_size
+        sub-ranges of whole days, and up to concurrency of them are fetched
+        at once. Resources are yielded most recent range first, as Twilio
+        orders them, with duplicates at range boundaries removed.
+
+        :param date after: The first day of the range
+        :param date before: The last day of the range
+        :param int concurrency: How many sub-ranges to fetch at a time
+        :param int shard_size: The number of resources to aim for in each
+                               sub-range
+        :param int page_size: The page size used within each sub-range
+
+        Any other keyword arguments are passed to list()
+        """
+        if self.date_range_keys is None:
+            raise TwilioException("%s can not be listed by date range" %
+                                  self.name)
+
+        after_key, before_key = self.date_range_keys
+        start, end = to_date(after), to_date(before)
+
+        params = dict(kwargs)
+        params[after_key] = start
+        params[before_key] = end
+        total = self.list(page_size=1, **params).total
+
+        if not total:
+            return
+
+        shards = int(math.ceil(total / float(shard_size)))
+        resource = self.for_threads(concurrency)
+
+        def fetch(date_range):
+            params = dict(kwargs)
+            params[after_key], params[before_key] = date_range
+            return list(resource.iter(page_size=page_size, **params))
+
+        batch = Batch(fetch, split_dates(start, end, shards),
+                      concurrency=concurrency, ordered=True)
+        previous = set()
+
+        for date_range, instances, error in batch:
+            if error is not None:
+                raise error
+
+            current = set()
+            for instance in instances:
+                if instance.name in previous or instance.name in current:
+                    continue
+                current.add(instance.name)
+                yield instance
+            previous = current
 
     def load_instance(self, data):
+        if self.projection is not None:
+            data = dict((k, data[k]) for k in self.projection if k in data)
+
+        if self.compact:
+            return self.instance.record(self, data)
+
         instance = self.instance(self, data[self.instance.id_key])
         instance.load(data)
-        instance.load_subresources()
         return instance
 
+    def as_records(self):
+        """
+        Return a copy of this list resource that loads compact, read-only
+        :class:`Record` objects instead of instance resources. Records use a
+        fraction of the memory, for when many resources are kept at once.
+        """
+        resource = copy.copy(self)
+        resource.compact = True
+        return resource
+
+    def as_lazy(self, fields=None):
+        """
+        Return a copy of this list resource whose pages are
+        :class:`LazyPage` objects, so instance resources are only created
+        for the entries that are read.
+
+        :param list fields: If given, only these fields (and the sid) are
+                            loaded into each instance resource, and the rest
+                            are dropped. For example
+                            ``["sid", "status", "duration"]``.
+        """
+        resource = copy.copy(self)
+        resource.lazy = True
+
+        if fields is not None:
+            keys = ["from" if f == "from_" else f for f in fields]
+            keys.append(self.instance.id_key)
+            resource.projection = frozenset(keys)
+
+        return resource
+
+    def as_streaming(self):
+        """
+        Return a copy of this list resource whose pages are
+        :class:`StreamingPage` objects, which yield each instance resource
+        as soon as it has been received. Large pages then no longer have to
+        be held in memory whole.
+        """
+        resource = copy.copy(self)
+        resource.streaming = True
+        return resource
+
+    def for_threads(self, concurrency):
+        """
+        Return this resource, or a copy of it, with a connection that can be
+        shared by concurrency threads
+        """
+        if self.connection is None or self.connection.thread_safe:
+            return self
+
+        resource = copy.copy(self)
+        resource.connection = self.connection.for_threads(concurrency)
+        return resource
+
+    def batch(self, fn, items, concurrency=10, ordered=False):
+        """
+        Return a :class:`twilio.rest.futures.Batch` calling
+        fn(resource, item) for each item, where resource is safe to use from
+        concurrency threads at once
+        """
+        resource = self.for_threads(concurrency)
+
+        def call(item):
+            return fn(resource, item)
+
+        return Batch(call, items, concurrency=concurrency, ordered=ordered)
+
+    def get_many(self, sids, concurrency=10):
+        """
+        Request many instance resources at once, over up to concurrency
+        connections. Requests still pass through the client's rate limiter
+        and retry policy.
+
+        :param sids: An iterable of resource SIDs
+        :param int concurrency: How many resources to request at a time
+
+        :returns: An :class:`InstanceDict` of instance resources by sid
+        """
+        def get(resource, sid):
+            return resource.get_instance(sid)
+
+        instances = InstanceDict()
+
+        for sid, instance, error in self.batch(get, sids, concurrency):
+            if error is None:
+                instances[sid] = instance
+            elif getattr(error, "status", None) == 404:
+                instances.missing.append(sid)
+            else:
+                instances.failed[sid] = error
+
+        return instances
+
+    def delete_many(self, sids, concurrency=10):
+        """
+        Delete many instance resources at once, over up to concurrency
+        connections.
+
+        :param sids: An iterable of resource SIDs, or of instance resources
+                     such as those from iter(). It is read lazily, so only
+                     about concurrency SIDs are held at a time. Pages are
+                     numbered by offset, so deleting from the list being
+                     iterated over skips some resources; repeat until none
+                     are left.
+        :param int concurrency: How many resources to delete at a time
+
+        :returns: A :class:`twilio.rest.futures.Batch`. Iterate over it, or
+                  call its wait(), to run the deletions. Each resource yields
+                  a ``(sid, True, None)`` tuple once Twilio answers 204 No
+                  Content, and ``(sid, None, exception)`` otherwise. Failures
+                  are also collected in its ``errors`` list.
+        """
+        def delete(resource, sid):
+            if not resource.delete_instance(sid):
+                raise TwilioException("%s %s was not deleted" %
+                                      (resource.name, sid))
+            return True
+
+        sids = (getattr(sid, "name", sid) for sid in sids)
+        return self.batch(delete, sids, concurrency=concurrency)
+
 
 class AvailablePhoneNumber(InstanceResource):
     """ An available phone number resource """
@@ -387,8 +1130,9 @@ class AvailablePhoneNumbers(ListResource):
 
     types = {"local": "Local", "tollfree": "TollFree"}
 
-    def __init__(self, base_uri, auth, phone_numbers):
-        super(AvailablePhoneNumbers, self).__init__(base_uri, auth)
+    def __init__(self, base_uri, auth, phone_numbers, connection=None):
+        super(AvailablePhoneNumbers, self).__init__(base_uri, auth,
+                                                    connection)
         self.phone_numbers = phone_numbers
 
     def get(self, sid):
@@ -420,12 +1164,24 @@ class AvailablePhoneNumbers(ListResource):
     def load_instance(self, data):
         instance = self.instance(self.phone_numbers)
         instance.load(data)
-        instance.load_subresources()
         return instance
 
 
 class Transcription(InstanceResource):
-    pass
+
+    fields = (
+        "sid",
+        "account_sid",
+        "recording_sid",
+        "status",
+        "type",
+        "duration",
+        "price",
+        "transcription_text",
+        "api_version",
+        "date_created",
+        "date_updated",
+        )
 
 
 class Transcriptions(ListResource):
@@ -446,6 +1202,16 @@ class Recording(InstanceResource):
         Transcriptions,
         ]
 
+    fields = (
+        "sid",
+        "account_sid",
+        "call_sid",
+        "duration",
+        "api_version",
+        "date_created",
+        "date_updated",
+        )
+
     def __init__(self, *args, **kwargs):
         super(Recording, self).__init__(*args, **kwargs)
         self.formats = {
@@ -464,6 +1230,7 @@ class Recordings(ListResource):
 
     name = "Recordings"
     instance = Recording
+    date_range_keys = ("after", "before")
 
     @normalize_dates
     def list(self, call_sid=None, before=None, after=None, **kwargs):
@@ -480,7 +1247,7 @@ class Recordings(ListResource):
             "DateCreated<": before,
             "DateCreated>": after,
             })
-        return self.get_instances(params=params)
+        return self.get_instances(params=params, **kwargs)
 
     def delete(self, sid):
         """
@@ -491,6 +1258,25 @@ class Recordings(ListResource):
 
 class Notification(InstanceResource):
 
+    fields = (
+        "sid",
+        "account_sid",
+        "call_sid",
+        "log",
+        "error_code",
+        "more_info",
+        "message_text",
+        "message_date",
+        "request_method",
+        "request_url",
+        "request_variables",
+        "response_headers",
+        "response_body",
+        "api_version",
+        "date_created",
+        "date_updated",
+        )
+
     def delete(self):
         """
         Delete this notification
@@ -502,6 +1288,7 @@ class Notifications(ListResource):
 
     name = "Notifications"
     instance = Notification
+    date_range_keys = ("after", "before")
 
     @normalize_dates
     def list(self, before=None, after=None, log_level=None, **kwargs):
@@ -592,6 +1379,30 @@ class Call(InstanceResource):
         Recordings,
         ]
 
+    fields = (
+        "sid",
+        "account_sid",
+        "parent_call_sid",
+        "phone_number_sid",
+        "group_sid",
+        "to",
+        "from_",
+        "status",
+        "direction",
+        "answered_by",
+        "forwarded_from",
+        "caller_name",
+        "start_time",
+        "end_time",
+        "duration",
+        "price",
+        "annotation",
+        "api_version",
+        "date_created",
+        "date_updated",
+        "subresource_uris",
+        )
+
     def hangup(self):
         """ If this call is currenlty active, hang up the call.
         If this call is scheduled to be made, remove the call
@@ -622,6 +1433,7 @@ class Calls(ListResource):
 
     name = "Calls"
     instance = Call
+    date_range_keys = ("started_after", "started_before")
 
     @normalize_dates
     def list(self, to=None, from_=None, status=None, ended_after=None,
@@ -823,7 +1635,8 @@ class PhoneNumber(InstanceResource):
             uri = re.sub(r'AC(.*)', entries["account_sid"],
                 self.parent.base_uri)
 
-            self.parent = PhoneNumbers(uri, self.parent.auth)
+            self.parent = PhoneNumbers(uri, self.parent.auth,
+                                       self.parent.connection)
             self.base_uri = self.parent.uri
 
         super(PhoneNumber, self).load(entries)
@@ -860,10 +1673,10 @@ class PhoneNumbers(ListResource):
     key = "incoming_phone_numbers"
     instance = PhoneNumber
 
-    def __init__(self, base_uri, auth):
-        super(PhoneNumbers, self).__init__(base_uri, auth)
+    def __init__(self, base_uri, auth, connection=None):
+        super(PhoneNumbers, self).__init__(base_uri, auth, connection)
         self.available_phone_numbers = \
-            AvailablePhoneNumbers(base_uri, auth, self)
+            AvailablePhoneNumbers(base_uri, auth, self, connection)
 
     def delete(self, sid):
         """
@@ -1024,14 +1837,28 @@ class Sms(object):
     name = "SMS"
     key = "sms"
 
-    def __init__(self, base_uri, auth):
+    def __init__(self, base_uri, auth, connection=None):
         self.uri = "%s/SMS" % base_uri
-        self.messages = SmsMessages(self.uri, auth)
-        self.short_codes = ShortCodes(self.uri, auth)
+        self.messages = SmsMessages(self.uri, auth, connection)
+        self.short_codes = ShortCodes(self.uri, auth, connection)
 
 
 class SmsMessage(InstanceResource):
-    pass
+
+    fields = (
+        "sid",
+        "account_sid",
+        "to",
+        "from_",
+        "body",
+        "status",
+        "direction",
+        "price",
+        "api_version",
+        "date_sent",
+        "date_created",
+        "date_updated",
+        )
 
 
 class SmsMessages(ListResource):
@@ -1039,6 +1866,7 @@ class SmsMessages(ListResource):
     name = "Messages"
     key = "sms_messages"
     instance = SmsMessage
+    date_range_keys = ("after", "before")
 
     def create(self, to=None, from_=None, body=None, status_callback=None,
                application_sid=None):
@@ -1060,6 +1888,29 @@ class SmsMessages(ListResource):
             })
         return self.create_instance(params)
 
+    def create_many(self, messages, concurrency=10, ordered=False):
+        """
+        Send many SMS messages at once.
+
+        :param messages: An iterable of dicts, each holding the keyword
+                         arguments to :meth:`create` for one message. It is
+                         read lazily, so it may be a generator.
+        :param int concurrency: How many messages to send at a time
+        :param bool ordered: Yield results in the order of messages, rather
+                             than as soon as each message is sent
+
+        :returns: A :class:`twilio.rest.futures.Batch`. Iterate over it to
+                  send the messages and get an ``(params, message, exception)``
+                  tuple for each one. Failures are also collected in its
+                  ``errors`` list, and its ``throughput`` is the number of
+                  messages handled per second.
+        """
+        def create(resource, params):
+            return resource.create(**params)
+
+        return self.batch(create, messages, concurrency=concurrency,
+                          ordered=ordered)
+
     @normalize_dates
     def list(self, to=None, from_=None, before=None, after=None,
              date_sent=None, **kwargs):
@@ -1147,6 +1998,17 @@ class Participant(InstanceResource):
 
     id_key = "call_sid"
 
+    fields = (
+        "call_sid",
+        "conference_sid",
+        "account_sid",
+        "muted",
+        "start_conference_on_enter",
+        "end_conference_on_exit",
+        "date_created",
+        "date_updated",
+        )
+
     def mute(self):
         """
         Mute the participant
@@ -1225,11 +2087,23 @@ class Conference(InstanceResource):
         Participants
         ]
 
+    fields = (
+        "sid",
+        "account_sid",
+        "friendly_name",
+        "status",
+        "api_version",
+        "date_created",
+        "date_updated",
+        "subresource_uris",
+        )
+
 
 class Conferences(ListResource):
 
     name = "Conferences"
     instance = Conference
+    date_range_keys = ("created_after", "created_before")
 
     @normalize_dates
     def list(self, status=None, friendly_name=None, updated_before=None,
@@ -1509,3 +2383,39 @@ class Accounts(ListResource):
                 "FriendlyName": friendly_name,
                 })
         return self.create_instance(params)
+
+
+class AsyncResource(object):
+    """
+    Wrap a list resource so that its methods run on an executor. Every method
+    returns a :class:`twilio.rest.futures.Future` instead of blocking, and
+    nested resources (such as ``sms.messages``) are wrapped in turn.
+
+    Instance resources returned by these futures are ordinary, blocking
+    :class:`InstanceResource` objects.
+    """
+
+    def __init__(self, resource, executor):
+        self.resource = resource
+        self.executor = executor
+
+    def __getattr__(self, name):
+        attr = getattr(self.resource, name)
+
+        if isinstance(attr, (ListResource, Sms)):
+            return AsyncResource(attr, self.executor)
+
+        if not callable(attr):
+            return attr
+
+        def submit(*args, **kwargs):
+            return self.executor.submit(attr, *args, **kwargs)
+        submit.__doc__ = attr.__doc__
+        return submit
+
+    def iter(self, prefetch=1, **kwargs):
+        """
+        Return all instance resources using an iterator. Pages are requested
+        in the background while the previous page is consumed.
+        """
+        return self.resource.iter(prefetch=prefetch, **kwargs)
@@ -0,0 +1,144 @@
+"""
+Retry rate limited and failed requests with exponential backoff
+"""
+import calendar
+import httplib
+import random
+import socket
+import threading
+import time
+from email.Utils import parsedate
+
+# import httplib2
+try:
+    import httplib2
+except ImportError:
+    from twilio.contrib import httplib2
+
+
+class RetryPolicy(object):
+    """
+    Decide when and how long to wait before a failed request is retried.
+
+    Responses with a status in ``statuses``, and connection errors, are
+    retried for idempotent methods. Requests using any other method (POST) are
+    only retried on ``unsafe_statuses``, where Twilio guarantees the request
+    was not acted upon, so a call or message is never created twice.
+
+    The wait before retry ``n`` is drawn uniformly between zero and
+    ``min(max_delay, base_delay * 2 ** (n - 1))`` when ``jitter`` is set, so
+    that many clients rate limited at once do not retry in lockstep. A
+    ``Retry-After`` header from the server takes precedence.
+
+    The counters ``attempts``, ``retries`` and ``backoff_time`` (seconds spent
+    sleeping) accumulate across every request made with this policy.
+
+    :param int max_attempts: Give up after this many attempts in total
+    :param float base_delay: Seconds to wait before the first retry
+    :param float max_delay: The longest to wait between attempts
+    :param bool jitter: Randomize each wait
+    :param bool respect_retry_after: Honour the server's Retry-After header
+    :param statuses: HTTP statuses to retry for idempotent methods
+    :param methods: HTTP methods that are safe to repeat
+    :param unsafe_statuses: HTTP statuses to retry for all other methods
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=30,
+                 jitter=True, respect_retry_after=True,
+                 statuses=(429, 500, 502, 503, 504),
+                 methods=("GET", "HEAD", "PUT", "DELETE", "OPTIONS"),
+                 unsafe_statuses=(429,)):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        self.statuses = set(statuses)
+        self.methods = set(methods)
+        self.unsafe_statuses = set(unsafe_statuses)
+        self.sleep = time.sleep
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Zero the attempts, retries and backoff_time counters"""
+        self.attempts = 0
+        self.retries = 0
+        self.backoff_time = 0.0
+
+    def is_retryable(self, method, status):
+        if method in self.methods:
+            return status in self.statuses
+        return status in self.unsafe_statuses
+
+    def backoff(self, attempt):
+        """Return the seconds to wait after the given failed attempt"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def retry_after(self, resp):
+        """
+        Return the wait requested by a response's Retry-After header, or None
+        """
+        headers = getattr(resp, "headers", None) or {}
+        value = headers.get("retry-after")
+
+        if not self.respect_retry_after or value is None:
+            return None
+
+        try:
+            delay = float(value)
+        except ValueError:
+            date = parsedate(value)
+            if date is None:
+                return None
+            delay = calendar.timegm(date) - time.time()
+
+        return min(self.max_delay, max(0, delay))
+
+    def request(self, send, method, uri, **kwargs):
+        """
+        Call send(method, uri, **kwargs) until it returns a response that
+        should not be retried, or max_attempts is reached. The number of
+        retries made is stored on the response as ``retries``.
+        """
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self.count(attempts=1)
+
+            try:
+                resp = send(method, uri, **kwargs)
+            except (socket.error, httplib.HTTPException,
+                    httplib2.HttpLib2Error):
+                if method not in self.methods or \
+                        attempt >= self.max_attempts:
+                    raise
+                self.wait(self.backoff(attempt))
+                continue
+
+            if attempt >= self.max_attempts or \
+                    not self.is_retryable(method, resp.status_code):
+                resp.retries = attempt - 1
+                return resp
+
+            delay = self.retry_after(resp)
+            if delay is None:
+                delay = self.backoff(attempt)
+            self.wait(delay)
+
+    def wait(self, delay):
+        self.count(retries=1, backoff_time=delay)
+        self.sleep(delay)
+
+    def count(self, attempts=0, retries=0, backoff_time=0):
+        self.lock.acquire()
+        try:
+            self.attempts += attempts
+            self.retries += retries
+            self.backoff_time += backoff_time
+        finally:
+            self.lock.release()
@@ -0,0 +1,151 @@
+"""
+Parse a page of list results while its response body is still arriving
+"""
+import re
+from twilio import TwilioException
+
+# import json
+try:
+    import json
+except ImportError:
+    try:
+        import simplejson as json
+    except ImportError:
+        from django.utils import simplejson as json
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Marks the start of the entries among the items the parser produces
+ENTRIES = object()
+
+
+class PageParser(object):
+    """
+    Incrementally parse a JSON page of list results, such as::
+
+        {"page": 0, "next_page_uri": "...", "calls": [{...}, {...}]}
+
+    Iterating over the parser yields each entry of the array under key as
+    soon as it is complete. All other top-level fields are collected into
+    ``paging`` as they are reached. At most one chunk and one entry are held
+    in memory at a time. Call :meth:`header` to read the fields that come
+    before the array without reading any entries.
+
+    :param chunks: An iterable of strings making up the response body
+    :param string key: The name of the array to yield entries from
+    """
+
+    def __init__(self, chunks, key):
+        self.chunks = iter(chunks)
+        self.key = key
+        self.paging = {}
+        self.found = False
+        self.finished = False
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+        self.items = self.parse()
+
+    def __iter__(self):
+        for item in self.items:
+            if item is not ENTRIES:
+                yield item
+
+    def header(self):
+        """Parse up to the first entry, or to the end if there is none"""
+        if not self.found:
+            for item in self.items:
+                if item is ENTRIES:
+                    return
+
+    def parse(self):
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            self.finish()
+            return
+
+        while True:
+            key = self.value()
+            self.expect(":")
+
+            if key == self.key and self.peek() == "[":
+                self.found = True
+                self.pos += 1
+                yield ENTRIES
+
+                if self.peek() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        yield self.value()
+                        if self.expect(",]") == "]":
+                            break
+            else:
+                self.paging[key] = self.value()
+
+            if self.expect(",}") == "}":
+                self.finish()
+                return
+
+    def finish(self):
+        # Read to the end of the body, so its connection can be reused
+        for chunk in self.chunks:
+            pass
+
+        self.finished = True
+        if not self.found:
+            raise TwilioException("Key %s not present in response" %
+                                  self.key)
+
+    def fill(self):
+        """
+        Read the next chunk of the body into the buffer, dropping everything
+        that has already been parsed. Returns False at the end of the body.
+        """
+        for chunk in self.chunks:
+            if chunk:
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        """Skip any whitespace and return the next character"""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON page")
+
+    def expect(self, chars):
+        """Consume and return the next character, which must be in chars"""
+        char = self.peek()
+        if char not in chars:
+            raise ValueError("Expected one of %r at %r in JSON page" %
+                             (chars, self.buffer[self.pos:self.pos + 20]))
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+
+        while True:
+            try:
+                # Python 2.6's json takes the index only as a keyword
+                value, end = self.decoder.raw_decode(self.buffer,
+                                                     idx=self.pos)
+            except ValueError:
+                # The value is incomplete, unless the body has ended
+                if not self.fill():
+                    raise
+                continue
+
+            # A number ending the buffer may continue in the next chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+
+            self.pos = end
+            return value
@@ -2,39 +2,190 @@
 Make sure to check out the TwiML overview and tutorial
 """
 
+import re
+import threading
 import xml.etree.ElementTree as ET
+from collections import deque
+from StringIO import StringIO
+
+try:
+    from xml.etree.cElementTree import iterparse
+except ImportError:
+    from xml.etree.ElementTree import iterparse
+
+# Characters that must be escaped, or written as character references, in
+# text and attribute values
+UNSAFE_TEXT = re.compile(u"[&<>]|[^\x00-\x7f]")
+UNSAFE_ATTRIBUTE = re.compile(u"[&<>\"\n]|[^\x00-\x7f]")
+
+# How a Placeholder appears in serialized TwiML. NUL can never appear in an
+# XML document, so it cannot be mistaken for real content.
+PLACEHOLDER = re.compile("\x00(\\w+)\x00")
 
 
 class TwimlException(Exception):
     pass
 
 
+def escape_text(text):
+    """
+    Escape element text exactly as ElementTree does when writing ASCII.
+    Text that needs no escaping, by far the most common, is returned as is.
+    """
+    try:
+        if UNSAFE_TEXT.search(text) is None:
+            return text
+        text = text.replace("&", "&amp;").replace("<", "&lt;") \
+            .replace(">", "&gt;")
+        return text.encode("ascii", "xmlcharrefreplace")
+    except (TypeError, AttributeError):
+        raise TypeError("cannot serialize %r (type %s)" % (
+            text, type(text).__name__))
+
+
+def escape_attribute(value):
+    """Escape an attribute value exactly as ElementTree does"""
+    if UNSAFE_ATTRIBUTE.search(value) is None:
+        return value
+    value = value.replace("&", "&amp;").replace("<", "&lt;") \
+        .replace(">", "&gt;").replace("\"", "&quot;").replace("\n", "&#10;")
+    return value.encode("ascii", "xmlcharrefreplace")
+
+
+def format_attribute(value):
+    """Return an attribute value as it is written in TwiML"""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return escape_attribute(str(value))
+
+
+class FrozenAttributes(dict):
+    """The attributes of a frozen :class:`Verb`, which cannot be changed"""
+
+    def readonly(self, *args, **kwargs):
+        raise TwimlException("Cannot change the attributes of a frozen verb")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = \
+        update = readonly
+
+    def __reduce__(self):
+        return (FrozenAttributes, (dict(self),))
+
+
+class Placeholder(str):
+    """
+    Stands in for text or an attribute value in a :class:`Verb` that is
+    compiled into a :class:`Template`, to be filled in when the template is
+    rendered.
+
+    :param name: The keyword argument to :meth:`Template.render` that
+                 replaces this placeholder
+    """
+
+    def __new__(cls, name):
+        if not re.match(r"^\w+$", name):
+            raise TwimlException("Invalid placeholder name %r" % name)
+        placeholder = str.__new__(cls, "\x00%s\x00" % name)
+        placeholder.name = name
+        return placeholder
+
+    def __repr__(self):
+        return "Placeholder(%r)" % self.name
+
+
+def empty_verb(cls):
+    """Return a verb of class cls with nothing set, for unpickling"""
+    return cls.__new__(cls)
+
+
+class FrozenVerb(object):
+    """
+    Mixed into the class a :class:`Verb` takes on when it is frozen, so that
+    only frozen verbs pay for checking assignments
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise TwimlException("Cannot change a frozen %s" % self.name)
+
+    def __delattr__(self, name):
+        raise TwimlException("Cannot change a frozen %s" % self.name)
+
+    def __reduce_ex__(self, protocol):
+        # Pickle as the verb's own class, which __setstate__ freezes again
+        return (empty_verb, (self.thawed_class,), self.__getstate__())
+
+
+class VerbType(type):
+    """
+    Work out the rules for each verb class once, when it is defined: its
+    name, the set of verbs that may be nested inside it, and the checks on
+    its attributes. Also make the class its verbs take on when frozen.
+    """
+
+    def __init__(cls, name, bases, attrs):
+        super(VerbType, cls).__init__(name, bases, attrs)
+        if issubclass(cls, FrozenVerb):
+            return
+
+        cls.name = name
+        cls.nestables = frozenset(cls.nestables or ())
+        cls.checks = dict((attr, (frozenset(allowed),
+            "Invalid %s parameter, must be %s" % (attr,
+                " or ".join(["'%s'" % value for value in allowed]))))
+            for attr, allowed in cls.choices.items())
+        cls.thawed_class = cls
+        cls.frozen_class = VerbType("Frozen" + name, (FrozenVerb, cls),
+                                    {"__slots__": (),
+                                     "__module__": cls.__module__})
+
+
 class Verb(object):
     """Twilio basic verb object.
     """
+    __metaclass__ = VerbType
+    __slots__ = ("body", "verbs", "attrs", "frozen", "frozen_key",
+                 "frozen_xml")
+
     GET = "GET"
     POST = "POST"
     nestables = None
 
+    # Attributes that may only take certain values
+    choices = {
+        "method": ("GET", "POST"),
+        "waitMethod": ("GET", "POST"),
+        }
+
     def __init__(self, **kwargs):
-        self.name = self.__class__.__name__
         self.body = None
         self.verbs = []
-        self.attrs = {}
-
-        if kwargs.get("waitMethod", "GET") not in ["GET", "POST"]:
-            raise TwimlException("Invalid waitMethod parameter, "
-                                 "must be 'GET' or 'POST'")
-
-        if kwargs.get("method", "GET") not in ["GET", "POST"]:
-            raise TwimlException("Invalid method parameter, "
-                                 "must be 'GET' or 'POST'")
-
-        for k, v in kwargs.items():
+        self.frozen = False
+        self.attrs = attrs = {}
+
+        if not kwargs:
+            return
+
+        checks = self.checks
+        for k, v in kwargs.iteritems():
+            if k in checks:
+                allowed, message = checks[k]
+                if v not in allowed:
+                    raise TwimlException(message)
             if k == "sender":
                 k = "from"
             if v is not None:
-                self.attrs[k] = v
+                attrs[k] = v
+
+    def __getstate__(self):
+        return dict([(slot, getattr(self, slot)) for slot in Verb.__slots__
+                     if hasattr(self, slot)])
+
+    def __setstate__(self, state):
+        for slot, value in state.iteritems():
+            setattr(self, slot, value)
+        if self.frozen:
+            self.__class__ = self.frozen_class
 
     def __str__(self):
         return self.toxml()
@@ -52,14 +203,51 @@ class Verb(object):
         :param bool xml_declaration: Include the XML declaration. Defaults to
                                      True
         """
-        xml = ET.tostring(self.xml()).encode("utf-8")
+        if self.frozen:
+            return self.frozen_xml[xml_declaration]
+
+        parts = []
+        self.serialize(parts.append)
+        xml = "".join(parts).encode("utf-8")
 
         if xml_declaration:
             return u'<?xml version="1.0" encoding="UTF-8"?>' + xml
         else:
             return xml
 
+    def serialize(self, write):
+        """
+        Write the XML for this verb and those nested inside it, as strings
+        passed to write. The XML is identical to that ElementTree writes for
+        :meth:`xml`, without building the tree.
+        """
+        if self.frozen:
+            write(self.frozen_xml[False])
+            return
+
+        name = self.name
+        attrs = self.attrs
+
+        if attrs:
+            start = ["<", name]
+            for key in sorted(attrs):
+                start.append(' %s="%s"' % (key, format_attribute(attrs[key])))
+            write("".join(start))
+        else:
+            write("<" + name)
+
+        if self.body or self.verbs:
+            write(">")
+            if self.body:
+                write(escape_text(self.body))
+            for verb in self.verbs:
+                verb.serialize(write)
+            write("</%s>" % name)
+        else:
+            write(" />")
+
     def xml(self):
+        """Return this verb as an :class:`xml.etree.ElementTree.Element`"""
         el = ET.Element(self.name)
 
         keys = self.attrs.keys()
@@ -80,9 +268,58 @@ class Verb(object):
 
         return el
 
+    def freeze(self):
+        """
+        Make this verb, and every verb nested inside it, immutable, and
+        serialize it once so that :meth:`toxml` returns the same string
+        every time without doing any work. Use this for responses that never
+        change, such as hold music or a hangup. Verbs cannot be appended to
+        a frozen verb, and neither its body nor its attributes can be
+        changed. A frozen verb's class becomes a subclass of its own, such as
+        ``FrozenSay`` for a :class:`Say`.
+
+        Frozen verbs can still be appended to other verbs, which then write
+        their saved XML rather than serializing them again.
+
+        :returns: this verb
+        """
+        if self.frozen:
+            return self
+
+        for verb in self.verbs:
+            verb.freeze()
+
+        self.verbs = tuple(self.verbs)
+        self.attrs = FrozenAttributes(self.attrs)
+        self.frozen_key = self.key()
+        self.frozen_xml = {
+            True: self.toxml(xml_declaration=True),
+            False: self.toxml(xml_declaration=False),
+            }
+        self.frozen = True
+        self.__class__ = self.frozen_class
+        return self
+
+    def key(self):
+        """
+        Return a key for the contents of this verb: verbs with equal keys
+        serialize to the same XML. The key can be hashed unless an attribute
+        value cannot.
+        """
+        if self.frozen:
+            return self.frozen_key
+
+        # Values are keyed with their type, since True == 1 but they are
+        # written as "true" and "1"
+        attrs = tuple(sorted([(k, type(v), v)
+                              for k, v in self.attrs.iteritems()]))
+        return (self.name, attrs, self.body,
+                tuple([verb.key() for verb in self.verbs]))
+
     def append(self, verb):
-        print self.nestables
-        if not self.nestables or verb.name not in self.nestables:
+        if self.frozen:
+            raise TwimlException("Cannot append to a frozen %s" % self.name)
+        if verb.name not in self.nestables:
             raise TwimlException("%s is not nestable inside %s" % \
                 (verb.name, self.name))
         self.verbs.append(verb)
@@ -91,6 +328,7 @@ class Verb(object):
 
 class Response(Verb):
     """Twilio response object."""
+    __slots__ = ()
     nestables = [
         'Say',
         'Play',
@@ -206,6 +444,7 @@ class Say(Verb):
                  Specifying '0' will cause the the :class:`Say` verb to loop
                  until the call is hung up.
     """
+    __slots__ = ()
     MAN = 'man'
     WOMAN = 'woman'
 
@@ -230,6 +469,8 @@ class Play(Verb):
                  Specifying '0' will cause the the :class:`Say` verb to loop
                  until the call is hung up. Defaults to 1.
     """
+    __slots__ = ()
+
     def __init__(self, url, **kwargs):
         super(Play, self).__init__(**kwargs)
         self.body = url
@@ -241,6 +482,7 @@ class Pause(Verb):
     :param length: specifies how many seconds Twilio will wait silently before
                    continuing on.
     """
+    __slots__ = ()
 
 
 class Redirect(Verb):
@@ -251,6 +493,7 @@ class Redirect(Verb):
 
     :param method: specifies the HTTP method to use when retrieving the url
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
 
@@ -262,6 +505,7 @@ class Redirect(Verb):
 class Hangup(Verb):
     """Hangup the call
     """
+    __slots__ = ()
 
 
 class Reject(Verb):
@@ -269,6 +513,7 @@ class Reject(Verb):
 
     :param reason: not sure
     """
+    __slots__ = ()
 
 
 class Gather(Verb):
@@ -280,6 +525,7 @@ class Gather(Verb):
     :param timeout: wait for this many seconds before returning
     :param finishOnKey: key that triggers the end of caller input
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
     nestables = ['Say', 'Play', 'Pause']
@@ -312,6 +558,8 @@ class Number(Verb):
     :param number: phone number to dial
     :param sendDigits: key to press after connecting to the number
     """
+    __slots__ = ()
+
     def __init__(self, number, **kwargs):
         super(Number, self).__init__(**kwargs)
         self.body = number
@@ -322,6 +570,8 @@ class Client(Verb):
 
     :param name: Client name to connect to
     """
+    __slots__ = ()
+
     def __init__(self, name, **kwargs):
         super(Client, self).__init__(**kwargs)
         self.body = name
@@ -336,6 +586,7 @@ class Sms(Verb):
     :param method: submit to 'action' url using GET or POST
     :param statusCallback: url to hit when the message is actually sent
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
 
@@ -355,6 +606,7 @@ class Conference(Verb):
     :param waitUrl: TwiML url that executes before conference starts
     :param waitMethod: HTTP method for waitUrl GET/POST
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
 
@@ -376,6 +628,7 @@ class Dial(Verb):
     :param callerId: The caller ID that will appear to the called party
     :param bool record: Record both legs of a call within this <Dial>
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
     nestables = ['Number', 'Conference', 'Client']
@@ -412,5 +665,209 @@ class Record(Verb):
     :param maxLength: maximum number of seconds to record
     :param timeout: seconds of silence before considering the recording done
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
+
+
+class Template(object):
+    """
+    A TwiML document compiled from a verb containing :class:`Placeholder`
+    values, so that rendering it only escapes and joins the values that
+    change::
+
+        r = Response()
+        r.say(Placeholder("greeting"))
+        r.gather(action=Placeholder("action"), numDigits=1)
+        template = Template(r)
+
+        template.render(greeting="Hello", action="/menu?id=42")
+
+    Rendering gives exactly what building the same verbs with the values in
+    place of the placeholders and calling :meth:`Verb.toxml` would, except
+    that an element whose text is rendered empty is written ``<Say></Say>``
+    rather than ``<Say />``.
+
+    The verb is serialized once, when the template is created; changing it
+    afterwards does not change the template.
+
+    :param verb: The :class:`Verb` to compile
+    :param bool xml_declaration: Include the XML declaration. Defaults to
+                                 True
+    """
+
+    def __init__(self, verb, xml_declaration=True):
+        pieces = PLACEHOLDER.split(verb.toxml(xml_declaration))
+        self.fragments = pieces[0::2]
+        self.slots = []
+
+        # Every < and > in text and attribute values is escaped, so a
+        # placeholder is inside a tag, and so an attribute value, when the
+        # nearest of them before it is <
+        in_tag = False
+        for name, fragment in zip(pieces[1::2], self.fragments):
+            if "<" in fragment or ">" in fragment:
+                in_tag = fragment.rfind("<") > fragment.rfind(">")
+            if in_tag:
+                self.slots.append((name, format_attribute))
+            else:
+                self.slots.append((name, escape_text))
+
+    @property
+    def names(self):
+        """The names of the placeholders, in the order they appear"""
+        return [name for name, format in self.slots]
+
+    def render(self, **values):
+        """Return the TwiML with each placeholder replaced by its value"""
+        fragments = self.fragments
+        parts = [fragments[0]]
+
+        for i, (name, format) in enumerate(self.slots):
+            try:
+                value = values[name]
+            except KeyError:
+                raise TwimlException("No value for placeholder %s" % name)
+            parts.append(format(value))
+            parts.append(fragments[i + 1])
+
+        return "".join(parts)
+
+
+class TwimlCache(object):
+    """
+    Remember the XML of recently serialized verbs by their contents, for
+    responses that are built on every request but come out the same most
+    of the time::
+
+        cache = TwimlCache()
+
+        def voice(request):
+            r = Response()
+            r.say(greetings[request.language])
+            return cache.toxml(r)
+
+    Looking a verb up costs a walk of its tree, building a key, which is
+    cheaper than serializing it. Because the key is built from the verb's
+    current contents, a verb changed after it was cached is looked up
+    afresh. Verbs with unhashable attribute values are never cached.
+
+    ``hits`` and ``misses`` count lookups.
+
+    :param int max_entries: The most documents to remember; the oldest are
+                            forgotten first
+    """
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.clear()
+
+    def toxml(self, verb, xml_declaration=True):
+        """Return verb.toxml(xml_declaration), from the cache if possible"""
+        if verb.frozen:
+            return verb.toxml(xml_declaration)
+
+        key = (verb.key(), xml_declaration)
+        try:
+            hash(key)
+        except TypeError:
+            return verb.toxml(xml_declaration)
+
+        self.lock.acquire()
+        try:
+            xml = self.entries.get(key)
+            if xml is not None:
+                self.hits += 1
+                return xml
+            self.misses += 1
+        finally:
+            self.lock.release()
+
+        xml = verb.toxml(xml_declaration)
+
+        self.lock.acquire()
+        try:
+            if key not in self.entries:
+                self.entries[key] = xml
+                self.order.append(key)
+                while len(self.order) > self.max_entries:
+                    del self.entries[self.order.popleft()]
+        finally:
+            self.lock.release()
+
+        return xml
+
+    def clear(self):
+        """Forget every cached document"""
+        self.lock.acquire()
+        try:
+            self.entries = {}
+            self.order = deque()
+        finally:
+            self.lock.release()
+
+
+# The verbs parse can create, by element name
+VERBS = dict([(cls.name, cls) for cls in [Response, Say, Play, Pause, Redirect,
+    Hangup, Reject, Gather, Number, Client, Sms, Conference, Dial, Record]])
+
+
+def parse(source):
+    """
+    Turn TwiML back into :class:`Verb` objects, such as a :class:`Response`
+    to rewrite before returning it::
+
+        r = twiml.parse(other_service_response)
+        r.record(action="/recorded")
+        return r.toxml()
+
+    The document is read incrementally, and each element is discarded as
+    soon as its verb is created. Nesting is checked exactly as it is by
+    :meth:`Verb.append`, as are attribute values such as method. Whitespace
+    between nested verbs is ignored.
+
+    :param source: A string of TwiML, or a file-like object to read it from
+    :returns: the :class:`Verb` for the document's root element
+    :raises: :class:`TwimlException` if the document is not valid TwiML
+    """
+    if isinstance(source, unicode):
+        source = source.encode("utf-8")
+    if isinstance(source, str):
+        source = StringIO(source)
+
+    stack = []
+    root = None
+
+    try:
+        for event, el in iterparse(source, events=("start", "end")):
+            if event == "start":
+                cls = VERBS.get(el.tag)
+                if cls is None:
+                    raise TwimlException("Unknown TwiML verb %s" % el.tag)
+
+                # Skip the subclass constructors, whose arguments are only
+                # shorthand for text and attributes
+                verb = cls.__new__(cls)
+                Verb.__init__(verb, **el.attrib)
+                if stack:
+                    stack[-1].append(verb)
+                else:
+                    root = verb
+                stack.append(verb)
+                continue
+
+            verb = stack.pop()
+            text = el.text
+            if text and (len(el) == 0 or text.strip()):
+                verb.body = text
+            if el.tail and el.tail.strip():
+                raise TwimlException("Unexpected text %r after %s" %
+                                     (el.tail.strip(), verb.name))
+            el.clear()
+    except SyntaxError, e:
+        raise TwimlException("Invalid TwiML: %s" % e)
+
+    return root